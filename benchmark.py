@@ -1,5 +1,6 @@
 import sys
 import time
+import tracemalloc
 
 
 class BaseBenchmark:
@@ -9,6 +10,12 @@ class BaseBenchmark:
     def get_mem_usage(self):
         return "", ""
 
+    def get_mem_savings(self):
+        return []
+
+    def get_other_timings(self):
+        return []
+
     def setup(self, num_entities, num_components): # pylint: disable=unused-argument
         return 0
 
@@ -24,7 +31,11 @@ class BaseBenchmark:
         print('Entity: {}, NullComponent: {}'.format(
             *self.get_mem_usage()
         ))
+        for line in self.get_mem_savings():
+            print(line)
         print()
+        for line in self.get_other_timings():
+            print(line)
 
         print('==Time==')
         incs = [1, 100, 1000]
@@ -98,9 +109,163 @@ class SimpleEcsBench(BaseBenchmark):
         self.world.update(0)
 
 
+def measure_allocation(factory, count=10_000):
+    """
+    Average number of bytes allocated by each call of `factory`,
+    including everything the created object holds on to.
+    """
+    tracemalloc.start()
+    objects = [None] * count
+    before = tracemalloc.get_traced_memory()[0]
+    for idx in range(count):
+        objects[idx] = factory()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+class WecsBench(BaseBenchmark):
+    def __init__(self):
+        from wecs.core import Component
+        self.component_classes = [
+            Component()(type('NullComponent{}'.format(i), (), {}))
+            for i in range(1000)
+        ]
+        self.world = None
+
+        super().__init__('wecs')
+
+    def get_mem_usage(self):
+        from wecs.core import World
+        return (
+            sys.getsizeof(World().create_entity()),
+            sys.getsizeof(self.component_classes[0]())
+        )
+
+    def get_mem_savings(self):
+        from wecs.core import World, Entity, Component, slots_supported
+
+        world = World()
+        # The same class as Entity, just without __slots__
+        namespace = {
+            key: value for key, value in vars(Entity).items()
+            if key not in Entity.__slots__ and key != '__slots__'
+        }
+        DictEntity = type('DictEntity', (), namespace)
+        entity_slotted = measure_allocation(lambda: Entity(world))
+        entity_dict = measure_allocation(lambda: DictEntity(world))
+
+        # A typical component with a handful of fields
+        fields = {'f{}'.format(i): float for i in range(6)}
+        defaults = {'f{}'.format(i): 0.0 for i in range(6)}
+        component_types = {
+            slots: Component(slots=slots)(type(
+                'SixFloats',
+                (),
+                dict(__annotations__=fields, **defaults),
+            ))
+            for slots in ([False, True] if slots_supported else [False])
+        }
+        component_dict = measure_allocation(component_types[False])
+
+        lines = ['==Memory savings by __slots__ (bytes per instance)==']
+        lines.append('Entity: {:0.0f} (without __slots__: {:0.0f}, saved: {:0.0f})'.format(
+            entity_slotted,
+            entity_dict,
+            entity_dict - entity_slotted,
+        ))
+        if slots_supported:
+            component_slotted = measure_allocation(component_types[True])
+            lines.append('Component with 6 fields: {:0.0f} (without __slots__: {:0.0f}, saved: {:0.0f})'.format(
+                component_slotted,
+                component_dict,
+                component_dict - component_slotted,
+            ))
+        else:
+            lines.append('Component with 6 fields: {:0.0f} (slotted components require Python 3.10+)'.format(
+                component_dict,
+            ))
+        return lines
+
+    def get_other_timings(self, num_entities=100_000, repeat=3):
+        from wecs.core import World, Component, UID, reference
+
+        @Component()
+        class Position:
+            x: float = 0.0
+            y: float = 0.0
+
+        @Component()
+        class Health:
+            hp: int = 100
+
+        @Component()
+        class Target:
+            target: UID = reference(default=None)
+
+        world = World()
+        previous = None
+        for idx in range(num_entities):
+            entity = world.create_entity(
+                Position(x=idx, y=idx),
+                Health(hp=idx),
+                Target(target=previous),
+            )
+            previous = entity._uid
+        world._flush_component_updates()
+
+        def best_of(func):
+            best = None
+            for _ in range(repeat):
+                time_start = time.perf_counter_ns()
+                func()
+                elapsed = (time.perf_counter_ns() - time_start) / 1_000_000
+                if best is None or elapsed < best:
+                    best = elapsed
+            return best
+
+        data = world.snapshot()
+        time_snapshot = best_of(world.snapshot)
+        time_restore = best_of(lambda: World().restore(data))
+        return [
+            '==Snapshots ({} entities, 3 components each)=='.format(num_entities),
+            'snapshot: {:0.2f}ms, {} bytes'.format(time_snapshot, len(data)),
+            'restore into an empty world: {:0.2f}ms'.format(time_restore),
+            '',
+        ]
+
+    def setup(self, num_entities, num_components):
+        from wecs.core import World, System, and_filter
+
+        class NullSystem(System):
+            entity_filters = {
+                'null': and_filter([self.component_classes[0]]),
+            }
+
+        self.world = World()
+        self.world.add_system(NullSystem(), 0)
+        for _ in range(num_entities):
+            self.world.create_entity(*[
+                self.component_classes[compnum]()
+                for compnum in range(num_components)
+            ])
+
+    def update_cold(self):
+        self.world.update()
+
+    def update_warm(self):
+        self.world.update()
+
+
 if __name__ == '__main__':
     BENCHMARKS = [
-        SimpleEcsBench()
+        WecsBench,
+        SimpleEcsBench,
     ]
-    for bench in BENCHMARKS:
+    for bench_type in BENCHMARKS:
+        try:
+            bench = bench_type()
+        except ImportError as exc:
+            print('Skipping {}: {}'.format(bench_type.__name__, exc))
+            continue
         bench.run()
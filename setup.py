@@ -31,5 +31,6 @@ setup(
         'panda3d': ['panda3d'],
         'graphviz': ['graphviz'],
         'bobthewizard': ['crayons'],
+        'columnar': ['numpy'],
     },
 )
@@ -191,3 +191,50 @@ def test_create_aspect_with_factory_function_defaults(world):
     )
     [a] = aspect()
     assert a.i == 1
+
+
+def test_instantiate_count():
+    aspect = Aspect([Component_A, Component_B], overrides={Component_A: dict(i=1)})
+    component_sets = aspect.instantiate(3)
+    assert len(component_sets) == 3
+    for components in component_sets:
+        assert [type(c) for c in components] == [Component_A, Component_B]
+        assert components[0].i == 1
+    assert component_sets[0][0] is not component_sets[1][0]
+
+
+def test_instantiate_column_overrides():
+    aspect = Aspect([Component_A, Component_B])
+    component_sets = aspect.instantiate(
+        overrides={Component_A: dict(i=[1, 2, 3])},
+    )
+    assert [components[0].i for components in component_sets] == [1, 2, 3]
+    assert [components[1].i for components in component_sets] == [0, 0, 0]
+
+
+def test_instantiate_row_overrides():
+    aspect = Aspect([Component_A])
+    component_sets = aspect.instantiate(
+        overrides=[{Component_A: dict(i=5)}, {}],
+    )
+    assert [components[0].i for components in component_sets] == [5, 0]
+
+
+def test_instantiate_factories():
+    counter = iter(range(10))
+    aspect = Aspect(
+        [Component_A],
+        overrides={Component_A: dict(i=factory(lambda: next(counter)))},
+    )
+    component_sets = aspect.instantiate(3)
+    assert [components[0].i for components in component_sets] == [0, 1, 2]
+
+
+def test_instantiate_mismatched_overrides():
+    aspect = Aspect([Component_A])
+    with pytest.raises(ValueError):
+        aspect.instantiate()
+    with pytest.raises(ValueError):
+        aspect.instantiate(2, overrides={Component_A: dict(i=[1, 2, 3])})
+    with pytest.raises(ValueError):
+        aspect.instantiate(overrides={Component_B: dict(i=[1])})
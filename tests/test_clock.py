@@ -68,3 +68,14 @@ def test_clock_cascade(world, entity, clock):
     world.update()
     assert child[Clock].frame_time == dt
     assert child[Clock].game_time == dt * factor
+
+
+def test_clock_of_destroyed_parent(world, entity, clock, caplog):
+    world.add_system(DetermineTimestep(), sort=0)
+    child = world.create_entity(Clock(parent=entity._uid))
+    world.update()
+
+    world.destroy_entity(entity)
+    world.update()
+    assert child[Clock].parent == entity._uid
+    assert "has been destroyed" in caplog.text
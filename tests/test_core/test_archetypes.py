@@ -0,0 +1,112 @@
+import pytest
+
+from wecs.core import World, System, Component
+from wecs.core import and_filter, or_filter
+
+from fixtures import NullComponent
+from fixtures import NullSystem
+
+
+@Component()
+class ComponentA:
+    pass
+
+
+@Component()
+class ComponentB:
+    pass
+
+
+class CountingSystem(System):
+    entity_filters = {
+        'a': and_filter([ComponentA]),
+        'a_and_b': and_filter([ComponentA, ComponentB]),
+        'a_or_b': or_filter([ComponentA, ComponentB]),
+    }
+
+
+@pytest.fixture
+def world():
+    return World(archetypes=True)
+
+
+def test_no_archetypes_by_default():
+    world = World()
+    world.create_entity(NullComponent())
+    world._flush_component_updates()
+    assert world.archetypes is None
+    assert list(world.get_archetypes()) == []
+
+
+def test_entities_share_archetype(world):
+    entity_1 = world.create_entity(ComponentA())
+    entity_2 = world.create_entity(ComponentA())
+    entity_3 = world.create_entity(ComponentA(), ComponentB())
+    world._flush_component_updates()
+
+    assert entity_1._archetype is entity_2._archetype
+    assert entity_1._archetype is not entity_3._archetype
+    assert entity_1._archetype.entities == {entity_1, entity_2}
+    assert entity_3._archetype.component_types == {ComponentA, ComponentB}
+
+
+def test_entity_changes_archetype(world):
+    entity = world.create_entity(ComponentA(), ComponentB())
+    world._flush_component_updates()
+    old_archetype = entity._archetype
+
+    del entity[ComponentB]
+    world._flush_component_updates()
+    assert entity._archetype.component_types == {ComponentA}
+    assert entity not in old_archetype.entities
+
+
+def test_filter_membership(world):
+    system = CountingSystem()
+    world.add_system(system, 0)
+    entity_1 = world.create_entity(ComponentA())
+    entity_2 = world.create_entity(ComponentA(), ComponentB())
+    world._flush_component_updates()
+    assert system.entities['a'] == {entity_1, entity_2}
+    assert system.entities['a_and_b'] == {entity_2}
+    assert system.entities['a_or_b'] == {entity_1, entity_2}
+
+    del entity_2[ComponentA]
+    world._flush_component_updates()
+    assert system.entities['a'] == {entity_1}
+    assert system.entities['a_and_b'] == set()
+    assert system.entities['a_or_b'] == {entity_1, entity_2}
+
+
+def test_filters_evaluated_once_per_archetype(world):
+    system = CountingSystem()
+    world.add_system(system, 0)
+    for _ in range(10):
+        world.create_entity(ComponentA())
+    world._flush_component_updates()
+    archetype = world._get_archetype([ComponentA])
+    assert len(archetype.entities) == 10
+    assert archetype._matching_filters[system] == {'a', 'a_or_b'}
+
+
+def test_hooks_in_archetype_mode(world):
+    system = NullSystem()
+    world.add_system(system, 0)
+    entity = world.create_entity(NullComponent())
+    world._flush_component_updates()
+    assert system.entries == [(['null'], entity)]
+
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    assert system.exits == [(['null'], entity)]
+    assert all(entity not in a.entities for a in world.get_archetypes())
+
+
+def test_remove_system_clears_archetype_cache(world):
+    system = NullSystem()
+    world.add_system(system, 0)
+    world.create_entity(NullComponent())
+    world._flush_component_updates()
+    world.remove_system(NullSystem)
+    for archetype in world.get_archetypes():
+        assert system not in archetype._matching_filters
@@ -0,0 +1,154 @@
+import pytest
+
+from wecs.core import World, System, Component
+from wecs.core import and_filter
+from wecs.aspects import Aspect
+
+from fixtures import world
+from fixtures import NullComponent
+from fixtures import NullSystem
+from fixtures import null_system
+
+
+@Component()
+class Counter:
+    value: int = 0
+
+
+class CountingSystem(NullSystem):
+    entity_filters = {
+        'null': and_filter([NullComponent]),
+        'counted': and_filter([NullComponent, Counter]),
+    }
+
+
+def test_create_entities_from_types(world, null_system):
+    world.add_system(null_system, 0)
+    entities = world.create_entities([NullComponent], count=3)
+    assert len(entities) == 3
+    assert all(entity in world._addition_pool for entity in entities)
+
+    world._flush_component_updates()
+    assert null_system.entities['null'] == set(entities)
+    assert sorted(null_system.entries, key=lambda e: id(e[1])) == sorted(
+        [(['null'], entity) for entity in entities],
+        key=lambda e: id(e[1]),
+    )
+
+
+def test_create_entities_from_aspect(world):
+    system = CountingSystem()
+    world.add_system(system, 0)
+    aspect = Aspect([NullComponent, Counter])
+    entities = world.create_entities(
+        aspect,
+        overrides={Counter: dict(value=[1, 2])},
+        names=['one', 'two'],
+    )
+    world._flush_component_updates()
+    assert [entity[Counter].value for entity in entities] == [1, 2]
+    assert [entity.name for entity in entities] == ['one', 'two']
+    assert system.entities['counted'] == set(entities)
+
+
+def test_create_entities_filters_tested_once(world, monkeypatch):
+    system = CountingSystem()
+    world.add_system(system, 0)
+    calls = []
+    original = System._propose_additions
+
+    def propose(self, entities, *args, **kwargs):
+        calls.append(len(entities))
+        return original(self, entities, *args, **kwargs)
+
+    monkeypatch.setattr(System, '_propose_additions', propose)
+    world.create_entities([NullComponent, Counter], count=100)
+    world._flush_component_updates()
+    assert calls == [100]
+
+
+def test_create_entities_in_archetype_mode():
+    world = World(archetypes=True)
+    entities = world.create_entities([NullComponent], count=5)
+    world._flush_component_updates()
+    archetype = world._get_archetype([NullComponent])
+    assert archetype.entities == set(entities)
+
+
+def test_create_entities_names_mismatch(world):
+    with pytest.raises(ValueError):
+        world.create_entities([NullComponent], count=2, names=['one'])
+
+
+def test_destroy_entity_by_uid(world, null_system):
+    world.add_system(null_system, 0)
+    entity = world.create_entity(NullComponent())
+    world._flush_component_updates()
+    world.destroy_entity(entity._uid)
+    world._flush_component_updates()
+    assert entity._uid not in world.entities
+    assert null_system.entities['null'] == set()
+
+
+def test_destroy_entity_with_pending_additions(world, null_system):
+    world.add_system(null_system, 0)
+    entity = world.create_entity(NullComponent())
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    assert null_system.entities['null'] == set()
+    assert null_system.entries == []
+
+
+def test_destroy_entities(world, monkeypatch):
+    system = CountingSystem()
+    world.add_system(system, 0)
+    entities = world.create_entities([NullComponent, Counter], count=50)
+    other = world.create_entities([NullComponent], count=50)
+    world._flush_component_updates()
+
+    calls = []
+    original = System._propose_removals
+
+    def propose(self, entities, *args, **kwargs):
+        calls.append(len(entities))
+        return original(self, entities, *args, **kwargs)
+
+    monkeypatch.setattr(System, '_propose_removals', propose)
+    world.destroy_entities(entities + [entity._uid for entity in other])
+    world._flush_component_updates()
+    assert sorted(calls) == [50, 50]
+    assert world.entities == {}
+    assert system.entities == {'null': set(), 'counted': set()}
+    assert len(system.exits) == 100
+
+
+def test_remove_component_from_all(world):
+    system = CountingSystem()
+    world.add_system(system, 0)
+    counted = world.create_entities([NullComponent, Counter], count=3)
+    uncounted = world.create_entities([Counter], count=3)
+    world._flush_component_updates()
+
+    removed = world.remove_component_from_all(Counter)
+    assert set(removed) == set(counted + uncounted)
+    world._flush_component_updates()
+    assert all(Counter not in entity for entity in counted + uncounted)
+    assert system.entities['counted'] == set()
+    assert system.entities['null'] == set(counted)
+
+
+@pytest.mark.parametrize('archetypes', [False, True])
+def test_remove_component_from_all_with_filter(archetypes):
+    world = World(archetypes=archetypes)
+    counted = world.create_entities([NullComponent, Counter], count=3)
+    uncounted = world.create_entities([Counter], count=3)
+    world._flush_component_updates()
+
+    removed = world.remove_component_from_all(
+        Counter,
+        filter=and_filter([NullComponent]),
+    )
+    assert set(removed) == set(counted)
+    world._flush_component_updates()
+    assert all(Counter not in entity for entity in counted)
+    assert all(Counter in entity for entity in uncounted)
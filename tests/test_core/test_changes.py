@@ -0,0 +1,232 @@
+import pytest
+
+from wecs.core import World, System, Component, get_component_type_id
+from wecs.core import and_filter, or_filter
+from wecs.core import changed_filter, added_filter
+
+
+@Component(track_changes=True)
+class Tracked:
+    i: int = 0
+
+
+@Component()
+class Untracked:
+    i: int = 0
+
+
+class ChangeSystem(System):
+    entity_filters = {
+        'tracked': changed_filter(Tracked),
+        'untracked': and_filter([Untracked, changed_filter(Untracked)]),
+        'added': added_filter(Tracked),
+        'all': and_filter([Tracked]),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def update(self, entities_by_filter):
+        self.seen.append({
+            name: set(entities)
+            for name, entities in entities_by_filter.items()
+        })
+
+
+@pytest.fixture
+def world():
+    return World()
+
+
+@pytest.fixture
+def system(world):
+    system = ChangeSystem()
+    world.add_system(system, 0)
+    return system
+
+
+def test_tracked_component_type_is_dataclass():
+    component = Tracked(i=1)
+    component.i = 2
+    assert component.i == 2
+    assert type(component).__name__ == 'Tracked'
+
+
+def test_additions_count_as_changes(world, system):
+    entity = world.create_entity(Tracked())
+    world.update()
+    assert system.seen[-1]['tracked'] == {entity}
+    assert system.seen[-1]['added'] == {entity}
+    assert system.seen[-1]['all'] == {entity}
+
+
+def test_no_changes(world, system):
+    entity = world.create_entity(Tracked())
+    world.update()
+    world.update()
+    assert system.seen[-1]['tracked'] == set()
+    assert system.seen[-1]['added'] == set()
+    assert system.seen[-1]['all'] == {entity}
+
+
+def test_tracked_assignment(world, system):
+    entity_1 = world.create_entity(Tracked())
+    entity_2 = world.create_entity(Tracked())
+    world.update()
+    entity_1[Tracked].i = 5
+    world.update()
+    assert system.seen[-1]['tracked'] == {entity_1}
+    assert system.seen[-1]['added'] == set()
+    assert system.seen[-1]['all'] == {entity_1, entity_2}
+
+
+def test_untracked_needs_marking(world, system):
+    entity = world.create_entity(Untracked())
+    world.update()
+    assert system.seen[-1]['untracked'] == {entity}
+
+    entity[Untracked].i = 5
+    world.update()
+    assert system.seen[-1]['untracked'] == set()
+
+    entity.mark_changed(Untracked)
+    world.update()
+    assert system.seen[-1]['untracked'] == {entity}
+
+
+def test_mark_changed_of_missing_component(world, system):
+    entity = world.create_entity()
+    world._flush_component_updates()
+    with pytest.raises(KeyError):
+        entity.mark_changed(Tracked)
+
+
+def test_changes_before_addition_to_world():
+    component = Tracked()
+    component.i = 3
+    world = World()
+    world.create_entity(component)
+    world._flush_component_updates()
+    component.i = 4
+
+
+def test_removed_component_is_not_tracked(world, system):
+    entity = world.create_entity(Tracked())
+    world.update()
+    component = entity[Tracked]
+    del entity[Tracked]
+    world._flush_component_updates()
+    component.i = 5
+    world.update()
+    assert system.seen[-1]['tracked'] == set()
+
+
+def test_each_system_sees_each_change():
+    class OtherChangeSystem(ChangeSystem):
+        pass
+
+    world = World()
+    system_1 = ChangeSystem()
+    system_2 = OtherChangeSystem()
+    world.add_system(system_1, 0)
+    world.add_system(system_2, 1)
+    entity = world.create_entity(Tracked())
+    world.update()
+
+    entity[Tracked].i = 1
+    world._update_system(system_1)
+    assert system_1.seen[-1]['tracked'] == {entity}
+    world._update_system(system_2)
+    assert system_2.seen[-1]['tracked'] == {entity}
+    world.update()
+    assert system_1.seen[-1]['tracked'] == set()
+    assert system_2.seen[-1]['tracked'] == set()
+
+
+def test_change_filters_on_same_type():
+    class TwoFilterSystem(System):
+        entity_filters = {
+            'a': changed_filter(Tracked),
+            'b': and_filter([Untracked, changed_filter(Tracked)]),
+        }
+
+        def __init__(self):
+            super().__init__()
+            self.seen = []
+
+        def update(self, entities_by_filter):
+            self.seen.append({
+                name: set(entities)
+                for name, entities in entities_by_filter.items()
+            })
+
+    world = World()
+    system = TwoFilterSystem()
+    world.add_system(system, 0)
+    entity = world.create_entity(Tracked(), Untracked())
+    world.update()
+    assert system.seen[-1]['a'] == {entity}
+    assert system.seen[-1]['b'] == {entity}
+
+    entity[Tracked].i = 1
+    world.update()
+    assert system.seen[-1]['a'] == {entity}
+    assert system.seen[-1]['b'] == {entity}
+    assert world._change_logs[('changed', Tracked)] == {}
+
+
+def test_change_log_is_pruned(world, system):
+    entity = world.create_entity(Tracked())
+    world.update()
+    entity[Tracked].i = 1
+    world.update()
+    assert world._change_logs[('changed', Tracked)] == {}
+
+
+def test_change_logs_removed_with_system(world, system):
+    world.remove_system(ChangeSystem)
+    assert world._change_logs == {}
+
+
+def test_watched_types(world):
+    assert world._watched_type_mask == 0
+    system = ChangeSystem()
+    world.add_system(system, 0)
+    tracked_bit = 1 << get_component_type_id(Tracked)
+    untracked_bit = 1 << get_component_type_id(Untracked)
+    assert world._watched_type_mask == tracked_bit | untracked_bit
+
+    world.enable_deltas()
+    assert world._watched_type_mask & tracked_bit
+    world._remove_delta_log(world._delta_log)
+    assert world._watched_type_mask == tracked_bit | untracked_bit
+
+    world.remove_system(ChangeSystem)
+    assert world._watched_type_mask == 0
+
+
+def test_unwatched_changes_are_not_logged(world):
+    entity = world.create_entity(Tracked())
+    world._flush_component_updates()
+    seq = world._change_seq
+    entity[Tracked].i = 1
+    entity.mark_changed(Tracked)
+    assert world._change_seq == seq
+
+
+def test_no_change_filters_in_or_filters():
+    class InvalidSystem(System):
+        entity_filters = {
+            'invalid': or_filter([Untracked, changed_filter(Tracked)]),
+        }
+
+    with pytest.raises(ValueError):
+        InvalidSystem()
+
+
+def test_no_tracking_for_columnar_storage():
+    with pytest.raises(ValueError):
+        @Component(storage='columnar', track_changes=True)
+        class Invalid:
+            i: float = 0.0
@@ -0,0 +1,175 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from wecs.core import Component, System, and_filter
+
+from fixtures import world
+
+
+@Component(storage='columnar')
+class Particle:
+    x: float = 0.0
+    v: float = 0.0
+    alive: bool = True
+    bounces: int = 0
+    name: str = "particle"
+
+
+class Move(System):
+    entity_filters = {
+        'particles': and_filter([Particle]),
+    }
+
+    def update(self, entities_by_filter):
+        columns = self.get_columns('particles', Particle)
+        columns['x'] += columns['v']
+
+
+def test_unknown_storage():
+    with pytest.raises(ValueError):
+        Component(storage='bogus')
+
+
+def test_view_access(world):
+    entity = world.create_entity(Particle(x=1.0, v=2.0, name="foo"))
+    world._flush_component_updates()
+
+    particle = entity[Particle]
+    assert particle.x == 1.0
+    assert particle.v == 2.0
+    assert particle.alive is True
+    assert particle.bounces == 0
+    assert particle.name == "foo"
+
+    particle.x = 5.0
+    particle.name = "bar"
+    store = world.get_column_store(Particle)
+    assert store.column('x')[0] == 5.0
+    assert entity[Particle].name == "bar"
+
+
+def test_rows_stay_dense(world):
+    entities = [
+        world.create_entity(Particle(x=float(i)))
+        for i in range(100)
+    ]
+    world._flush_component_updates()
+    store = world.get_column_store(Particle)
+    assert store.size == 100
+
+    for entity in entities[:50]:
+        del entity[Particle]
+    world._flush_component_updates()
+    assert store.size == 50
+    for i, entity in enumerate(entities[50:]):
+        assert entity[Particle].x == float(i + 50)
+
+
+def test_removed_view_is_detached(world):
+    entity = world.create_entity(Particle(x=3.0))
+    world._flush_component_updates()
+    particle = entity[Particle]
+
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    assert world.get_column_store(Particle).size == 0
+    assert particle.x == 3.0
+    particle.x = 4.0
+    assert particle.x == 4.0
+
+
+def test_move_view_between_entities(world):
+    entity = world.create_entity(Particle(x=3.0, name="moved"))
+    other = world.create_entity()
+    world._flush_component_updates()
+    view = entity[Particle]
+    del entity[Particle]
+    world._flush_component_updates()
+
+    other.add_component(view)
+    world._flush_component_updates()
+    assert other[Particle].x == 3.0
+    assert other[Particle].name == "moved"
+    assert Particle in other
+
+    # Assigning an attached view copies its row.
+    third = world.create_entity()
+    third[Particle] = other[Particle]
+    world._flush_component_updates()
+    assert third[Particle].x == 3.0
+    assert world.get_column_store(Particle).size == 2
+
+
+def test_vectorized_system(world):
+    world.add_system(Move(), 0)
+    entities = [
+        world.create_entity(Particle(x=float(i), v=1.0))
+        for i in range(10)
+    ]
+    world.update()
+    for i, entity in enumerate(entities):
+        assert entity[Particle].x == float(i) + 1.0
+
+
+def test_partial_selection(world):
+    entities = [
+        world.create_entity(Particle(x=float(i), v=1.0))
+        for i in range(10)
+    ]
+    world._flush_component_updates()
+    store = world.get_column_store(Particle)
+    selection = store.select(entities[2:5])
+    assert list(selection['x']) == [2.0, 3.0, 4.0]
+    selection['x'] += 10.0
+    assert [e[Particle].x for e in entities[2:5]] == [12.0, 13.0, 14.0]
+    assert entities[0][Particle].x == 0.0
+
+
+@Component()
+class Thrown:
+    pass
+
+
+class MoveThrown(System):
+    entity_filters = {
+        'particles': and_filter([Particle, Thrown]),
+    }
+
+    def update(self, entities_by_filter):
+        columns = self.get_columns('particles', Particle)
+        columns['x'] += columns['v']
+
+
+def test_vectorized_system_on_partial_selection(world):
+    world.add_system(MoveThrown(), 0)
+    thrown = world.create_entity(Particle(x=0.0, v=1.0), Thrown())
+    resting = world.create_entity(Particle(x=0.0, v=1.0))
+    world.update()
+    assert thrown[Particle].x == 1.0
+    assert resting[Particle].x == 0.0
+
+
+@pytest.mark.parametrize('partial', [False, True])
+def test_selections_return_copies(world, partial):
+    entities = [
+        world.create_entity(Particle(x=float(i)))
+        for i in range(4)
+    ]
+    world._flush_component_updates()
+    store = world.get_column_store(Particle)
+    selection = store.select(entities[:2] if partial else entities)
+    selection['x'][:] += 10.0
+    assert entities[0][Particle].x == 0.0
+    selection['x'] = selection['x'] + 10.0
+    assert entities[0][Particle].x == 10.0
+    assert entities[3][Particle].x == (3.0 if partial else 13.0)
+
+
+def test_snapshot(world):
+    world.create_entity(Particle(x=1.5, bounces=2, alive=False))
+    world._flush_component_updates()
+    (entity, ) = type(world)().restore(world.snapshot())
+    particle = entity[Particle]
+    assert (particle.x, particle.bounces, particle.alive) == (1.5, 2, False)
+    assert particle.name == "particle"
@@ -0,0 +1,150 @@
+import pytest
+
+from wecs.core import World, Component, UID
+
+from fixtures import NullComponent
+
+
+@Component(track_changes=True)
+class Position:
+    x: float = 0.0
+    y: float = 0.0
+
+
+@Component()
+class Target:
+    target: UID = None
+
+
+@pytest.fixture
+def source():
+    world = World()
+    world.enable_deltas()
+    return world
+
+
+def replicate(source):
+    replica = World()
+    replica.restore(source.snapshot())
+    return replica
+
+
+def by_name(world, name):
+    (entity, ) = [e for e in world.entities.values() if e.name == name]
+    return entity
+
+
+def test_deltas_need_to_be_enabled():
+    with pytest.raises(ValueError):
+        World().diff()
+
+
+def test_no_changes_before_enabling():
+    world = World()
+    world.update()
+    world.enable_deltas()
+    with pytest.raises(ValueError):
+        world.diff(since=0)
+
+
+def test_created_entities(source):
+    replica = replicate(source)
+    source.create_entity(Position(x=1.0), name='a')
+    tick = replica.apply_delta(source.diff())
+    assert tick == source.tick
+    entity = by_name(replica, 'a')
+    assert entity[Position].x == 1.0
+
+
+def test_destroyed_entities(source):
+    entity = source.create_entity(Position(), name='a')
+    replica = replicate(source)
+    source.update()
+    source.destroy_entity(entity)
+    replica.apply_delta(source.diff(since=source.tick))
+    assert replica.entities == {}
+
+
+def test_added_and_removed_components(source):
+    entity = source.create_entity(NullComponent(), name='a')
+    replica = replicate(source)
+    source.update()
+    entity.add_component(Position(y=2.0))
+    entity.remove_component(NullComponent)
+    replica.apply_delta(source.diff(since=source.tick))
+    replica_entity = by_name(replica, 'a')
+    assert replica_entity[Position].y == 2.0
+    assert NullComponent not in replica_entity
+
+
+def test_changed_fields(source):
+    entity = source.create_entity(Position(), name='a')
+    source._flush_component_updates()
+    replica = replicate(source)
+    source.update()
+    since = source.tick
+    entity[Position].x = 5.0
+    delta = source.diff(since=since)
+    replica.apply_delta(delta)
+    assert by_name(replica, 'a')[Position].x == 5.0
+
+
+def test_unchanged_is_not_included(source):
+    entities = [source.create_entity(Position()) for _ in range(100)]
+    source._flush_component_updates()
+    source.update()
+    since = source.tick
+    entities[0][Position].x = 1.0
+    small = source.diff(since=since)
+    entities[1][Position].x = 1.0
+    assert len(small) < len(source.diff(since=since))
+
+
+def test_untracked_changes_need_marking(source):
+    target = source.create_entity(name='target')
+    entity = source.create_entity(Target(), name='a')
+    source._flush_component_updates()
+    replica = replicate(source)
+    source.update()
+    since = source.tick
+    entity[Target].target = target._uid
+    entity.mark_changed(Target)
+    replica.apply_delta(source.diff(since=since))
+    assert by_name(replica, 'a')[Target].target is by_name(replica, 'target')._uid
+
+
+def test_references_to_new_entities(source):
+    replica = replicate(source)
+    target = source.create_entity(name='target')
+    source.create_entity(Target(target=target._uid), name='a')
+    replica.apply_delta(source.diff())
+    assert by_name(replica, 'a')[Target].target is by_name(replica, 'target')._uid
+
+
+def test_applying_twice(source):
+    replica = replicate(source)
+    source.create_entity(Position(x=1.0), name='a')
+    delta = source.diff()
+    replica.apply_delta(delta)
+    replica.apply_delta(delta)
+    assert len(replica.entities) == 1
+
+
+def test_created_and_destroyed_between_deltas(source):
+    replica = replicate(source)
+    entity = source.create_entity(Position())
+    source.destroy_entity(entity)
+    replica.apply_delta(source.diff())
+    assert replica.entities == {}
+
+
+def test_forget(source):
+    source.create_entity(Position())
+    source.update()
+    source.update()
+    log = source._delta_log
+    log.forget(source.tick)
+    assert log.created == {}
+    assert log.added == {}
+    with pytest.raises(ValueError):
+        source.diff(since=0)
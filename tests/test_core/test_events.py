@@ -0,0 +1,94 @@
+import pytest
+
+from wecs.core import World, System, Event
+
+
+@Event()
+class Ping:
+    value: int = 0
+
+
+@Event()
+class Pong:
+    value: int = 0
+
+
+class Listener(System):
+    entity_filters = {}
+    subscriptions = {Ping}
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def update(self, entities_by_filter):
+        self.received.append(list(self.get_events(Ping)))
+
+
+class Echo(System):
+    entity_filters = {}
+    subscriptions = {Ping}
+
+    def update(self, entities_by_filter):
+        for event in self.get_events(Ping):
+            self.world.send_event(Ping(value=event.value + 1))
+
+
+@pytest.fixture
+def world():
+    return World()
+
+
+@pytest.fixture
+def listener(world):
+    listener = Listener()
+    world.add_system(listener, 0)
+    return listener
+
+
+def test_events_delivered_next_frame(world, listener):
+    world.send_event(Ping(value=1))
+    world.update()
+    assert listener.received == [[Ping(value=1)]]
+    world.update()
+    assert listener.received[-1] == []
+
+
+def test_bulk_sending(world, listener):
+    world.send_events(Ping(value=i) for i in range(3))
+    world.update()
+    assert [event.value for event in listener.received[-1]] == [0, 1, 2]
+
+
+def test_events_sent_during_frame_are_delivered_next_frame(world, listener):
+    world.add_system(Echo(), 1)
+    world.send_event(Ping(value=1))
+    world.update()
+    assert listener.received[-1] == [Ping(value=1)]
+    world.update()
+    assert listener.received[-1] == [Ping(value=2)]
+
+
+def test_unsubscribed_events_are_dropped(world, listener):
+    world.send_event(Pong())
+    assert Pong not in world._event_queues
+    world.update()
+    assert world.get_events(Pong) == ()
+
+
+def test_get_unsubscribed_events(world, listener):
+    with pytest.raises(KeyError):
+        listener.get_events(Pong)
+
+
+def test_unsubscribe_on_system_removal(world, listener):
+    world.remove_system(Listener)
+    assert world._event_queues == {}
+    assert world._event_subscribers == {}
+
+
+def test_manual_dispatch(world, listener):
+    world.send_event(Ping())
+    assert world.get_events(Ping) == ()
+    world.dispatch_events()
+    assert world.get_events(Ping) == [Ping()]
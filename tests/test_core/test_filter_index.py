@@ -0,0 +1,74 @@
+from wecs.core import System, Component
+from wecs.core import and_filter, or_filter
+
+from fixtures import world
+from fixtures import NullComponent
+from fixtures import null_system
+
+
+@Component()
+class ComponentA:
+    pass
+
+
+@Component()
+class ComponentB:
+    pass
+
+
+class TwoFilterSystem(System):
+    entity_filters = {
+        'a': and_filter([ComponentA]),
+        'nested': and_filter([NullComponent, or_filter([ComponentB])]),
+    }
+
+
+def test_index_contents(world):
+    system = TwoFilterSystem()
+    world.add_system(system, 0)
+    assert world._filter_index[ComponentA] == {system: {'a'}}
+    assert world._filter_index[ComponentB] == {system: {'nested'}}
+    assert world._filter_index[NullComponent] == {system: {'nested'}}
+
+
+def test_index_cleared_on_system_removal(world):
+    world.add_system(TwoFilterSystem(), 0)
+    world.remove_system(TwoFilterSystem)
+    assert world._filter_index == {}
+
+
+def test_affected_filters(world):
+    system = TwoFilterSystem()
+    world.add_system(system, 0)
+    assert world._get_affected_filters([ComponentA]) == {system: {'a'}}
+    assert world._get_affected_filters([ComponentA, ComponentB]) == {
+        system: {'a', 'nested'},
+    }
+
+
+def test_unrelated_changes_are_not_proposed(world, null_system):
+    world.add_system(null_system, 0)
+    entity = world.create_entity(ComponentA())
+    world._flush_component_updates()
+    assert null_system.entries == []
+
+    entity.add_component(NullComponent())
+    world._flush_component_updates()
+    assert null_system.entries == [(['null'], entity)]
+
+    del entity[ComponentA]
+    world._flush_component_updates()
+    assert null_system.exits == []
+    assert null_system.entities['null'] == {entity}
+
+
+def test_nested_filter_reevaluated(world):
+    system = TwoFilterSystem()
+    world.add_system(system, 0)
+    entity = world.create_entity(NullComponent())
+    world._flush_component_updates()
+    assert system.entities['nested'] == set()
+
+    entity.add_component(ComponentB())
+    world._flush_component_updates()
+    assert system.entities['nested'] == {entity}
@@ -1,5 +1,6 @@
 from wecs.core import Component, Proxy, ProxyType
 from wecs.core import System, and_filter, or_filter
+from wecs.core import get_component_type_id, get_component_type_mask
 
 from fixtures import world, entity
 from fixtures import bare_null_world, bare_null_system
@@ -331,3 +332,99 @@ def test_proxying_system__field_lookup(world):
     world.update()
 
     assert token == token_out
+
+
+def test_proxy_in_nested_filter(world):
+    class NestedProxy(NullSystem):
+        entity_filters = {
+            "null": and_filter(ComponentA, or_filter(Proxy('null_proxy'))),
+        }
+        proxies = {
+            'null_proxy': NullComponent,
+        }
+
+    system = NestedProxy()
+    world.add_system(system, 0)
+    entity = world.create_entity(ComponentA(), NullComponent())
+    world._flush_component_updates()
+    assert entity in system.entities["null"]
+
+
+@Component()
+class ProxiedComponent:
+    foo: str = None
+    bar: ComponentA = None
+
+
+class CompiledProxy(System):
+    entity_filters = {
+        'test': Proxy('foo'),
+    }
+    proxies = {
+        'foo': ProxyType(ProxiedComponent, 'foo'),
+        'bar_type': ProxyType(ProxiedComponent, 'bar.__class__'),
+        'component': ProxiedComponent,
+    }
+
+    def update(self, entities_by_filter):
+        pass
+
+
+def test_proxy_fields_are_compiled(world):
+    system = CompiledProxy()
+    world.add_system(system, 0)
+    component = ProxiedComponent(foo='123', bar=ComponentA())
+    entity = world.create_entity(component)
+    world._flush_component_updates()
+    assert system.proxy_fields['foo'](entity) == '123'
+    assert system.proxy_fields['bar_type'](entity) is ComponentA
+    assert system.proxy_fields['component'](entity) is component
+    assert system.proxies['foo'].field(entity) == '123'
+
+
+def test_proxy_column(world):
+    system = CompiledProxy()
+    world.add_system(system, 0)
+    entities = [
+        world.create_entity(ProxiedComponent(foo=str(idx)))
+        for idx in range(3)
+    ]
+    world.create_entity(ComponentA())
+    world._flush_component_updates()
+    assert system.proxy_column('foo', 'test') == {
+        entity: str(idx) for idx, entity in enumerate(entities)
+    }
+
+
+# Bitmask compilation
+
+def test_component_type_ids_are_dense():
+    ids = [get_component_type_id(t) for t in [ComponentA, ComponentB, ComponentC]]
+    assert len(set(ids)) == 3
+    assert all(isinstance(type_id, int) for type_id in ids)
+    assert get_component_type_mask([ComponentA, ComponentB]) == (
+        (1 << ids[0]) | (1 << ids[1])
+    )
+
+
+def test_match_mask():
+    f = or_filter(and_filter(ComponentA, ComponentB), ComponentC)
+    assert not f._match_mask(0)
+    assert not f._match_mask(get_component_type_mask([ComponentA]))
+    assert f._match_mask(get_component_type_mask([ComponentA, ComponentB]))
+    assert f._match_mask(get_component_type_mask([ComponentC]))
+
+
+def test_empty_filters():
+    assert and_filter([])(set())
+    assert not or_filter([])(set())
+
+
+def test_entity_mask_tracks_components(world, entity):
+    entity.add_component(ComponentA())
+    assert entity._mask == 0
+    world._flush_component_updates()
+    assert entity._mask == get_component_type_mask([ComponentA])
+    entity.remove_component(ComponentA)
+    world._flush_component_updates()
+    assert entity._mask == 0
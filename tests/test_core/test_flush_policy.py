@@ -0,0 +1,88 @@
+import pytest
+
+from wecs.core import World, System, and_filter
+
+from fixtures import NullComponent
+
+
+class Adder(System):
+    entity_filters = {}
+
+    def update(self, entities_by_filter):
+        self.world.create_entity(NullComponent())
+
+
+class Counter(System):
+    entity_filters = {'null': and_filter([NullComponent])}
+
+    def __init__(self):
+        super().__init__()
+        self.counts = []
+
+    def update(self, entities_by_filter):
+        self.counts.append(len(entities_by_filter['null']))
+
+
+class SyncCounter(Counter):
+    sync_point = True
+
+
+def run(flush_policy, counter_type=Counter):
+    world = World(flush_policy=flush_policy)
+    counter = counter_type()
+    world.add_system(Adder(), 0)
+    world.add_system(counter, 1)
+    world.update()
+    world.update()
+    return world, counter
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        World(flush_policy='never')
+
+
+def test_system_policy():
+    _, counter = run('system')
+    assert counter.counts == [1, 2]
+
+
+def test_frame_policy():
+    _, counter = run('frame')
+    assert counter.counts == [0, 1]
+
+
+def test_sync_policy_without_sync_point():
+    _, counter = run('sync')
+    assert counter.counts == [0, 1]
+
+
+def test_sync_policy_with_sync_point():
+    _, counter = run('sync', SyncCounter)
+    assert counter.counts == [1, 2]
+
+
+def test_flush_counters():
+    world = World()
+    world._flush_component_updates()
+    assert world.flush_count == 1
+    assert world.effective_flush_count == 0
+
+    world.create_entity(NullComponent())
+    world._flush_component_updates()
+    assert world.flush_count == 2
+    assert world.effective_flush_count == 1
+
+
+def test_frame_policy_flushes_less():
+    system_world, _ = run('system')
+    frame_world, _ = run('frame')
+    assert frame_world.flush_count < system_world.flush_count
+    assert frame_world.effective_flush_count == 1
+
+
+def test_explicit_flush():
+    world = World(flush_policy='frame')
+    entity = world.create_entity(NullComponent())
+    world.flush()
+    assert NullComponent in entity
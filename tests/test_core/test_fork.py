@@ -0,0 +1,176 @@
+import pytest
+
+from wecs.core import World, System, Component, and_filter, changed_filter
+from wecs.mechanics.clock import Clock, DetermineTimestep, SettableClock
+from wecs.rooms import Room, RoomPresence, PerceiveRoom
+from wecs.inventory import Inventory, Takeable, TakeAction, TakeOrDrop
+from wecs.equipment import Slot
+
+
+@Component()
+class Counter:
+    value: int = 0
+    history: list = None
+
+
+@Component(track_changes=True)
+class Tracked:
+    value: int = 0
+
+
+@Component(storage='columnar')
+class Position:
+    x: float = 0.0
+
+
+class Count(System):
+    entity_filters = {'counter': and_filter([Counter])}
+
+    def update(self, entities_by_filter):
+        for entity in entities_by_filter['counter']:
+            counter = entity[Counter]
+            counter.value += 1
+            counter.history.append(counter.value)
+
+
+@pytest.fixture(params=[False, True], ids=['entities', 'archetypes'])
+def world(request):
+    return World(archetypes=request.param)
+
+
+def test_components_are_shared_until_accessed(world):
+    entity = world.create_entity(Counter(history=[]), Tracked())
+    fork = world.fork()
+    forked = fork[entity._uid]
+    assert forked is not entity
+    assert forked.components[Counter] is entity[Counter]
+    assert forked[Counter] is not entity[Counter]
+    assert forked.components[Tracked] is entity[Tracked]
+
+
+def test_fork_runs_systems_in_isolation(world):
+    entity = world.create_entity(Counter(history=[]))
+    fork = world.fork()
+    fork.add_system(Count(), 0)
+    fork.update()
+    fork.update()
+    assert fork[entity._uid][Counter].history == [1, 2]
+    assert entity[Counter].value == 0
+    assert entity[Counter].history == []
+    assert fork.tick == world.tick + 2
+
+
+def test_structural_changes_in_fork(world):
+    entity = world.create_entity(Counter(history=[]))
+    other = world.create_entity(Tracked())
+    fork = world.fork()
+    fork.destroy_entity(entity._uid)
+    fork[other._uid].add_component(Counter(history=[]))
+    created = fork.create_entity(Tracked())
+    fork._flush_component_updates()
+    assert entity._uid in world.entities
+    assert Counter in entity
+    assert Counter not in other
+    assert created._uid not in world.entities
+    assert fork.get_entity(other.handle) is fork[other._uid]
+    assert not fork.is_alive(entity.handle)
+    assert world.is_alive(entity.handle)
+
+
+def test_change_tracking_in_fork(world):
+    class Watch(System):
+        entity_filters = {'changed': changed_filter(Tracked)}
+
+        def update(self, entities_by_filter):
+            self.seen = set(entities_by_filter['changed'])
+
+    entity = world.create_entity(Tracked())
+    world._flush_component_updates()
+    fork = world.fork()
+    watch = Watch()
+    fork.add_system(watch, 0)
+    fork.update()
+    forked = fork[entity._uid]
+    forked[Tracked].value = 1
+    fork.update()
+    assert watch.seen == {forked}
+    assert entity[Tracked].value == 0
+
+
+def test_removal_of_shared_tracked_component(world):
+    entity = world.create_entity(Tracked())
+    fork = world.fork()
+    fork[entity._uid].remove_component(Tracked)
+    fork._flush_component_updates()
+    assert entity[Tracked]._wecs_owner is entity
+
+
+def test_columnar_components_are_copied(world):
+    entity = world.create_entity(Position(x=1.0))
+    fork = world.fork()
+    fork[entity._uid][Position].x = 2.0
+    assert entity[Position].x == 1.0
+    assert fork.get_column_store(Position).column('x').tolist() == [2.0]
+
+
+def test_references_in_fork():
+    world = World()
+    room = world.create_entity(Room())
+    actor = world.create_entity(RoomPresence(room=room._uid))
+    item = world.create_entity(Takeable())
+    slot = world.create_entity(Slot(type=Takeable, content=item._uid))
+    fork = world.fork()
+    assert fork.get_referrers(room) == {fork[actor._uid]}
+    fork.destroy_entity(item._uid)
+    assert fork[slot._uid][Slot].content is None
+    assert slot[Slot].content is item._uid
+
+
+def test_non_rendering_systems_in_fork():
+    world = World()
+    clock = world.create_entity(Clock(clock=SettableClock(0.01)))
+    room = world.create_entity(Room())
+    item = world.create_entity(RoomPresence(room=room._uid), Takeable())
+    actor = world.create_entity(
+        RoomPresence(room=room._uid),
+        Inventory(),
+    )
+    world._flush_component_updates()
+    actor.add_component(TakeAction(item=item._uid))
+
+    fork = world.fork()
+    fork.add_system(DetermineTimestep(), 0)
+    fork.add_system(PerceiveRoom(), 1)
+    fork.add_system(TakeOrDrop(), 2)
+    fork.add_system(PerceiveRoom(), 3, add_duplicates=True)
+    fork.update()
+
+    assert fork[clock._uid][Clock].game_time == 0.01
+    assert fork[actor._uid][Inventory].contents == [item._uid]
+    assert RoomPresence not in fork[item._uid]
+    assert clock[Clock].game_time == 0.0
+    assert actor[Inventory].contents == []
+    assert RoomPresence in item
+    assert room[Room].presences == []
+
+
+class Engine:
+    # Not a dataclass, like an engine's physics world
+    pass
+
+
+def test_dataclass_resources_are_copied(world):
+    world.add_resource(Counter(value=1, history=[1]))
+    fork = world.fork()
+    resource = fork.resources[Counter]
+    resource.value = 2
+    resource.history.append(2)
+    assert world.resources[Counter].value == 1
+    assert world.resources[Counter].history == [1]
+
+
+def test_other_resources_are_shared(world):
+    engine = Engine()
+    world.add_resource(engine)
+    fork = world.fork()
+    assert fork.resources[Engine] is engine
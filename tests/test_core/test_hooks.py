@@ -0,0 +1,279 @@
+import pytest
+
+from wecs.core import World, System, Component
+from wecs.core import and_filter
+
+
+@Component()
+class Alpha:
+    pass
+
+
+@Component()
+class Beta:
+    pass
+
+
+class HookSystem(System):
+    entity_filters = {
+        'alpha': and_filter([Alpha]),
+        'beta': and_filter([Beta]),
+        'both': and_filter([Alpha, Beta]),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def enter_filter_alpha(self, entity):
+        self.calls.append(('enter', 'alpha', entity))
+
+    def enter_filter_beta_batch(self, entities):
+        self.calls.append(('enter', 'beta', list(entities)))
+
+    def enter_filter_both(self, entity):
+        self.calls.append(('enter', 'both', entity))
+
+    def exit_filter_alpha(self, entity):
+        self.calls.append(('exit', 'alpha', entity))
+
+    def exit_filter_beta_batch(self, entities):
+        self.calls.append(('exit', 'beta', list(entities)))
+
+    def exit_filter_both(self, entity):
+        self.calls.append(('exit', 'both', entity))
+
+    def update(self, entities_by_filter):
+        pass
+
+
+@pytest.fixture
+def world():
+    return World()
+
+
+@pytest.fixture
+def system(world):
+    system = HookSystem()
+    world.add_system(system, 0)
+    return system
+
+
+def test_hooks_are_looked_up_once(system):
+    assert set(system._enter_hooks) == {'alpha', 'both'}
+    assert set(system._enter_batch_hooks) == {'beta'}
+    assert set(system._exit_hooks) == {'alpha', 'both'}
+    assert set(system._exit_batch_hooks) == {'beta'}
+
+
+def test_batch_hook_gets_whole_batch(world, system):
+    entities = [world.create_entity(Beta()) for _ in range(3)]
+    world._flush_component_updates()
+    assert len(system.calls) == 1
+    assert system.calls[0][:2] == ('enter', 'beta')
+    assert sorted(system.calls[0][2], key=id) == sorted(entities, key=id)
+
+
+def test_hooks_in_filter_order(world, system):
+    world.create_entity(Alpha(), Beta())
+    world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    # The batch hook is called between the per-entity hooks of the
+    # filters before and after it, which are called entity by entity.
+    calls = system.calls
+    assert [call[:2] for call in calls] == [
+        ('enter', 'alpha'),
+        ('enter', 'alpha'),
+        ('enter', 'beta'),
+        ('enter', 'both'),
+        ('enter', 'both'),
+    ]
+    batch = calls[2][2]
+    assert [calls[0][2], calls[1][2]] == batch
+    assert [calls[3][2], calls[4][2]] == batch
+
+
+def test_exit_hooks_in_reverse_filter_order(world, system):
+    entity_1 = world.create_entity(Alpha(), Beta())
+    entity_2 = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    system.calls = []
+    world.destroy_entity(entity_1)
+    world.destroy_entity(entity_2)
+    world._flush_component_updates()
+    calls = system.calls
+    assert [call[:2] for call in calls] == [
+        ('exit', 'both'),
+        ('exit', 'both'),
+        ('exit', 'beta'),
+        ('exit', 'alpha'),
+        ('exit', 'alpha'),
+    ]
+    batch = calls[2][2]
+    assert set(batch) == {entity_1, entity_2}
+    assert [calls[0][2], calls[1][2]] == batch
+    assert [calls[3][2], calls[4][2]] == batch
+
+
+def test_partial_removal(world, system):
+    entity = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    system.calls = []
+    del entity[Beta]
+    world._flush_component_updates()
+    assert system.calls == [
+        ('exit', 'both', entity),
+        ('exit', 'beta', [entity]),
+    ]
+
+
+def test_exit_hooks_on_system_removal(world, system):
+    entity_1 = world.create_entity(Alpha(), Beta())
+    entity_2 = world.create_entity(Beta())
+    world._flush_component_updates()
+    system.calls = []
+    world.remove_system(HookSystem)
+    assert system.calls[0] == ('exit', 'both', entity_1)
+    assert system.calls[1][:2] == ('exit', 'beta')
+    assert set(system.calls[1][2]) == {entity_1, entity_2}
+    assert system.calls[2] == ('exit', 'alpha', entity_1)
+    assert len(system.calls) == 3
+    assert all(not entities for entities in system.entities.values())
+
+
+def test_default_enter_filters_calls_batch_hooks(world, system):
+    entity = world.create_entity()
+    system.enter_filters(['alpha', 'beta'], entity)
+    assert system.calls == [
+        ('enter', 'alpha', entity),
+        ('enter', 'beta', [entity]),
+    ]
+
+
+def test_overridden_enter_and_exit_filters(world):
+    class LegacySystem(HookSystem):
+        def enter_filters(self, filters, entity):
+            self.calls.append(('enter_filters', filters, entity))
+
+        def exit_filters(self, filters, entity):
+            self.calls.append(('exit_filters', filters, entity))
+
+    system = LegacySystem()
+    world.add_system(system, 0)
+    entity = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    assert system.calls == [
+        ('enter_filters', ['alpha', 'beta', 'both'], entity),
+    ]
+    system.calls = []
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    assert system.calls == [
+        ('exit_filters', ['alpha', 'beta', 'both'], entity),
+    ]
+
+
+@Component()
+class Gamma:
+    pass
+
+
+class PartnerSystem(System):
+    # Entering or exiting a filter changes the components of another
+    # entity that is flushed in the same flush.
+    entity_filters = {
+        'alpha': and_filter([Alpha]),
+        'beta': and_filter([Beta]),
+        'gamma': and_filter([Gamma]),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.partners = {}
+
+    def enter_filter_alpha(self, entity):
+        if Gamma not in self.partners[entity]:
+            self.partners[entity].add_component(Gamma())
+
+    def enter_filter_beta(self, entity):
+        self.enter_filter_alpha(entity)
+
+    def exit_filter_alpha(self, entity):
+        self.partners[entity].remove_component(Gamma)
+
+    def exit_filter_beta(self, entity):
+        self.exit_filter_alpha(entity)
+
+    def update(self, entities_by_filter):
+        pass
+
+
+@pytest.mark.parametrize('archetypes', [False, True])
+def test_enter_hook_adds_component(archetypes):
+    world = World(archetypes=archetypes)
+    system = PartnerSystem()
+    world.add_system(system, 0)
+    entity_a = world.create_entity(Alpha())
+    entity_b = world.create_entity(Beta())
+    system.partners = {entity_a: entity_b, entity_b: entity_a}
+    world._flush_component_updates()
+    assert Gamma in entity_a
+    assert Gamma in entity_b
+    assert system.entities['gamma'] == {entity_a, entity_b}
+    if archetypes:
+        archetype = world._get_archetype([Alpha, Gamma])
+        assert archetype.entities == {entity_a}
+
+
+@pytest.mark.parametrize('archetypes', [False, True])
+def test_exit_hook_removes_component(archetypes):
+    world = World(archetypes=archetypes)
+    entity_a = world.create_entity(Alpha(), Gamma())
+    entity_b = world.create_entity(Beta(), Gamma())
+    world._flush_component_updates()
+    system = PartnerSystem()
+    system.partners = {entity_a: entity_b, entity_b: entity_a}
+    world.add_system(system, 0)
+    del entity_a[Alpha]
+    del entity_b[Beta]
+    world._flush_component_updates()
+    assert Gamma not in entity_a
+    assert Gamma not in entity_b
+    assert system.entities['gamma'] == set()
+    if archetypes:
+        assert entity_a._archetype is world._get_archetype([])
+
+
+def test_batch_hook_called_once_per_flush(world, system):
+    # The entities differ in their component types, so they are
+    # flushed in different batches.
+    entities = [
+        world.create_entity(Beta()),
+        world.create_entity(Alpha(), Beta()),
+    ]
+    world._flush_component_updates()
+    beta_calls = [call for call in system.calls if call[1] == 'beta']
+    assert len(beta_calls) == 1
+    assert set(beta_calls[0][2]) == set(entities)
+
+    system.calls = []
+    for entity in entities:
+        world.destroy_entity(entity)
+    world._flush_component_updates()
+    beta_calls = [call for call in system.calls if call[1] == 'beta']
+    assert len(beta_calls) == 1
+    assert set(beta_calls[0][2]) == set(entities)
+
+
+def test_batch_hook_called_once_on_system_addition(world):
+    entities = [
+        world.create_entity(Beta()),
+        world.create_entity(Alpha(), Beta()),
+        world.create_entity(Beta()),
+    ]
+    world._flush_component_updates()
+    system = HookSystem()
+    world.add_system(system, 0)
+    beta_calls = [call for call in system.calls if call[1] == 'beta']
+    assert len(beta_calls) == 1
+    assert set(beta_calls[0][2]) == set(entities)
@@ -0,0 +1,127 @@
+import pytest
+
+from wecs.core import World, System, Component
+from wecs.core import and_filter, or_filter, changed_filter
+
+
+@Component()
+class Alpha:
+    i: int = 0
+
+
+@Component()
+class Beta:
+    i: int = 0
+
+
+@Component(track_changes=True)
+class Tracked:
+    i: int = 0
+
+
+class IterSystem(System):
+    entity_filters = {
+        'both': and_filter([Alpha, Beta]),
+        'any': or_filter([Alpha, Beta]),
+        'changed': changed_filter(Tracked),
+    }
+
+    def update(self, entities_by_filter):
+        for entity, (alpha, beta) in self.iter('both', Alpha, Beta):
+            alpha.i += 1
+            beta.i += 2
+
+
+@pytest.fixture
+def world():
+    return World()
+
+
+@pytest.fixture
+def system(world):
+    system = IterSystem()
+    world.add_system(system, 0)
+    return system
+
+
+def test_iter(world, system):
+    entities = [world.create_entity(Alpha(), Beta()) for _ in range(3)]
+    world.create_entity(Alpha())
+    world.update()
+    rows = list(system.iter('both', Alpha, Beta))
+    assert {entity for entity, _ in rows} == set(entities)
+    for entity, (alpha, beta) in rows:
+        assert alpha is entity[Alpha]
+        assert beta is entity[Beta]
+        assert (alpha.i, beta.i) == (1, 2)
+
+
+def test_iter_single_type(world, system):
+    entity = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    assert list(system.iter('both', Beta)) == [(entity, (entity[Beta], ))]
+
+
+def test_iter_is_cached(world, system):
+    world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    system.iter('both', Alpha, Beta)
+    rows = system._iter_cache['both'][(Alpha, Beta)]
+    system.iter('both', Alpha, Beta)
+    assert system._iter_cache['both'][(Alpha, Beta)] is rows
+
+
+def test_iter_cache_is_invalidated_by_flushes(world, system):
+    entity_1 = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    assert [e for e, _ in system.iter('both', Alpha, Beta)] == [entity_1]
+
+    entity_2 = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    assert {e for e, _ in system.iter('both', Alpha, Beta)} == {
+        entity_1, entity_2,
+    }
+
+    world.destroy_entity(entity_1)
+    world._flush_component_updates()
+    assert [e for e, _ in system.iter('both', Alpha, Beta)] == [entity_2]
+
+
+def test_iter_sees_replaced_components(world, system):
+    entity = world.create_entity(Alpha(), Beta())
+    world._flush_component_updates()
+    assert [c for _, (c, ) in system.iter('any', Alpha)] == [entity[Alpha]]
+
+    # The entity stays in the filter while its component is replaced.
+    del entity[Alpha]
+    entity.add_component(Alpha(i=5))
+    world._flush_component_updates()
+    assert [c.i for _, (c, ) in system.iter('any', Alpha)] == [5]
+
+
+def test_iter_of_missing_component(world, system):
+    world.create_entity(Beta())
+    world._flush_component_updates()
+    with pytest.raises(KeyError):
+        system.iter('any', Alpha)
+
+
+def test_iter_of_untested_component(world, system):
+    with pytest.raises(ValueError):
+        system.iter('both', Tracked)
+
+
+def test_iter_of_change_filter(world, system):
+    with pytest.raises(ValueError):
+        system.iter('changed', Tracked)
+
+
+def test_iter_in_fork(world, system):
+    entity = world.create_entity(Alpha(), Beta())
+    world.update()
+    fork = world.fork()
+    fork_system = IterSystem()
+    fork.add_system(fork_system, 0)
+    fork.update()
+    assert entity[Alpha].i == 1
+    assert fork.get_entity(entity._uid)[Alpha].i == 2
@@ -0,0 +1,184 @@
+from dataclasses import field
+
+import pytest
+
+from wecs.core import World, System, Component, and_filter
+from wecs.pooling import reset_to_defaults
+
+
+class Vector:
+    def __init__(self):
+        self.x = 0.0
+
+    def set(self, x):
+        self.x = x
+
+
+@Component()
+class Bullet:
+    speed: float = 1.0
+    hits: list = field(default_factory=list)
+    velocity: Vector = field(default_factory=Vector)
+
+
+@Component(track_changes=True)
+class Tracked:
+    value: int = 0
+
+
+@Component(storage='columnar')
+class Position:
+    x: float = 0.0
+
+
+@pytest.fixture
+def world():
+    world = World()
+    world.enable_pooling()
+    return world
+
+
+def test_entities_are_recycled(world):
+    entity = world.create_entity(Bullet())
+    uid = entity._uid
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    recycled = world.create_entity()
+    assert recycled is entity
+    assert recycled._uid is not uid
+    assert uid not in world.entities
+    assert world.get_entity(recycled._uid) is recycled
+    stats = world.pools.get_stats()['entities']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_entities_are_recycled_after_flush(world):
+    entity = world.create_entity(Bullet())
+    world._flush_component_updates()
+    world.destroy_entity(entity)
+    assert world.create_entity() is not entity
+    world._flush_component_updates()
+    assert world.create_entity() is entity
+
+
+def test_entities_without_components_are_recycled_right_away(world):
+    entity = world.create_entity()
+    world.destroy_entity(entity)
+    assert world.create_entity() is entity
+
+
+def test_recycled_entities_in_systems(world):
+    class Bullets(System):
+        entity_filters = {'bullets': and_filter([Bullet])}
+
+    system = Bullets()
+    world.add_system(system, 0)
+    entity = world.create_entity(Bullet())
+    world._flush_component_updates()
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    recycled = world.create_entity(Tracked())
+    world._flush_component_updates()
+    assert recycled is entity
+    assert system.entities['bullets'] == set()
+    assert Bullet not in recycled
+
+
+def test_no_entity_recycling_with_deltas(world):
+    world.enable_deltas()
+    entity = world.create_entity()
+    world.destroy_entity(entity)
+    assert world.create_entity() is not entity
+
+
+def test_components_are_recycled(world):
+    world.pools.register(Bullet)
+    bullet = world.create_component(Bullet, speed=5.0)
+    bullet.hits.append(1)
+    hits = bullet.hits
+    entity = world.create_entity(bullet)
+    world._flush_component_updates()
+    entity.remove_component(Bullet)
+    world._flush_component_updates()
+
+    recycled = world.create_component(Bullet)
+    assert recycled is bullet
+    assert recycled.speed == 1.0
+    assert recycled.hits == []
+    assert recycled.hits is hits
+    assert world.pools.get_stats()[Bullet] == {
+        'hits': 1, 'misses': 1, 'released': 1, 'discarded': 0, 'free': 0,
+    }
+
+
+def test_components_of_destroyed_entities_are_recycled(world):
+    world.pools.register(Bullet)
+    bullet = world.create_component(Bullet)
+    entity = world.create_entity(bullet)
+    world._flush_component_updates()
+    world.destroy_entity(entity)
+    assert world.pools.get_pool(Bullet).free == []
+    world._flush_component_updates()
+    assert world.pools.get_pool(Bullet).free == [bullet]
+
+
+def test_custom_reset(world):
+    def reset_bullet(bullet):
+        reset_to_defaults(bullet, factories=False)
+        bullet.velocity.set(0.0)
+
+    world.pools.register(Bullet, reset=reset_bullet)
+    bullet = world.create_component(Bullet, speed=2.0)
+    velocity = bullet.velocity
+    velocity.set(3.0)
+    world.pools.release(bullet)
+    recycled = world.create_component(Bullet)
+    assert recycled.velocity is velocity
+    assert velocity.x == 0.0
+    assert recycled.speed == 1.0
+
+
+def test_default_reset_uses_factories(world):
+    world.pools.register(Bullet)
+    bullet = world.create_component(Bullet)
+    velocity = bullet.velocity
+    world.pools.release(bullet)
+    assert world.create_component(Bullet).velocity is not velocity
+
+
+def test_capacity(world):
+    world.pools.register(Bullet, capacity=1)
+    world.pools.release(Bullet())
+    world.pools.release(Bullet())
+    stats = world.pools.get_stats()[Bullet]
+    assert stats['free'] == 1
+    assert stats['discarded'] == 1
+
+
+def test_recycled_tracked_components(world):
+    world.pools.register(Tracked)
+    entity = world.create_entity(world.create_component(Tracked))
+    world._flush_component_updates()
+    entity.remove_component(Tracked)
+    world._flush_component_updates()
+    recycled = world.create_component(Tracked, value=3)
+    assert recycled.value == 3
+    other = world.create_entity(recycled)
+    world._flush_component_updates()
+    assert recycled._wecs_owner is other
+
+
+def test_unregistered_types_are_not_pooled(world):
+    assert world.create_component(Bullet, speed=3.0).speed == 3.0
+    with pytest.raises(KeyError):
+        world.pools.get_pool(Bullet)
+
+
+def test_no_pooling_of_columnar_components(world):
+    with pytest.raises(ValueError):
+        world.pools.register(Position)
+
+
+def test_create_component_without_pooling():
+    assert World().create_component(Bullet, speed=2.0).speed == 2.0
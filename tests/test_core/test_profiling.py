@@ -0,0 +1,85 @@
+from wecs.core import World
+from wecs.profiling import RollingStat
+from wecs.scheduler import ParallelScheduler
+
+from fixtures import world
+from fixtures import NullComponent
+from fixtures import NullSystem
+from fixtures import null_system
+
+
+def test_profiling_disabled_by_default(world):
+    assert world.profiler is None
+
+
+def test_rolling_stat():
+    stat = RollingStat(window=4)
+    for value in [5.0, 1.0, 2.0, 3.0, 4.0]:
+        stat.add(value)
+    assert len(stat) == 4
+    assert stat.mean() == 2.5
+    assert stat.max() == 4.0
+    assert stat.percentile(0) == 1.0
+    assert stat.percentile(100) == 4.0
+    assert stat.last() == 4.0
+
+
+def test_empty_rolling_stat():
+    stat = RollingStat(window=4)
+    assert stat.mean() == 0.0
+    assert stat.percentile(99) == 0.0
+
+
+def test_system_phases_recorded(world, null_system):
+    profiler = world.enable_profiling(window=10)
+    world.add_system(null_system, 0)
+    world.create_entity(NullComponent())
+    for _ in range(3):
+        world.update()
+
+    assert len(profiler.frame_times) == 3
+    assert len(profiler.get_stats(null_system, 'update')) == 3
+    assert len(profiler.get_stats(null_system, 'flush')) == 3
+    assert profiler.get_stats(NullSystem, 'enter').max() > 0.0
+    assert profiler.filter_counts[null_system] == {'null': 1}
+
+
+def test_exit_hooks_recorded(world, null_system):
+    profiler = world.enable_profiling()
+    world.add_system(null_system, 0)
+    entity = world.create_entity(NullComponent())
+    world.update()
+    world.destroy_entity(entity)
+    world.update()
+    assert profiler.get_stats(null_system, 'exit').last() > 0.0
+    assert profiler.filter_counts[null_system] == {'null': 0}
+
+
+def test_summary(world, null_system):
+    profiler = world.enable_profiling()
+    world.add_system(null_system, 0)
+    world.update()
+    summary = profiler.summary(percentiles=(50, 99))
+    assert set(summary['frame']) == {'mean', 'max', 'p50', 'p99'}
+    assert 'update' in summary[null_system]
+    assert null_system in profiler.get_systems()
+
+
+def test_disable_and_reset(world, null_system):
+    profiler = world.enable_profiling()
+    world.add_system(null_system, 0)
+    world.update()
+    profiler.reset()
+    assert len(profiler.frame_times) == 0
+    world.disable_profiling()
+    world.update()
+    assert len(profiler.frame_times) == 0
+
+
+def test_profiling_with_scheduler(null_system):
+    world = World(scheduler=ParallelScheduler())
+    profiler = world.enable_profiling()
+    world.add_system(null_system, 0)
+    world.update()
+    assert len(profiler.get_stats(null_system, 'update')) == 1
+    assert len(profiler.get_stats(None, 'flush')) == 1
@@ -0,0 +1,98 @@
+import pytest
+
+from wecs.core import World, Component
+from wecs.core import and_filter, or_filter, changed_filter
+
+from fixtures import world
+from fixtures import NullComponent
+
+
+@Component()
+class ComponentA:
+    pass
+
+
+@Component()
+class ComponentB:
+    pass
+
+
+def test_query_existing_entities(world):
+    entity = world.create_entity(ComponentA())
+    world.create_entity(ComponentB())
+    world._flush_component_updates()
+    query = world.query(and_filter([ComponentA]))
+    assert set(query) == {entity}
+    assert len(query) == 1
+    assert entity in query
+
+
+def test_query_pending_entities(world):
+    entity = world.create_entity(ComponentA())
+    query = world.query([ComponentA])
+    assert set(query) == {entity}
+
+
+def test_query_is_maintained(world):
+    query = world.query(and_filter([ComponentA]))
+    entity = world.create_entity(ComponentA())
+    assert entity not in query
+    world._flush_component_updates()
+    assert entity in query
+
+    entity.remove_component(ComponentA)
+    world._flush_component_updates()
+    assert entity not in query
+
+    entity.add_component(ComponentA())
+    world._flush_component_updates()
+    world.destroy_entity(entity)
+    world._flush_component_updates()
+    assert entity not in query
+
+
+def test_equivalent_queries_are_shared(world):
+    query_1 = world.query(and_filter([ComponentA, ComponentB]))
+    query_2 = world.query(and_filter([ComponentB, ComponentA]))
+    query_3 = world.query(or_filter([ComponentA, ComponentB]))
+    assert query_1 is query_2
+    assert query_1 is not query_3
+
+
+def test_query_freed_on_last_release(world):
+    query = world.query(and_filter([ComponentA]))
+    world.query(and_filter([ComponentA]))
+    query.release()
+    assert ComponentA in world._filter_index
+    query.release()
+    assert world._queries == {}
+    assert ComponentA not in world._filter_index
+    with pytest.raises(ValueError):
+        query.release()
+
+
+def test_query_context_manager(world):
+    entity = world.create_entity(NullComponent())
+    with world.query([NullComponent]) as query:
+        assert set(query) == {entity}
+    assert world._queries == {}
+
+
+def test_queries_are_not_systems(world):
+    world.query([NullComponent])
+    assert world.systems == {}
+
+
+def test_query_in_archetype_mode():
+    world = World(archetypes=True)
+    entity = world.create_entity(ComponentA(), ComponentB())
+    query = world.query(or_filter([ComponentA]))
+    assert set(query) == {entity}
+    del entity[ComponentA]
+    world._flush_component_updates()
+    assert entity not in query
+
+
+def test_no_change_filters_in_queries(world):
+    with pytest.raises(ValueError):
+        world.query(changed_filter(ComponentA))
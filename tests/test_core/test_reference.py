@@ -1,3 +1,4 @@
+import numpy
 import pytest
 
 from fixtures import world
@@ -5,6 +6,7 @@ from fixtures import world
 from wecs.core import UID
 from wecs.core import NoSuchUID
 from wecs.core import Component
+from wecs.core import make_handle, get_handle_index, get_handle_generation
 
 
 @Component()
@@ -57,3 +59,67 @@ def test_resolving_dangling_reference(world):
     world._flush_component_updates()
     with pytest.raises(NoSuchUID):
         world.get_entity(from_entity.get_component(Reference).uid)
+
+
+# Handles
+
+def test_handle(world):
+    entity = world.create_entity()
+    assert isinstance(entity.handle, int)
+    assert world.get_entity(entity.handle) is entity
+    assert world[entity.handle] is entity
+    assert world.is_alive(entity.handle)
+
+
+def test_handle_packing():
+    handle = make_handle(7, 3)
+    assert get_handle_index(handle) == 7
+    assert get_handle_generation(handle) == 3
+
+
+def test_stale_handle(world):
+    entity = world.create_entity()
+    handle = entity.handle
+    world.destroy_entity(handle)
+    assert not world.is_alive(handle)
+    with pytest.raises(NoSuchUID):
+        world.get_entity(handle)
+
+    # The slot gets reused, but the old handle stays invalid.
+    new_entity = world.create_entity()
+    assert get_handle_index(new_entity.handle) == get_handle_index(handle)
+    assert new_entity.handle != handle
+    assert world.get_entity(new_entity.handle) is new_entity
+    with pytest.raises(NoSuchUID):
+        world.get_entity(handle)
+
+
+def test_unknown_handle(world):
+    assert not world.is_alive(make_handle(100, 0))
+    with pytest.raises(NoSuchUID):
+        world.get_entity(make_handle(100, 0))
+
+
+def test_handles_of_batch(world):
+    entities = world.create_entities([Reference], count=3, overrides={
+        Reference: dict(uid=[None, None, None]),
+    })
+    handles = {entity.handle for entity in entities}
+    assert len(handles) == 3
+    world.destroy_entities(handles)
+    assert not any(world.is_alive(handle) for handle in handles)
+
+
+def test_numpy_handles(world):
+    entities = [world.create_entity() for _ in range(3)]
+    handles = numpy.array([entity.handle for entity in entities], dtype=numpy.int64)
+    assert isinstance(handles[0], numpy.int64)
+    assert world.get_entity(handles[0]) is entities[0]
+    assert world[handles[1]] is entities[1]
+    assert world.is_alive(handles[2])
+    world.destroy_entity(handles[2])
+    assert not world.is_alive(handles[2])
+    with pytest.raises(NoSuchUID):
+        world.get_entity(handles[2])
+    world.destroy_entities(handles[:2])
+    assert world.entities == {}
@@ -0,0 +1,174 @@
+import pytest
+
+from wecs.core import UID, Component, reference
+
+from fixtures import world
+
+
+@Component()
+class Parent:
+    parent: UID = reference(default=None)
+
+
+@Component()
+class Children:
+    children: list = reference(many=True)
+
+
+@Component()
+class ClearedParent:
+    parent: UID = reference(default=None, on_delete='clear')
+
+
+@Component()
+class ClearedChildren:
+    children: list = reference(many=True, on_delete='clear')
+
+
+@Component(slots=False)
+class UnslottedParent:
+    parent: UID = reference(default=None)
+    i: int = 0
+
+
+@Component(track_changes=True)
+class TrackedParent:
+    parent: UID = reference(default=None)
+    i: int = 0
+
+
+def test_reference_defaults():
+    assert Parent().parent is None
+    assert Children().children == []
+
+
+def test_referrers_after_flush(world):
+    target = world.create_entity()
+    referrer = world.create_entity(Parent(parent=target._uid))
+    assert world.get_referrers(target) == set()
+    world._flush_component_updates()
+    assert world.get_referrers(target) == {referrer}
+    assert world.get_referrers(target._uid) == {referrer}
+    assert world.get_referrers(target, Parent) == {referrer}
+    assert world.get_referrers(target, Children) == set()
+
+
+def test_reference_by_handle(world):
+    target = world.create_entity()
+    referrer = world.create_entity(Parent(parent=target.handle))
+    world._flush_component_updates()
+    assert world.get_referrers(target) == {referrer}
+
+
+def test_assignment_updates_index(world):
+    target_1 = world.create_entity()
+    target_2 = world.create_entity()
+    referrer = world.create_entity(Parent(parent=target_1._uid))
+    world._flush_component_updates()
+
+    referrer[Parent].parent = target_2._uid
+    assert world.get_referrers(target_1) == set()
+    assert world.get_referrers(target_2) == {referrer}
+
+    referrer[Parent].parent = None
+    assert world.get_referrers(target_2) == set()
+    assert world._references == {}
+
+
+def test_assignment_updates_index_without_slots(world):
+    target = world.create_entity()
+    referrer = world.create_entity(UnslottedParent())
+    world._flush_component_updates()
+    referrer[UnslottedParent].parent = target._uid
+    assert referrer[UnslottedParent].parent == target._uid
+    assert world.get_referrers(target) == {referrer}
+
+
+def test_only_reference_fields_are_intercepted():
+    assert '__setattr__' not in vars(Parent)
+    assert '__setattr__' not in vars(UnslottedParent)
+    assert 'i' not in vars(UnslottedParent)
+
+
+def test_tracked_component_with_references(world):
+    target = world.create_entity()
+    referrer = world.create_entity(TrackedParent())
+    world._flush_component_updates()
+    referrer[TrackedParent].parent = target._uid
+    assert world.get_referrers(target) == {referrer}
+
+
+def test_list_references(world):
+    child_1 = world.create_entity()
+    child_2 = world.create_entity()
+    parent = world.create_entity(Children(children=[child_1._uid]))
+    world._flush_component_updates()
+    assert world.get_referrers(child_1) == {parent}
+
+    parent[Children].children.append(child_2._uid)
+    assert world.get_referrers(child_2) == set()
+    parent.mark_changed(Children)
+    assert world.get_referrers(child_2) == {parent}
+
+
+def test_component_removal_unindexes(world):
+    target = world.create_entity()
+    referrer = world.create_entity(Parent(parent=target._uid))
+    world._flush_component_updates()
+    del referrer[Parent]
+    world._flush_component_updates()
+    assert world.get_referrers(target) == set()
+    assert world._referrers == {}
+
+
+def test_destroying_referrer_unindexes(world):
+    target = world.create_entity()
+    referrer = world.create_entity(Parent(parent=target._uid))
+    world._flush_component_updates()
+    world.destroy_entity(referrer)
+    world._flush_component_updates()
+    assert world._referrers == {}
+    assert world._references == {}
+
+
+def test_destroying_target_keeps_references(world):
+    target = world.create_entity()
+    single = world.create_entity(Parent(parent=target._uid))
+    many = world.create_entity(Children(children=[target._uid]))
+    world._flush_component_updates()
+
+    world.destroy_entity(target)
+    assert single[Parent].parent == target._uid
+    assert many[Children].children == [target._uid]
+    assert world.get_referrers(target._uid) == {single, many}
+
+    single[Parent].parent = None
+    assert world.get_referrers(target._uid) == {many}
+
+
+def test_destroying_target_clears_references(world):
+    target = world.create_entity()
+    other = world.create_entity()
+    single = world.create_entity(ClearedParent(parent=target._uid))
+    many = world.create_entity(
+        ClearedChildren(children=[target._uid, other._uid]),
+    )
+    world._flush_component_updates()
+
+    world.destroy_entity(target)
+    assert single[ClearedParent].parent is None
+    assert many[ClearedChildren].children == [other._uid]
+    assert world.get_referrers(other) == {many}
+    assert target._uid not in world._referrers
+
+
+def test_unknown_on_delete():
+    with pytest.raises(ValueError):
+        reference(on_delete='cascade')
+
+
+def test_no_references_in_columnar_components():
+    with pytest.raises(ValueError):
+        @Component(storage='columnar')
+        class Invalid:
+            parent: int = reference(default=0)
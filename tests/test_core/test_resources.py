@@ -0,0 +1,75 @@
+import pytest
+
+from wecs.core import System, Component
+
+from fixtures import world
+from fixtures import NullComponent
+
+
+@Component()
+class Settings:
+    gravity: float = 9.81
+
+
+class UsesSettings(System):
+    entity_filters = {'null': NullComponent}
+    resources = {Settings}
+
+    def update(self, entities_by_filter):
+        self.gravity = self.get_resource(Settings).gravity
+
+
+class DeclaresAccess(UsesSettings):
+    reads = {NullComponent, Settings}
+    writes = set()
+
+
+def test_add_and_remove_resource(world):
+    settings = Settings()
+    world.add_resource(settings)
+    assert world.resources[Settings] is settings
+    assert world.remove_resource(Settings) is settings
+    assert Settings not in world.resources
+
+
+def test_resource_replaced(world):
+    world.add_resource(Settings())
+    settings = Settings(gravity=1.62)
+    world.add_resource(settings)
+    assert world.resources[Settings] is settings
+
+
+def test_system_gets_resource(world):
+    system = UsesSettings()
+    world.add_system(system, 0)
+    world.add_resource(Settings(gravity=1.62))
+    world.update()
+    assert system.gravity == 1.62
+
+
+def test_missing_resource(world):
+    system = UsesSettings()
+    world.add_system(system, 0)
+    assert system.get_resource(Settings) is None
+
+
+def test_undeclared_resource(world):
+    system = UsesSettings()
+    world.add_system(system, 0)
+    with pytest.raises(KeyError):
+        system.get_resource(int)
+
+
+def test_resources_are_not_in_filters(world):
+    world.add_system(UsesSettings(), 0)
+    world.add_resource(Settings())
+    assert Settings not in world._filter_index
+
+
+def test_resources_count_as_access():
+    reads, writes = UsesSettings().get_component_access()
+    assert reads == {NullComponent, Settings}
+    assert writes == {NullComponent, Settings}
+    reads, writes = DeclaresAccess().get_component_access()
+    assert reads == {NullComponent, Settings}
+    assert writes == set()
@@ -0,0 +1,185 @@
+import threading
+
+import pytest
+
+from wecs.core import World, System, Component, and_filter
+from wecs.scheduler import ParallelScheduler
+from wecs.scheduler import get_stages
+from wecs.scheduler import systems_conflict
+from wecs.inventory import TakeOrDrop
+from wecs.equipment import EquipOrUnequip
+
+
+@Component()
+class ComponentA:
+    i: int = 0
+
+
+@Component()
+class ComponentB:
+    i: int = 0
+
+
+class WritesA(System):
+    entity_filters = {'a': and_filter([ComponentA])}
+    reads = {ComponentA}
+    writes = {ComponentA}
+
+
+class ReadsA(System):
+    entity_filters = {'a': and_filter([ComponentA])}
+    writes = set()
+
+
+class AlsoReadsA(System):
+    entity_filters = {'a': and_filter([ComponentA])}
+    writes = set()
+
+
+class WritesB(System):
+    entity_filters = {'b': and_filter([ComponentB])}
+    reads = {ComponentB}
+    writes = {ComponentB}
+
+
+class Exclusive(System):
+    entity_filters = {}
+    exclusive = True
+
+
+class Undeclared(System):
+    entity_filters = {'b': and_filter([ComponentB])}
+
+
+def test_inferred_access():
+    reads, writes = ReadsA().get_component_access()
+    assert reads == {ComponentA}
+
+
+def test_undeclared_access_is_exclusive():
+    assert Undeclared().is_exclusive()
+    assert not ReadsA().is_exclusive()
+    assert systems_conflict(Undeclared(), ReadsA())
+    writes_a = WritesA()
+    undeclared = Undeclared()
+    reads_a = ReadsA()
+    assert get_stages([writes_a, undeclared, reads_a]) == [
+        [writes_a],
+        [undeclared],
+        [reads_a],
+    ]
+
+
+def test_declared_access():
+    reads, writes = ReadsA().get_component_access()
+    assert reads == {ComponentA}
+    assert writes == set()
+
+
+def test_conflicts():
+    assert systems_conflict(WritesA(), ReadsA())
+    assert systems_conflict(ReadsA(), WritesA())
+    assert not systems_conflict(ReadsA(), AlsoReadsA())
+    assert not systems_conflict(WritesA(), WritesB())
+    assert systems_conflict(Exclusive(), WritesB())
+    # Both move items between inventories and rooms.
+    assert systems_conflict(TakeOrDrop(), EquipOrUnequip())
+
+
+def test_stages():
+    writes_a = WritesA()
+    reads_a = ReadsA()
+    also_reads_a = AlsoReadsA()
+    writes_b = WritesB()
+    exclusive = Exclusive()
+    stages = get_stages([writes_a, writes_b, reads_a, also_reads_a, exclusive])
+    assert stages == [
+        [writes_a, writes_b],
+        [reads_a, also_reads_a],
+        [exclusive],
+    ]
+
+
+def test_stages_respect_sort_only_on_conflict():
+    reads_a = ReadsA()
+    writes_a = WritesA()
+    writes_b = WritesB()
+    stages = get_stages([reads_a, writes_a, writes_b])
+    assert stages == [[reads_a, writes_b], [writes_a]]
+
+
+def test_scheduler_stages_follow_world():
+    scheduler = ParallelScheduler()
+    world = World(scheduler=scheduler)
+    writes_a = WritesA()
+    reads_a = ReadsA()
+    world.add_system(reads_a, 1)
+    world.add_system(writes_a, 0)
+    assert scheduler.get_stages(world) == [[writes_a], [reads_a]]
+    world.remove_system(ReadsA)
+    assert scheduler.get_stages(world) == [[writes_a]]
+
+
+def test_concurrent_update():
+    barrier = threading.Barrier(2, timeout=5)
+    updated = []
+
+    class Waiting(ReadsA):
+        def update(self, entities_by_filter):
+            barrier.wait()
+            updated.append(self)
+
+    class AlsoWaiting(AlsoReadsA):
+        def update(self, entities_by_filter):
+            barrier.wait()
+            updated.append(self)
+
+    scheduler = ParallelScheduler(max_workers=2)
+    world = World(scheduler=scheduler)
+    world.add_system(Waiting(), 0)
+    world.add_system(AlsoWaiting(), 1)
+    world.update()
+    scheduler.shutdown()
+    assert len(updated) == 2
+
+
+def test_exceptions_propagate():
+    class Failing(ReadsA):
+        def update(self, entities_by_filter):
+            raise ValueError
+
+    world = World(scheduler=ParallelScheduler())
+    world.add_system(Failing(), 0)
+    world.add_system(AlsoReadsA(), 1)
+    with pytest.raises(ValueError):
+        world.update()
+    world.scheduler.shutdown()
+
+
+def test_structural_changes_flushed_between_stages():
+    class Adder(System):
+        entity_filters = {'a': and_filter([ComponentA])}
+        writes = {ComponentA, ComponentB}
+
+        def update(self, entities_by_filter):
+            for entity in entities_by_filter['a']:
+                if ComponentB not in entity:
+                    entity.add_component(ComponentB())
+
+    class Reader(System):
+        entity_filters = {'b': and_filter([ComponentB])}
+
+        def __init__(self):
+            super().__init__()
+            self.seen = []
+
+        def update(self, entities_by_filter):
+            self.seen.append(set(entities_by_filter['b']))
+
+    world = World(scheduler=ParallelScheduler())
+    reader = Reader()
+    world.add_system(Adder(), 0)
+    world.add_system(reader, 1)
+    entity = world.create_entity(ComponentA())
+    world.update()
+    assert reader.seen == [{entity}]
@@ -0,0 +1,46 @@
+import pytest
+
+from wecs.core import Component, UID
+from wecs.core import slots_supported
+
+from fixtures import world
+from fixtures import entity
+
+
+def test_entity_has_no_dict(entity):
+    assert not hasattr(entity, '__dict__')
+    with pytest.raises(AttributeError):
+        entity.undeclared = 1
+
+
+def test_uid_has_no_dict():
+    assert not hasattr(UID(), '__dict__')
+
+
+@pytest.mark.skipif(not slots_supported, reason="Requires Python 3.10+")
+def test_slotted_component_by_default():
+    @Component()
+    class Slotted:
+        i: int = 0
+
+    component = Slotted(i=1)
+    assert component.i == 1
+    assert not hasattr(component, '__dict__')
+    with pytest.raises(AttributeError):
+        component.undeclared = 1
+
+
+def test_unslotted_component():
+    @Component(slots=False)
+    class Unslotted:
+        i: int = 0
+
+    component = Unslotted()
+    component.undeclared = 1
+    assert component.undeclared == 1
+
+
+@pytest.mark.skipif(slots_supported, reason="Requires Python < 3.10")
+def test_slots_unsupported():
+    with pytest.raises(ValueError):
+        Component(slots=True)
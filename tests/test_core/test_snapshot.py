@@ -0,0 +1,218 @@
+import struct
+from dataclasses import field
+
+import pytest
+
+from wecs.core import World, System, Component, UID, and_filter, reference
+from wecs.snapshot import register_codec
+
+from fixtures import NullComponent
+
+
+@Component()
+class Values:
+    f: float = 0.0
+    i: int = 0
+    b: bool = False
+    s: str = ''
+    other: object = None
+
+
+@Component()
+class Pointer:
+    target: UID = None
+
+
+@Component()
+class HandlePointer:
+    target: int = reference(default=None)
+
+
+@Component(track_changes=True)
+class Tracked:
+    i: int = 0
+
+
+@Component()
+class Derived:
+    i: int = 0
+    double: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.double = self.i * 2
+
+
+@Component()
+class Settings:
+    gravity: float = 9.81
+
+
+class Vector:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+register_codec(
+    Vector,
+    lambda v: struct.pack('<2d', v.x, v.y),
+    lambda data: Vector(*struct.unpack('<2d', data)),
+)
+
+
+class NullSystem(System):
+    entity_filters = {'null': and_filter([NullComponent])}
+
+
+def round_trip(world):
+    data = world.snapshot()
+    assert isinstance(data, bytes)
+    restored = World()
+    entities = restored.restore(data)
+    return restored, entities
+
+
+def test_empty_world():
+    world, entities = round_trip(World())
+    assert entities == []
+    assert world.entities == {}
+
+
+def test_component_values():
+    world = World()
+    world.create_entity(Values(f=1.5, i=-3, b=True, s='ä', other=[1, (2, 'x')]))
+    world.create_entity(Values(f=2.5, i=2 ** 70, other={'a': None}))
+    _, (entity_1, entity_2) = round_trip(world)
+    values = entity_1[Values]
+    assert (values.f, values.i, values.b, values.s) == (1.5, -3, True, 'ä')
+    assert values.other == [1, (2, 'x')]
+    assert entity_2[Values].i == 2 ** 70
+    assert entity_2[Values].other == {'a': None}
+
+
+def test_names():
+    world = World()
+    world.create_entity(name='alice')
+    world.create_entity()
+    _, (entity_1, entity_2) = round_trip(world)
+    assert entity_1.name == 'alice'
+    assert entity_2.name is None
+
+
+def test_uids_are_remapped():
+    world = World()
+    target = world.create_entity()
+    world.create_entity(Pointer(target=target._uid))
+    world.create_entity(Pointer(target=UID('elsewhere')))
+    _, (new_target, pointer, dangling) = round_trip(world)
+    assert pointer[Pointer].target is new_target._uid
+    assert dangling[Pointer].target.name == 'elsewhere'
+
+
+def test_handles_in_references_are_remapped():
+    world = World()
+    world.create_entity()  # Shifts the handles of the restored world
+    target = world.create_entity()
+    world.create_entity(HandlePointer(target=target.handle))
+    restored = World()
+    restored.create_entity()
+    restored.create_entity()
+    _, new_target, pointer = restored.restore(world.snapshot())
+    assert pointer[HandlePointer].target == new_target.handle
+    assert restored.get_referrers(new_target) == {pointer}
+
+
+def test_restored_components_are_attached():
+    world = World()
+    world.create_entity(Tracked(i=1), HandlePointer())
+    _, (entity, ) = round_trip(world)
+    assert entity[Tracked].i == 1
+    assert entity[Tracked]._wecs_owner is entity
+    assert entity[HandlePointer]._wecs_owner is entity
+
+
+def test_post_init_runs_on_restore():
+    world = World()
+    world.create_entity(Derived(i=2))
+    _, (entity, ) = round_trip(world)
+    assert entity[Derived].double == 4
+
+
+def test_codecs():
+    world = World()
+    world.create_entity(Values(other=Vector(1.0, 2.0)))
+    _, (entity, ) = round_trip(world)
+    vector = entity[Values].other
+    assert (vector.x, vector.y) == (1.0, 2.0)
+
+
+def test_unencodable_value():
+    world = World()
+    world.create_entity(Values(other=object()))
+    with pytest.raises(TypeError):
+        world.snapshot()
+
+
+def test_resources():
+    world = World()
+    world.add_resource(Settings(gravity=1.62))
+    restored, _ = round_trip(world)
+    assert restored.resources[Settings].gravity == 1.62
+
+
+def test_non_dataclass_resources():
+    world = World()
+    world.add_resource(Vector(1.0, 2.0))
+    restored, _ = round_trip(world)
+    vector = restored.resources[Vector]
+    assert (vector.x, vector.y) == (1.0, 2.0)
+
+
+def test_unencodable_resource():
+    world = World()
+    world.add_resource(object())
+    with pytest.raises(TypeError):
+        world.snapshot()
+
+
+def test_restore_replaces_entities_and_updates_systems():
+    world = World()
+    world.create_entity(NullComponent())
+    data = world.snapshot()
+
+    other = World()
+    system = NullSystem()
+    other.add_system(system, 0)
+    old_entity = other.create_entity(NullComponent())
+    (entity, ) = other.restore(data)
+    assert list(other.entities.values()) == [entity]
+    assert system.entities['null'] == {entity}
+    assert old_entity not in system.entities['null']
+
+
+def test_restore_in_archetype_mode():
+    world = World()
+    world.create_entity(NullComponent(), Values(i=1))
+    world.create_entity(NullComponent())
+    restored = World(archetypes=True)
+    system = NullSystem()
+    restored.add_system(system, 0)
+    both, null = restored.restore(world.snapshot())
+    assert system.entities['null'] == {both, null}
+    assert restored._get_archetype([NullComponent, Values]).entities == {both}
+    assert restored._get_archetype([NullComponent]).entities == {null}
+    del both[Values]
+    restored._flush_component_updates()
+    assert both._archetype is null._archetype
+
+
+def test_pending_updates_are_included():
+    world = World()
+    world.create_entity(NullComponent())
+    _, (entity, ) = round_trip(world)
+    assert NullComponent in entity
+
+
+def test_not_a_snapshot():
+    with pytest.raises(ValueError):
+        World().restore(b'nonsense')
@@ -21,6 +21,9 @@ from wecs.inventory import can_drop
 from wecs.inventory import take
 from wecs.inventory import drop
 from wecs.inventory import TakeOrDrop
+from wecs.inventory import TakeEvent
+from wecs.inventory import DropEvent
+from wecs.inventory import TakeOrDropEvents
 
 
 @pytest.fixture
@@ -346,3 +349,73 @@ def test_can_not_take_from_the_void_exception(world):
     )
     with pytest.raises(ActorNotInRoom):
         world.update()
+
+
+def test_take_item_event(world, room, item):
+    world.add_system(PerceiveRoom(), 0)
+    world.add_system(TakeOrDropEvents(), 1)
+    world.add_system(PerceiveRoom(), 2, add_duplicates=True)
+    actor = world.create_entity(
+        RoomPresence(room=room._uid),
+        Inventory(),
+    )
+    world.send_event(TakeEvent(actor=actor._uid, item=item._uid))
+    world.update()
+
+    assert actor.get_component(Inventory).contents == [item._uid]
+    assert not item.has_component(RoomPresence)
+
+
+def test_drop_item_event(world, room):
+    world.add_system(PerceiveRoom(), 0)
+    world.add_system(TakeOrDropEvents(), 1)
+    world.add_system(PerceiveRoom(), 2, add_duplicates=True)
+    item = world.create_entity(
+        Takeable(),
+    )
+    actor = world.create_entity(
+        RoomPresence(room=room._uid),
+        Inventory(contents=[item._uid]),
+    )
+    world.send_event(DropEvent(actor=actor._uid, item=item._uid))
+    world.update()
+
+    assert actor.get_component(Inventory).contents == []
+    assert item.get_component(RoomPresence).room == room._uid
+
+
+def test_can_not_take_nonexistant_item_event_exception(world, room):
+    world.add_system(PerceiveRoom(), 0)
+    world.add_system(TakeOrDropEvents(throw_exc=True), 1)
+    actor = world.create_entity(
+        RoomPresence(room=room._uid),
+        Inventory(),
+    )
+    world.send_event(TakeEvent(actor=actor._uid, item=UID()))
+    with pytest.raises(NoSuchUID):
+        world.update()
+
+
+@pytest.mark.parametrize('event_type', [TakeEvent, DropEvent])
+def test_event_of_destroyed_actor(world, room, item, event_type):
+    world.add_system(TakeOrDropEvents(), 0)
+    actor = world.create_entity(
+        RoomPresence(room=room._uid),
+        Inventory(),
+    )
+    world.send_event(event_type(actor=actor._uid, item=item._uid))
+    world.destroy_entity(actor)
+    world.update()
+
+
+@pytest.mark.parametrize('event_type', [TakeEvent, DropEvent])
+def test_event_of_destroyed_actor_exception(world, room, item, event_type):
+    world.add_system(TakeOrDropEvents(throw_exc=True), 0)
+    actor = world.create_entity(
+        RoomPresence(room=room._uid),
+        Inventory(),
+    )
+    world.send_event(event_type(actor=actor._uid, item=item._uid))
+    world.destroy_entity(actor)
+    with pytest.raises(NoSuchUID):
+        world.update()
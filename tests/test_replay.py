@@ -0,0 +1,187 @@
+import pytest
+
+from wecs.core import World, System, Component, and_filter
+from wecs.mechanics.clock import Clock, DetermineTimestep, SettableClock
+from wecs.replay import Recorder, Replayer, Desync
+
+
+@Component(track_changes=True)
+class Position:
+    x: float = 0.0
+
+
+@Component()
+class Spawner:
+    every: int = 3
+    count: int = 0
+
+
+class Move(System):
+    entity_filters = {
+        'moving': and_filter([Position]),
+        'clock': and_filter([Clock]),
+    }
+
+    def update(self, entities_by_filter):
+        dt = sum(e[Clock].game_time for e in entities_by_filter['clock'])
+        for entity in entities_by_filter['moving']:
+            entity[Position].x += dt
+
+
+class Spawn(System):
+    entity_filters = {'spawner': and_filter([Spawner])}
+
+    def update(self, entities_by_filter):
+        for entity in entities_by_filter['spawner']:
+            spawner = entity[Spawner]
+            spawner.count += 1
+            if spawner.count % spawner.every == 0:
+                self.world.create_entity(Position())
+
+
+# Like a clock of the engine, its state is not part of the world's.
+dts = [0.01]
+
+
+def engine_clock():
+    return dts[0]
+
+
+def make_world():
+    world = World()
+    world.add_system(DetermineTimestep(), 0)
+    world.add_system(Spawn(), 1)
+    world.add_system(Move(), 2)
+    return world
+
+
+def record(frames=10):
+    world = make_world()
+    world.create_entity(Clock(clock=engine_clock, max_timestep=1.0))
+    world.create_entity(Spawner())
+    world.update()
+    recorder = Recorder(world)
+    for frame in range(frames):
+        dts[0] = 0.01 * frame
+        if frame == 2:
+            world.create_entity(Position(x=100.0), name='external')
+        if frame == 5:
+            entities = [e for e in world.entities.values() if Position in e]
+            entities[-1][Position].x = -10.0
+        world.update()
+    return world, recorder.stop()
+
+
+def positions(world):
+    return sorted(
+        entity[Position].x
+        for entity in world.entities.values()
+        if Position in entity
+    )
+
+
+def test_replay():
+    recorded, data = record()
+    world = make_world()
+    assert Replayer(data).run(world) == 10
+    assert world.tick == recorded.tick
+    assert positions(world) == positions(recorded)
+    assert world.replay is None
+
+
+def test_clock_inputs_are_replayed():
+    recorded, data = record()
+    world = make_world()
+    Replayer(data).run(world)
+    (clock, ) = [e for e in world.entities.values() if Clock in e]
+    assert clock[Clock].wall_time == pytest.approx(0.09)
+
+
+def test_desync_of_state():
+    _, data = record()
+
+    class FastMove(Move):
+        def update(self, entities_by_filter):
+            super().update(entities_by_filter)
+            super().update(entities_by_filter)
+
+    world = make_world()
+    world.remove_system(Move)
+    world.add_system(FastMove(), 2)
+    with pytest.raises(Desync):
+        Replayer(data).run(world)
+    assert world.replay is None
+
+
+def test_desync_of_inputs():
+    _, data = record()
+    world = make_world()
+    world.remove_system(DetermineTimestep)
+    world.add_system(DetermineTimestep(), 0)
+
+    class ReadsInput(System):
+        entity_filters = {}
+
+        def update(self, entities_by_filter):
+            self.world.read_input('unrecorded', lambda: 0)
+
+    world.add_system(ReadsInput(), 3)
+    with pytest.raises(Desync):
+        Replayer(data).run(world)
+
+
+def test_without_verification():
+    _, data = record()
+
+    class SlowMove(Move):
+        def update(self, entities_by_filter):
+            pass
+
+    world = make_world()
+    world.remove_system(Move)
+    world.add_system(SlowMove(), 2)
+    assert Replayer(data).run(world, verify=False) == 10
+
+
+def test_checksum_interval():
+    world = make_world()
+    world.create_entity(Clock(clock=SettableClock(0.01)))
+    recorder = Recorder(world, checksum_interval=0)
+    world.update()
+    world.update()
+    data = recorder.stop()
+    assert recorder.frame_count == 2
+
+    replayed = make_world()
+    replayed.remove_system(Move)
+    assert Replayer(data).run(replayed) == 2
+
+
+def test_settable_clock_changed_during_recording():
+    world = make_world()
+    clock = SettableClock(0.01)
+    world.create_entity(Clock(clock=clock, max_timestep=1.0))
+    world.create_entity(Position())
+    recorder = Recorder(world)
+    for frame in range(4):
+        clock.set(0.01 * (frame + 1))
+        world.update()
+    data = recorder.stop()
+
+    replayed = make_world()
+    assert Replayer(data).run(replayed) == 4
+    assert positions(replayed) == positions(world)
+
+
+def test_one_recording_at_a_time():
+    world = World()
+    recorder = Recorder(world)
+    with pytest.raises(ValueError):
+        Recorder(world)
+    recorder.stop()
+    Recorder(world).stop()
+
+
+def test_read_input_without_recording():
+    world = World()
+    assert world.read_input('key', lambda a: a + 1, 1) == 2
@@ -7,6 +7,8 @@ from wecs.rooms import RoomPresence
 from wecs.rooms import ChangeRoomAction
 from wecs.rooms import PerceiveRoom
 from wecs.rooms import ChangeRoom
+from wecs.rooms import ChangeRoomEvent
+from wecs.rooms import ChangeRoomEvents
 from wecs.rooms import is_in_room
 from wecs.rooms import EntityNotInARoom
 from wecs.rooms import ItemNotInARoom
@@ -268,3 +270,43 @@ def test_can_change_to_current_room(world):
     assert len(room_cmpt.continued) == 1
     assert actor._uid in room_cmpt.continued
     assert len(room_cmpt.gone) == 0
+
+
+def test_change_room_event(world):
+    world.add_system(ChangeRoomEvents(), 0)
+    world.add_system(PerceiveRoom(), 1)
+    room = world.create_entity()
+    other_room = world.create_entity()
+    room.add_component(Room(adjacent=[other_room._uid]))
+    other_room.add_component(Room(adjacent=[room._uid]))
+    actor = world.create_entity(RoomPresence(room=room._uid))
+    world.update()
+    world.send_event(ChangeRoomEvent(actor=actor._uid, room=other_room._uid))
+    world.update()
+
+    assert actor.get_component(RoomPresence).room == other_room._uid
+    assert other_room.get_component(Room).arrived == [actor._uid]
+    assert room.get_component(Room).gone == [actor._uid]
+
+
+def test_change_room_event_to_non_adjacent_room_exception(world):
+    world.add_system(ChangeRoomEvents(throw_exc=True), 0)
+    room = world.create_entity(Room())
+    other_room = world.create_entity(Room())
+    actor = world.create_entity(RoomPresence(room=room._uid))
+    world._flush_component_updates()
+    world.send_event(ChangeRoomEvent(actor=actor._uid, room=other_room._uid))
+    with pytest.raises(RoomsNotAdjacent):
+        world.update()
+
+
+def test_entities_in_room(world):
+    room = world.create_entity(Room())
+    other_room = world.create_entity(Room())
+    actor = world.create_entity(RoomPresence(room=room._uid))
+    world._flush_component_updates()
+    assert world.get_referrers(room, RoomPresence) == {actor}
+
+    actor[RoomPresence].room = other_room._uid
+    assert world.get_referrers(room, RoomPresence) == set()
+    assert world.get_referrers(other_room, RoomPresence) == {actor}
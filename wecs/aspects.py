@@ -72,6 +72,77 @@ class Aspect:
             components.append(component)
         return components
 
+    def instantiate(self, count=None, overrides=None):
+        """
+        Batch form of calling the aspect: Creates the components for
+        `count` entities at once.
+
+        :param count: The number of component sets to create. May be
+            omitted if it can be inferred from `overrides`.
+        :param overrides: Per-entity overrides, either as columns, i.e.
+            ``{ComponentType: {'field': [value_0, value_1, ...]}}``, or
+            as an iterable of dicts in the same format as the overrides
+            taken by :func:`__call__`.
+        :return: A list of `count` lists of components.
+        """
+        columns = None
+        rows = None
+        if overrides is None:
+            if count is None:
+                raise ValueError("Neither count nor overrides given.")
+        elif isinstance(overrides, dict):
+            columns = overrides
+            lengths = {
+                len(values)
+                for fields in columns.values()
+                for values in fields.values()
+            }
+            if count is None:
+                if len(lengths) != 1:
+                    raise ValueError("Can't infer count from overrides.")
+                count = lengths.pop()
+            elif any(length != count for length in lengths):
+                raise ValueError("Override columns don't match count.")
+        else:
+            rows = list(overrides)
+            if count is None:
+                count = len(rows)
+            elif len(rows) != count:
+                raise ValueError("Number of overrides doesn't match count.")
+        if not all(key in self.components for key in (columns or {})):
+            raise ValueError("Not all override keys in aspect.")
+
+        component_sets = [[] for _ in range(count)]
+        for component_type, defaults in self.components.items():
+            # Arguments that are the same for all components can be
+            # passed without being copied for each of them.
+            static = {
+                argument: value for argument, value in defaults.items()
+                if not callable(value)
+            }
+            factories = {
+                argument: value for argument, value in defaults.items()
+                if callable(value)
+            }
+            type_columns = {}
+            if columns is not None:
+                type_columns = columns.get(component_type, {})
+            for idx, components in enumerate(component_sets):
+                if not factories and not type_columns and rows is None:
+                    components.append(component_type(**static))
+                    continue
+                arguments = dict(static)
+                arguments.update(factories)
+                for argument, values in type_columns.items():
+                    arguments[argument] = values[idx]
+                if rows is not None and component_type in rows[idx]:
+                    arguments.update(rows[idx][component_type])
+                for argument in arguments.keys():
+                    if callable(arguments[argument]):
+                        arguments[argument] = arguments[argument]()
+                components.append(component_type(**arguments))
+        return component_sets
+
     def __contains__(self, component_type):
         return component_type in self.components
 
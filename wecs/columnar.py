@@ -0,0 +1,320 @@
+"""
+Columnar storage for components declared with
+``@Component(storage='columnar')``.
+
+For each such component type, a world keeps one :class:`ColumnStore`.
+Fields annotated as ``float``, ``int`` or ``bool`` (or as a NumPy
+scalar type) are stored in packed NumPy arrays, one row per entity.
+Other fields are kept in plain lists alongside them. The entity itself
+holds a :class:`ColumnView` that reads and writes its row, so that
+``entity[MyComponent].my_field`` keeps working as usual.
+
+Systems can operate on whole columns at once:
+
+.. code-block:: python
+
+   @Component(storage='columnar')
+   class Position:
+       x: float = 0.0
+       v: float = 0.0
+
+
+   class Move(System):
+       entity_filters = {
+           'moving': and_filter([Position]),
+       }
+
+       def update(self, entities_by_filter):
+           columns = self.get_columns('moving', Position)
+           columns['x'] += columns['v'] * dt
+
+Arrays handed out by a store are only valid until the next flush, as
+adding or removing components may move rows or reallocate columns.
+"""
+
+import dataclasses
+
+import numpy
+
+
+numeric_dtypes = {
+    float: numpy.float64,
+    'float': numpy.float64,
+    int: numpy.int64,
+    'int': numpy.int64,
+    bool: numpy.bool_,
+    'bool': numpy.bool_,
+}
+
+
+def get_dtype(field_type):
+    """
+    :param field_type: The annotation of a dataclass field
+    :return: The NumPy dtype to store the field in, or None if it is
+        not a numeric field.
+    """
+    if isinstance(field_type, type) and issubclass(field_type, numpy.generic):
+        return field_type
+    try:
+        return numeric_dtypes.get(field_type)
+    except TypeError:  # Unhashable annotation
+        return None
+
+
+class ColumnView:
+    """
+    Stands in for a component instance of a columnar component type.
+    Attribute access is forwarded to the view's row in its
+    :class:`ColumnStore`. Subclasses with a property per field are
+    generated by :func:`make_view_type`.
+
+    When the component is removed from its entity, the view is
+    detached: It copies its values out of the store, and keeps
+    working on those copies.
+    """
+    __slots__ = ('_store', '_row', '_detached')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+        self._detached = None
+
+    def _detach(self):
+        self._detached = {
+            field_name: getattr(self, field_name)
+            for field_name in self._store.field_names
+        }
+        self._store = None
+        self._row = None
+
+    def __repr__(self):
+        values = ", ".join(
+            "{}={!r}".format(field_name, getattr(self, field_name))
+            for field_name in self._field_names
+        )
+        return "{}({})".format(self._component_type.__name__, values)
+
+
+def _make_numeric_property(field_name):
+    def getter(view):
+        store = view._store
+        if store is None:
+            return view._detached[field_name]
+        return store.columns[field_name].item(view._row)
+
+    def setter(view, value):
+        store = view._store
+        if store is None:
+            view._detached[field_name] = value
+        else:
+            store.columns[field_name][view._row] = value
+
+    return property(getter, setter)
+
+
+def _make_object_property(field_name):
+    def getter(view):
+        store = view._store
+        if store is None:
+            return view._detached[field_name]
+        return store.objects[field_name][view._row]
+
+    def setter(view, value):
+        store = view._store
+        if store is None:
+            view._detached[field_name] = value
+        else:
+            store.objects[field_name][view._row] = value
+
+    return property(getter, setter)
+
+
+def make_view_type(component_type):
+    """
+    :param component_type: A columnar :class:`wecs.core.Component` type
+    :return: A subclass of :class:`ColumnView` with a property for each
+        of the component's fields.
+    """
+    namespace = {
+        '__slots__': (),
+        '_component_type': component_type,
+        '_field_names': tuple(f.name for f in dataclasses.fields(component_type)),
+    }
+    for field in dataclasses.fields(component_type):
+        if get_dtype(field.type) is not None:
+            namespace[field.name] = _make_numeric_property(field.name)
+        else:
+            namespace[field.name] = _make_object_property(field.name)
+    return type(component_type.__name__ + 'View', (ColumnView, ), namespace)
+
+
+class ColumnSelection:
+    """
+    The rows of a :class:`ColumnStore` that belong to a set of
+    entities, as returned by :func:`ColumnStore.select`. Indexing it by
+    field name returns a copy of the values of those rows, assigning
+    to it writes them back, so ``selection['x'] += dt`` updates the
+    store. Modifying the returned array in place does not, whether the
+    selection covers the whole store or only some of its rows.
+
+    :ivar entities: The selected entities, in the order of the rows
+    """
+
+    def __init__(self, store, rows, entities):
+        self.store = store
+        self.rows = rows
+        self.entities = entities
+
+    def __getitem__(self, field_name):
+        values = self.store._get_column(field_name)[self.rows]
+        if isinstance(self.rows, slice):
+            # Slicing returns a view, unlike indexing by an array of rows.
+            values = values.copy()
+        return values
+
+    def __setitem__(self, field_name, values):
+        self.store._get_column(field_name)[self.rows] = values
+
+    def __len__(self):
+        return len(self.entities)
+
+
+class ColumnStore:
+    """
+    Packed storage of all instances of one columnar component type in
+    a :class:`wecs.core.World`. Rows are kept dense; When a row is
+    removed, the last row is moved into its place.
+    """
+
+    def __init__(self, component_type, capacity=64):
+        self.component_type = component_type
+        self.view_type = make_view_type(component_type)
+        self.field_names = []
+        self.columns = {}  # {field name: numpy.ndarray}
+        self.objects = {}  # {field name: list}
+        for field in dataclasses.fields(component_type):
+            self.field_names.append(field.name)
+            dtype = get_dtype(field.type)
+            if dtype is not None:
+                self.columns[field.name] = numpy.zeros(capacity, dtype=dtype)
+            else:
+                self.objects[field.name] = [None] * capacity
+        self.capacity = capacity
+        self.size = 0
+        self.entities = []  # Entity by row
+        self.views = []  # ColumnView by row
+        self.rows = {}  # {Entity: row}
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for field_name, column in self.columns.items():
+            new_column = numpy.zeros(capacity, dtype=column.dtype)
+            new_column[:self.size] = column[:self.size]
+            self.columns[field_name] = new_column
+        for values in self.objects.values():
+            values.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def _get_column(self, field_name):
+        try:
+            return self.columns[field_name]
+        except KeyError:
+            raise KeyError(f"{field_name} is not a numeric field.")
+
+    def insert(self, entity, component):
+        """
+        Copies the component's values into a new row.
+
+        :param entity: The :class:`wecs.core.Entity` the row belongs to
+        :param component: An instance of the component type (or a view
+            on another row)
+        :return: A :class:`ColumnView` on the new row
+        """
+        if self.size == self.capacity:
+            self._grow()
+        row = self.size
+        for field_name, column in self.columns.items():
+            column[row] = getattr(component, field_name)
+        for field_name, values in self.objects.items():
+            values[row] = getattr(component, field_name)
+        view = self.view_type(self, row)
+        self.entities.append(entity)
+        self.views.append(view)
+        self.rows[entity] = row
+        self.size += 1
+        return view
+
+    def remove(self, entity):
+        """
+        Removes the entity's row, detaching its view.
+
+        :param entity: The :class:`wecs.core.Entity` to remove
+        """
+        row = self.rows.pop(entity)
+        self.views[row]._detach()
+        last = self.size - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            for values in self.objects.values():
+                values[row] = values[last]
+            moved_entity = self.entities[last]
+            moved_view = self.views[last]
+            self.entities[row] = moved_entity
+            self.views[row] = moved_view
+            moved_view._row = row
+            self.rows[moved_entity] = row
+        for values in self.objects.values():
+            values[last] = None
+        self.entities.pop()
+        self.views.pop()
+        self.size = last
+
+    def copy(self, entities):
+        """
+        :param entities: ``{Entity: Entity}``, mapping the entities of
+            this store to those of the copy
+        :return: A :class:`ColumnStore` with copies of this one's rows
+        """
+        store = ColumnStore.__new__(ColumnStore)
+        store.component_type = self.component_type
+        store.view_type = self.view_type
+        store.field_names = self.field_names
+        store.columns = {
+            field_name: column.copy()
+            for field_name, column in self.columns.items()
+        }
+        store.objects = {
+            field_name: list(values)
+            for field_name, values in self.objects.items()
+        }
+        store.capacity = self.capacity
+        store.size = self.size
+        store.entities = [entities[entity] for entity in self.entities]
+        store.views = [store.view_type(store, row) for row in range(self.size)]
+        store.rows = {entity: row for row, entity in enumerate(store.entities)}
+        return store
+
+    def column(self, field_name):
+        """
+        :param field_name: Name of a numeric field
+        :return: The live array of the field's values, in row order
+        """
+        return self._get_column(field_name)[:self.size]
+
+    def select(self, entities):
+        """
+        :param entities: An iterable of entities with rows in this store
+        :return: A :class:`ColumnSelection`
+        """
+        entities = list(entities)
+        rows = numpy.fromiter(
+            (self.rows[entity] for entity in entities),
+            dtype=numpy.intp,
+            count=len(entities),
+        )
+        if len(entities) == self.size:
+            # All rows are selected, so they can be read and written
+            # back by slicing.
+            return ColumnSelection(self, slice(0, self.size), self.entities)
+        return ColumnSelection(self, rows, entities)
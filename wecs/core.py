@@ -1,11 +1,19 @@
+import sys
 import dataclasses
+import numbers
+import types
+from collections import deque
+from itertools import repeat
+from operator import attrgetter
+from operator import itemgetter
+from operator import setitem
 
 
 # FIXME: We rely on the hash of these objects to be unique, which is...
 # iffy. If isn't *really* a problem that a UID gets destroyed and a new one is
 # created in its place so that a dangling reference is created, because
 # thanks to that dangling reference, the now invalid UID is still referenced.
-# Still, this smells.
+# Still, this smells. Handles (see below) do not have this problem.
 import logging
 
 
@@ -13,6 +21,7 @@ class UID:
     """
     Object for referencing a :class:`wecs.core.Entity`.
     """
+    __slots__ = ('name', )
 
     def __init__(self, name=None):
         if name is None:
@@ -27,6 +36,115 @@ class NoSuchUID(Exception):
     """
 
 
+# Handles are an alternative to UIDs: Plain ints that pack the index of
+# the entity's slot in its world with the slot's generation. When an
+# entity is destroyed, its slot's generation is increased, so stale
+# handles are detected when they are resolved. Being ints, they can be
+# stored in NumPy arrays and serialized as they are.
+HANDLE_INDEX_BITS = 32
+HANDLE_INDEX_MASK = (1 << HANDLE_INDEX_BITS) - 1
+
+
+def make_handle(index, generation):
+    """
+    :param index: Index of an entity slot in a world
+    :param generation: Generation of that slot
+    :return: The handle as an int
+    """
+    return (generation << HANDLE_INDEX_BITS) | index
+
+
+def get_handle_index(handle):
+    return handle & HANDLE_INDEX_MASK
+
+
+def get_handle_generation(handle):
+    return handle >> HANDLE_INDEX_BITS
+
+
+_component_type_ids = {}  # {type: int}
+_columnar_type_mask = 0  # Bits of component types with columnar storage
+_owned_type_mask = 0  # Bits of component types that know their entity
+_reference_type_mask = 0  # Bits of component types with reference fields
+_reference_fields = {}  # {component type: {field name: many}}
+
+
+def get_component_type_id(component_type):
+    """
+    Returns the dense integer ID of a component type. IDs are assigned
+    in order of first use, usually when a class is decorated with
+    :class:`wecs.core.Component`.
+
+    :param component_type: A :class:`wecs.core.Component` type
+    :return: int
+    """
+    try:
+        return _component_type_ids[component_type]
+    except KeyError:
+        type_id = len(_component_type_ids)
+        _component_type_ids[component_type] = type_id
+        return type_id
+
+
+def get_component_type_mask(component_types):
+    """
+    :param component_types: An iterable of :class:`wecs.core.Component`
+        types
+    :return: An int with the bit of each type's ID set
+    """
+    mask = 0
+    for component_type in component_types:
+        mask |= 1 << get_component_type_id(component_type)
+    return mask
+
+
+class Archetype:
+    """
+    The table of all entities in a :class:`wecs.core.World` that share
+    the same set of component types. Since filters only test for the
+    presence of component types, whether an archetype's entities match
+    a system's filters needs to be determined only once per archetype,
+    instead of once per entity.
+
+    Archetypes are created by the world as needed when it is running in
+    archetype mode; See :class:`wecs.core.World`.
+    """
+
+    def __init__(self, component_types):
+        self.component_types = frozenset(component_types)
+        self.mask = get_component_type_mask(self.component_types)
+        self.entities = set()
+        self._matching_filters = {}  # {System: frozenset of filter names}
+
+    def get_matching_filters(self, system):
+        """
+        :param system: A :class:`wecs.core.System`
+        :return: A frozenset of the names of the system's filters that
+            the archetype's entities match.
+        """
+        try:
+            return self._matching_filters[system]
+        except KeyError:
+            matches = frozenset(
+                filter_name
+                for filter_func, filter_name in system.filters.items()
+                if filter_func._match_mask(self.mask)
+            )
+            self._matching_filters[system] = matches
+            return matches
+
+    def _forget_system(self, system):
+        self._matching_filters.pop(system, None)
+
+    def __repr__(self):
+        return "<Archetype {}>".format(
+            sorted(t.__name__ for t in self.component_types),
+        )
+
+
+flush_policies = ('system', 'sync', 'frame')
+
+
 class World:
     """
     The World object is the root object of ECS.
@@ -38,13 +156,85 @@ class World:
 
     `update` and `add_system` will cause deferred component
     updates to entities to be flushed.
+
+    :param archetypes: If True, entities are grouped into
+        :class:`wecs.core.Archetype` tables by their set of component
+        types, and filters are evaluated once per archetype instead of
+        once per entity. This pays off when there are many entities
+        sharing few component layouts.
+    :param scheduler: An optional scheduler that `update` delegates
+        running the systems to, e.g.
+        :class:`wecs.scheduler.ParallelScheduler`
+    :param flush_policy: When deferred component updates are flushed
+        during `update`. ``'system'`` (default) flushes before each
+        system. ``'sync'`` flushes at the start of the frame, and
+        before systems that are declared as sync points (see
+        :class:`wecs.core.System`). ``'frame'`` only flushes at the
+        start of the frame, so systems see the structural changes made
+        by earlier systems only in the next frame.
+    :ivar resources: ``{type: instance}`` of world-level singletons,
+        e.g. ``world.resources[PhysicsWorld]``; See
+        :func:`add_resource`.
+    :ivar tick: The number of frames started so far; See
+        :func:`start_frame`.
+    :ivar flush_count: The number of flushes so far
+    :ivar pools: The world's :class:`wecs.pooling.Pools`, or None; See
+        :func:`enable_pooling`.
+    :ivar replay: The :class:`wecs.replay.Recorder` or
+        :class:`wecs.replay.Replayer` attached to the world, or None
+    :ivar effective_flush_count: The number of flushes that actually
+        had component updates to process
     """
 
-    def __init__(self):
+    def __init__(self, archetypes=False, scheduler=None,
+                 flush_policy='system'):
+        if flush_policy not in flush_policies:
+            raise ValueError(f"Unknown flush policy {flush_policy}")
+        self.scheduler = scheduler
+        self.flush_policy = flush_policy
+        self.tick = 0
+        self.flush_count = 0
+        self.effective_flush_count = 0
+        self.profiler = None
+        self.replay = None
+        self.pools = None
+        self.resources = {}  # {type: resource}
         self.entities = {}  # {UID: Entity}
         self.systems = {}  # {sort: System}
         self._addition_pool = set()  # Entities
         self._removal_pool = set()  # Entities
+        # Entity slots for handles
+        self._slots = []  # Entity (or None if free) by index
+        self._generations = []  # int by index
+        self._free_slots = []  # indices
+        # {component type: {System: frozenset of filter names}}
+        self._filter_index = {}
+        self._column_stores = {}  # {component type: ColumnStore}
+        # Change detection; See changed_filter
+        self._change_seq = 0
+        self._change_logs = {}  # {(kind, component type): {Entity: seq}}
+        self._change_watchers = {}  # {(kind, component type): [System]}
+        # Bits of the component types whose field changes are recorded
+        # by a changed_filter or a delta log; See _mark_changed
+        self._watched_type_mask = 0
+        # Events; See send_event
+        self._event_queues = {}  # {event type: [event]}, being sent
+        self._events = {}  # {event type: [event]}, being delivered
+        self._event_subscribers = {}  # {event type: [System]}
+        self._queries = {}  # {filter key: Query}
+        # Reverse index of reference fields; See reference()
+        # {target UID or handle: {(Entity, component type, field name)}}
+        self._referrers = {}
+        # {(Entity, component type, field name): tuple of targets}
+        self._references = {}
+        # See enable_deltas
+        self._delta_log = None
+        self._delta_logs = []  # All logs that record changes
+        self._replica_entities = None  # {source handle: Entity}
+        if archetypes:
+            self.archetypes = {}  # {component type mask: Archetype}
+        else:
+            self.archetypes = None
 
     # Entity CRUD
 
@@ -56,19 +246,93 @@ class World:
         :param name: An optional name for debug purposes
         :return: :class:`wecs.core.Entity`
         """
-        entity = Entity(self, name=name)
+        entity = self._new_entity(name)
         self.entities[entity._uid] = entity
+        entity.handle = self._allocate_handle(entity)
+        if self.archetypes is not None:
+            entity._move_to_archetype(self._get_archetype(()))
+        for log in self._delta_logs:
+            log.entity_created(entity, self.tick)
         for component in components:
             entity.add_component(component)
         return entity
 
+    def create_entities(self, template, count=None, overrides=None,
+                        names=None):
+        """
+        Creates many entities with the same component types at once.
+        Since they will all undergo the same change during the next
+        flush, systems will test their filters only once for the whole
+        batch.
+
+        :param template: A :class:`wecs.aspects.Aspect`, or an iterable
+            of :class:`wecs.core.Component` types
+        :param count: The number of entities to create; May be omitted
+            if it can be inferred from `overrides`.
+        :param overrides: Per-entity overrides; See
+            :func:`wecs.aspects.Aspect.instantiate`.
+        :param names: An optional iterable of names for debug purposes
+        :return: A list of :class:`wecs.core.Entity`
+        """
+        from wecs.aspects import Aspect
+        if not isinstance(template, Aspect):
+            template = Aspect(list(template))
+        component_sets = template.instantiate(count=count, overrides=overrides)
+        if names is None:
+            names = [None] * len(component_sets)
+        else:
+            names = list(names)
+            if len(names) != len(component_sets):
+                raise ValueError("Number of names doesn't match count.")
+        if self.pools is None:
+            entities = list(map(Entity, repeat(self), names))
+        else:
+            entities = [self._new_entity(name) for name in names]
+        handles = self._allocate_handles(entities)
+        archetype = None
+        if self.archetypes is not None:
+            archetype = self._get_archetype(())
+        for entity, handle, components in zip(entities, handles, component_sets):
+            self.entities[entity._uid] = entity
+            entity.handle = handle
+            if archetype is not None:
+                entity._move_to_archetype(archetype)
+            for log in self._delta_logs:
+                log.entity_created(entity, self.tick)
+            if components:
+                # A fresh entity, and an aspect's component types are
+                # unique, so we can skip the checks of `add_component`.
+                entity._added_components = {
+                    getattr(component, '_component_type', type(component)): component
+                    for component in components
+                }
+        if template.components:
+            self._addition_pool.update(entities)
+        return entities
+
+    def _new_entity(self, name):
+        if self.pools is not None:
+            entity = self.pools.entities.take()
+            if entity is not None:
+                entity._recycle(name)
+                return entity
+        return Entity(self, name=name)
+
     def get_entity(self, uid):
         """
-        Returns an entity by uid.
+        Returns an entity by uid or handle.
 
-        :param uid: :class:`wecs.core.UID` of entity to return
+        :param uid: :class:`wecs.core.UID` or handle of entity to return
         :return: :class:`wecs.core.Entity`
         """
+        if isinstance(uid, numbers.Integral):
+            # Handles may also come from NumPy arrays.
+            uid = int(uid)
+            index = uid & HANDLE_INDEX_MASK
+            if index < len(self._slots):
+                if self._generations[index] == uid >> HANDLE_INDEX_BITS:
+                    return self._slots[index]
+            raise NoSuchUID(f"entity with handle:{uid} was not found")
         try:
             entity = self.entities[uid]
         except KeyError:
@@ -84,28 +348,384 @@ class World:
         """
         return self.entities.values()
 
+    def add_resource(self, resource):
+        """
+        Add a world-level singleton, replacing the resource of the same
+        type, if any. Unlike components on an entity, resources are not
+        matched against any filters, so accessing them is a plain dict
+        lookup. Systems declare the resources they use in their
+        `resources`; See :class:`wecs.core.System`.
+
+        :param resource: Any object, typically a
+            :class:`wecs.core.Component` instance. It is stored under
+            its type.
+        """
+        self.resources[type(resource)] = resource
+
+    def remove_resource(self, resource_type):
+        """
+        :param resource_type: The type of the resource to remove
+        :return: The removed resource
+        """
+        return self.resources.pop(resource_type)
+
+    def snapshot(self):
+        """
+        Serializes the world's entities, their components, and the
+        world's resources into a compact binary format. Pending
+        component updates are flushed first. Systems are not part of
+        the snapshot. See :mod:`wecs.snapshot` for which values can be
+        stored.
+
+        :return: bytes
+        """
+        from wecs.snapshot import snapshot
+        return snapshot(self)
+
+    def restore(self, data):
+        """
+        Replaces the world's entities and resources with those of a
+        snapshot. The current entities are destroyed, and the restored
+        ones are flushed into the systems. References to entities are
+        remapped to the new entities.
+
+        :param data: bytes as returned by :func:`snapshot`
+        :return: A list of the restored :class:`wecs.core.Entity`, in
+            the order of the snapshot.
+        """
+        from wecs.snapshot import restore
+        return restore(self, data)
+
+    def enable_deltas(self):
+        """
+        Start recording changes, so that :func:`diff` can encode them.
+        Changes to field values are only recorded for components with
+        ``track_changes=True``, and those marked with
+        :func:`wecs.core.Entity.mark_changed`.
+
+        :return: The :class:`wecs.snapshot.DeltaLog`; Call its
+            `forget(tick)` to drop records that are no longer needed.
+        """
+        from wecs.snapshot import DeltaLog
+        if self._delta_log is not None:
+            self._remove_delta_log(self._delta_log)
+        self._delta_log = DeltaLog(self.tick)
+        self._add_delta_log(self._delta_log)
+        return self._delta_log
+
+    def _add_delta_log(self, log):
+        self._delta_logs.append(log)
+        self._update_watched_types()
+
+    def _remove_delta_log(self, log):
+        self._delta_logs.remove(log)
+        self._update_watched_types()
+
+    def diff(self, since=None):
+        """
+        Encodes the changes made since the start of tick `since`:
+        Created and destroyed entities, added (with their values) and
+        removed components, and changed field values. Pending component
+        updates are flushed first. Applying a delta twice does no harm,
+        so the usual pattern is::
+
+            delta = world.diff(since=last_tick)
+            last_tick = world.tick
+
+        :param since: A tick; Default: Since :func:`enable_deltas`.
+        :return: bytes
+        """
+        from wecs.snapshot import diff
+        return diff(self, since)
+
+    def apply_delta(self, data):
+        """
+        Applies a delta made by :func:`diff` to this world, which
+        should be a replica of the delta's source, e.g. restored from a
+        snapshot of it.
+
+        :param data: bytes as returned by :func:`diff`
+        :return: The source's tick at the time of the delta
+        """
+        from wecs.snapshot import apply_delta
+        return apply_delta(self, data)
+
+    def fork(self):
+        """
+        Returns a copy-on-write clone of the world, e.g. to simulate a
+        few ticks ahead and throw the result away. The fork starts out
+        sharing the component instances with this world. A component is
+        copied the first time it is accessed through an entity of the
+        fork (``entity[Type]``, :func:`wecs.core.Entity.get_component`,
+        ...), so that only the components that the fork's systems touch
+        are copied. Copies are shallow, except for lists, dicts and
+        sets in their fields, which are copied as well. Columnar
+        components are copied up front, array by array.
+
+        Entities keep their UIDs and handles, so references between
+        them stay valid. The fork has the same tick and flush policy,
+        and has no systems; Add the systems to run to it. Pending
+        component updates are flushed first.
+
+        Resources that are dataclasses are copied up front in the same
+        way as components. Other resources, like engine objects such as
+        a physics world, can't be copied, and are shared with this
+        world, so changes that the fork makes to them are seen by it.
+
+        While a fork is in use, this world must not be changed, since
+        the fork would see the changes to shared components.
+
+        :return: The :class:`wecs.core.World` fork
+        """
+        self._flush_component_updates()
+        fork = World(
+            archetypes=self.archetypes is not None,
+            flush_policy=self.flush_policy,
+        )
+        fork.tick = self.tick
+        fork.resources = {
+            resource_type: (
+                _copy_component(resource, None)
+                if dataclasses.is_dataclass(resource_type) else resource
+            )
+            for resource_type, resource in self.resources.items()
+        }
+        fork._generations = list(self._generations)
+        fork._free_slots = list(self._free_slots)
+        fork._slots = [None] * len(self._slots)
+        forked = {}  # {Entity: _ForkedEntity}
+        for entity in self.entities.values():
+            copy = _ForkedEntity(fork, entity)
+            fork.entities[copy._uid] = copy
+            fork._slots[copy.handle & HANDLE_INDEX_MASK] = copy
+            forked[entity] = copy
+            if fork.archetypes is not None:
+                archetype = fork._get_archetype(entity.components, entity._mask)
+                copy._move_to_archetype(archetype)
+        for component_type, store in self._column_stores.items():
+            store = store.copy(forked)
+            fork._column_stores[component_type] = store
+            for entity, view in zip(store.entities, store.views):
+                entity.components[component_type] = view
+                entity._shared.discard(component_type)
+        for key, targets in self._references.items():
+            entity, component_type, field_name = key
+            key = (forked[entity], component_type, field_name)
+            fork._references[key] = targets
+            for target in targets:
+                fork._referrers.setdefault(target, set()).add(key)
+        return fork
+
+    def query(self, filter_func):
+        """
+        Returns a live set of the entities that match a filter. It is
+        kept up to date by the same flushes that update systems'
+        filters. Queries for equivalent filters share one set, which is
+        freed when every caller has released it::
+
+            with world.query(and_filter([Inventory])) as holders:
+                for entity in holders:
+                    ...
+
+        :param filter_func: A filter, or a list of component types (as
+            in `System.entity_filters`). It must not contain proxies or
+            change filters.
+        :return: A :class:`wecs.core.Query`; Call its `release()` when
+            done with it.
+        """
+        if not isinstance(filter_func, Filter):
+            filter_func = and_filter(filter_func)
+        if filter_func._get_change_keys():
+            raise ValueError("Queries can't contain change filters.")
+        key = filter_func._get_key()
+        query = self._queries.get(key)
+        if query is None:
+            query = Query(filter_func)
+            query.world = self
+            query._key = key
+            self._index_filters(query)
+            self._flush_component_updates()
+            self._propose_all_entities(query)
+            self._queries[key] = query
+        query._refcount += 1
+        return query
+
+    def _release_query(self, query):
+        query._refcount -= 1
+        if query._refcount > 0:
+            return
+        del self._queries[query._key]
+        self._unindex_filters(query)
+        for archetype in self.get_archetypes():
+            archetype._forget_system(query)
+        query.entities['query'].clear()
+
     def destroy_entity(self, uid_or_entity):
         """
         Destroys the entity, removing its components, implicitly
         removing it from all systems during the next flush.
 
-        :param uid_or_entity: A :class:`wecs.core.Entity` or :class:`wecs.core.UID`
+        :param uid_or_entity: A :class:`wecs.core.Entity`, :class:`wecs.core.UID`
+            or handle
         """
-        if isinstance(uid_or_entity, Entity):
-            entity = uid_or_entity
-        elif isinstance(uid_or_entity, UID):
-            entity = entity_by_uid[uid_or_entity]
-        else:
-            raise ValueError("Entity or UID must be given")
+        entity = self._resolve_entity(uid_or_entity)
+        for log in self._delta_logs:
+            log.entity_destroyed(entity, self.tick)
+        self._clear_references_to(entity)
         # Remove all components. This sets it up to be removed from
         # all systems during the next flush.
         entity._destroy()
         # ...and forget it in this world.
         del self.entities[entity._uid]
+        self._free_handle(entity.handle)
+        entity._leave_archetype()
+        # Deltas and replays refer to entities across frames.
+        if self.pools is not None and not self._delta_logs:
+            self.pools._entity_destroyed(entity)
 
     def __delitem__(self, uid_or_entity):
         self.destroy_entity(uid_or_entity)
 
+    def destroy_entities(self, uids_or_entities):
+        """
+        Destroys many entities at once. Entities with the same set of
+        component types are removed from the systems' filters as one
+        batch during the next flush.
+
+        :param uids_or_entities: An iterable of :class:`wecs.core.Entity`,
+            :class:`wecs.core.UID` or handles
+        """
+        for uid_or_entity in uids_or_entities:
+            self.destroy_entity(uid_or_entity)
+
+    def remove_component_from_all(self, component_type, filter=None):
+        """
+        Removes a component type from all entities that have it, or
+        only from those that also match a filter. The removals are
+        deferred until the next flush, where they are processed as
+        batches.
+
+        :param component_type: The type of :class:`wecs.core.Component`
+            to remove.
+        :param filter: An optional :class:`wecs.core.Filter`
+        :return: A list of the entities that the type is being removed
+            from.
+        """
+        type_bit = 1 << get_component_type_id(component_type)
+        if self.archetypes is not None:
+            # Filters can be tested once per archetype.
+            candidates = [
+                entity
+                for archetype in self.archetypes.values()
+                if archetype.mask & type_bit
+                if filter is None or filter._match_mask(archetype.mask)
+                for entity in archetype.entities
+            ]
+        else:
+            candidates = [
+                entity
+                for entity in self.entities.values()
+                if entity._mask & type_bit
+                if filter is None or filter._match_mask(entity._mask)
+            ]
+        entities = []
+        for entity in candidates:
+            if component_type not in entity._dropped_components:
+                entity.remove_component(component_type)
+                entities.append(entity)
+        return entities
+
+    def _resolve_entity(self, uid_or_entity):
+        if isinstance(uid_or_entity, Entity):
+            return uid_or_entity
+        elif isinstance(uid_or_entity, (UID, numbers.Integral)):
+            return self.get_entity(uid_or_entity)
+        else:
+            raise ValueError("Entity, UID or handle must be given")
+
+    # Handles
+
+    def _allocate_handle(self, entity):
+        if self._free_slots:
+            index = self._free_slots.pop()
+            self._slots[index] = entity
+        else:
+            index = len(self._slots)
+            self._slots.append(entity)
+            self._generations.append(0)
+        return make_handle(index, self._generations[index])
+
+    def _allocate_handles(self, entities):
+        """
+        Batch form of :func:`_allocate_handle`. Once the free slots are
+        used up, the slots of the remaining entities are appended at
+        once.
+
+        :return: A list of the handles of the entities
+        """
+        reused = min(len(self._free_slots), len(entities))
+        handles = [self._allocate_handle(entity) for entity in entities[:reused]]
+        start = len(self._slots)
+        self._slots.extend(entities[reused:])
+        self._generations.extend([0] * (len(entities) - reused))
+        # New slots are of generation 0, so their handles are their indices.
+        handles.extend(range(start, len(self._slots)))
+        return handles
+
+    def _free_handle(self, handle):
+        index = handle & HANDLE_INDEX_MASK
+        self._slots[index] = None
+        self._generations[index] += 1
+        self._free_slots.append(index)
+
+    def is_alive(self, handle):
+        """
+        :param handle: A handle of an entity in this world
+        :return: Whether the handle still refers to an entity.
+        """
+        handle = int(handle)
+        index = handle & HANDLE_INDEX_MASK
+        if index >= len(self._slots):
+            return False
+        return self._generations[index] == handle >> HANDLE_INDEX_BITS
+
+    # Archetypes
+
+    def _get_archetype(self, component_types, mask=None):
+        if mask is None:
+            mask = get_component_type_mask(component_types)
+        try:
+            return self.archetypes[mask]
+        except KeyError:
+            archetype = Archetype(component_types)
+            self.archetypes[mask] = archetype
+            return archetype
+
+    def get_archetypes(self):
+        """
+        :return: An iterable of all :class:`wecs.core.Archetype` in the
+            world, or an empty tuple if it is not in archetype mode.
+        """
+        if self.archetypes is None:
+            return ()
+        return self.archetypes.values()
+
+    # Columnar storage
+
+    def get_column_store(self, component_type):
+        """
+        :param component_type: A :class:`wecs.core.Component` type
+            declared with ``storage='columnar'``
+        :return: The world's :class:`wecs.columnar.ColumnStore` for it
+        """
+        try:
+            return self._column_stores[component_type]
+        except KeyError:
+            from wecs.columnar import ColumnStore
+            store = ColumnStore(component_type)
+            self._column_stores[component_type] = store
+            return store
+
     # System CRUD
 
     def add_system(self, system, sort, add_duplicates=False):
@@ -130,10 +750,12 @@ class World:
         self.systems[sort] = system
         system._sort = sort
         system.world = self
+        self._index_filters(system)
+        self._watch_changes(system)
+        self._subscribe_events(system)
 
         self._flush_component_updates()
-        for entity in self.entities.values():
-            system._propose_addition(entity)
+        self._propose_all_entities(system)
 
     def has_system(self, system_type):
         """
@@ -174,6 +796,307 @@ class World:
         system = self.get_system(system_type)
         system._destroy()
         del self.systems[system._sort]
+        self._unindex_filters(system)
+        self._unwatch_changes(system)
+        self._unsubscribe_events(system)
+        for archetype in self.get_archetypes():
+            archetype._forget_system(system)
+
+    # Index of which filters depend on which component types
+
+    def _index_filters(self, system):
+        for filter_name, filter_func in system.entity_filters.items():
+            for component_type in filter_func._get_component_dependencies():
+                by_system = self._filter_index.setdefault(component_type, {})
+                filter_names = by_system.get(system, frozenset())
+                by_system[system] = filter_names | {filter_name}
+
+    def _unindex_filters(self, system):
+        for component_type in list(self._filter_index):
+            by_system = self._filter_index[component_type]
+            by_system.pop(system, None)
+            if not by_system:
+                del self._filter_index[component_type]
+
+    def _get_affected_filters(self, component_types):
+        """
+        Since filters only test for the presence of component types, an
+        entity gaining or losing a type can only change its membership
+        in filters that depend on that type.
+
+        :param component_types: The types gained or lost by an entity
+        :return: A dict mapping each affected :class:`wecs.core.System`
+            to a frozenset of the names of its affected filters.
+        """
+        affected = {}
+        for component_type in component_types:
+            by_system = self._filter_index.get(component_type)
+            if by_system is None:
+                continue
+            for system, filter_names in by_system.items():
+                if system in affected:
+                    affected[system] = affected[system] | filter_names
+                else:
+                    affected[system] = filter_names
+        return affected
+
+    # Events
+
+    def _subscribe_events(self, system):
+        for event_type in system.subscriptions:
+            self._event_queues.setdefault(event_type, [])
+            subscribers = self._event_subscribers.setdefault(event_type, [])
+            if system not in subscribers:
+                subscribers.append(system)
+
+    def _unsubscribe_events(self, system):
+        for event_type in system.subscriptions:
+            subscribers = self._event_subscribers.get(event_type, [])
+            if system in subscribers:
+                subscribers.remove(system)
+            if not subscribers:
+                self._event_subscribers.pop(event_type, None)
+                self._event_queues.pop(event_type, None)
+                self._events.pop(event_type, None)
+
+    def send_event(self, event):
+        """
+        Send an event to the systems that subscribe to its type. It is
+        delivered with the next :func:`dispatch_events`, so systems see
+        events sent during the previous frame, regardless of the order
+        in which systems run. Events of types that no system subscribes
+        to are discarded.
+
+        :param event: An instance of a :class:`wecs.core.Event` type
+        """
+        queue = self._event_queues.get(type(event))
+        if queue is not None:
+            queue.append(event)
+
+    def send_events(self, events):
+        """
+        Send several events; See :func:`send_event`.
+
+        :param events: An iterable of events
+        """
+        queues = self._event_queues
+        for event in events:
+            queue = queues.get(type(event))
+            if queue is not None:
+                queue.append(event)
+
+    def dispatch_events(self):
+        """
+        Deliver the events sent since the last dispatch, replacing the
+        ones delivered so far. This is part of :func:`start_frame`.
+        """
+        queues = self._event_queues
+        self._events = queues
+        self._event_queues = {event_type: [] for event_type in queues}
+
+    def get_events(self, event_type):
+        """
+        :param event_type: A :class:`wecs.core.Event` type
+        :return: A list of the events of that type that are currently
+            being delivered. Do not modify it.
+        """
+        return self._events.get(event_type, ())
+
+    # Reverse references
+
+    def get_referrers(self, target, component_type=None):
+        """
+        Returns the entities that refer to `target` in a reference field
+        (see :func:`wecs.core.reference`) of one of their components.
+        References are indexed when the component is flushed onto the
+        entity, and when the field is assigned to. Changes within a
+        list field need :func:`wecs.core.Entity.mark_changed`.
+
+        :param target: A :class:`wecs.core.Entity`, UID or handle
+        :param component_type: If given, only references from fields of
+            this component type are considered.
+        :return: A set of :class:`wecs.core.Entity`
+        """
+        if isinstance(target, Entity):
+            targets = (target._uid, target.handle)
+        elif target not in self._referrers:
+            return set()
+        else:
+            targets = (target, )
+        referrers = set()
+        for target in targets:
+            for entity, c_type, _ in self._referrers.get(target, ()):
+                if component_type is None or c_type is component_type:
+                    referrers.add(entity)
+        return referrers
+
+    def _update_references(self, entity, component_type, field_name=None):
+        fields = _reference_fields[component_type]
+        if field_name is None:
+            field_names = fields
+        elif field_name in fields:
+            field_names = [field_name]
+        else:
+            return
+        component = entity.components[component_type]
+        for name in field_names:
+            key = (entity, component_type, name)
+            self._unindex_reference(key)
+            targets = _get_reference_targets(getattr(component, name))
+            if targets:
+                self._references[key] = targets
+                for target in targets:
+                    self._referrers.setdefault(target, set()).add(key)
+
+    def _index_new_references(self, entities, component_type, components):
+        """
+        Batch form of :func:`_update_references` for components that
+        have just been added, and so are not indexed yet.
+
+        :param entities: A list of entities
+        :param components: The components of each of the entities
+        """
+        references = self._references
+        referrers = self._referrers
+        for name in _reference_fields[component_type]:
+            values = map(attrgetter(name), components)
+            for entity, value in zip(entities, values):
+                if value is None:
+                    continue
+                if type(value) is UID or type(value) is int:
+                    targets = (value, )
+                else:
+                    targets = _get_reference_targets(value)
+                    if not targets:
+                        continue
+                key = (entity, component_type, name)
+                references[key] = targets
+                for target in targets:
+                    if target in referrers:
+                        referrers[target].add(key)
+                    else:
+                        referrers[target] = {key}
+
+    def _unindex_references(self, entity, component_type):
+        for name in _reference_fields[component_type]:
+            self._unindex_reference((entity, component_type, name))
+
+    def _unindex_reference(self, key):
+        for target in self._references.pop(key, ()):
+            referrers = self._referrers[target]
+            referrers.discard(key)
+            if not referrers:
+                del self._referrers[target]
+
+    def _clear_references_to(self, entity):
+        """
+        Removes references to a destroyed entity from the fields
+        declared with ``reference(on_delete='clear')``: Single
+        reference fields are set to None, and the entity is removed
+        from collections. Other fields keep the dangling reference.
+        """
+        for target in (entity._uid, entity.handle):
+            for key in list(self._referrers.get(target, ())):
+                referrer, component_type, field_name = key
+                field = component_type.__dataclass_fields__[field_name]
+                if field.metadata['wecs_on_delete'] != 'clear':
+                    continue
+                component = referrer.get_component(component_type)
+                value = getattr(component, field_name)
+                if isinstance(value, list):
+                    value[:] = [v for v in value if v != target]
+                    self._update_references(referrer, component_type, field_name)
+                elif isinstance(value, (tuple, set, frozenset)):
+                    value = type(value)(v for v in value if v != target)
+                    setattr(component, field_name, value)
+                else:
+                    setattr(component, field_name, None)
+
+    # Change detection
+
+    def _watch_changes(self, system):
+        for filter_func in system.entity_filters.values():
+            for key in filter_func._get_change_keys():
+                self._change_logs.setdefault(key, {})
+                watchers = self._change_watchers.setdefault(key, [])
+                if system not in watchers:
+                    watchers.append(system)
+        self._update_watched_types()
+
+    def _unwatch_changes(self, system):
+        for key in list(self._change_watchers):
+            watchers = self._change_watchers[key]
+            if system in watchers:
+                watchers.remove(system)
+            if not watchers:
+                del self._change_watchers[key]
+                del self._change_logs[key]
+        self._update_watched_types()
+
+    def _update_watched_types(self):
+        if self._delta_logs:
+            # Delta logs record changes to all types.
+            self._watched_type_mask = -1
+            return
+        mask = 0
+        for kind, component_type in self._change_logs:
+            if kind == 'changed':
+                mask |= 1 << get_component_type_id(component_type)
+        self._watched_type_mask = mask
+
+    def _mark_changed(self, entity, component_type, field_name=None):
+        type_bit = 1 << get_component_type_id(component_type)
+        if not type_bit & (self._watched_type_mask | _reference_type_mask):
+            return
+        if type_bit & _reference_type_mask:
+            self._update_references(entity, component_type, field_name)
+        for log in self._delta_logs:
+            log.field_changed(entity, component_type, field_name, self.tick)
+        log = self._change_logs.get(('changed', component_type))
+        if log is not None:
+            self._change_seq += 1
+            log[entity] = self._change_seq
+
+    def _log_additions(self, entities, component_types):
+        # A newly added component also counts as changed.
+        for component_type in component_types:
+            for kind in ('added', 'changed'):
+                log = self._change_logs.get((kind, component_type))
+                if log is not None:
+                    self._change_seq += 1
+                    seq = self._change_seq
+                    for entity in entities:
+                        log[entity] = seq
+
+    def _get_changed_entities(self, keys, since):
+        """
+        :param keys: A list of `(kind, component type)`
+        :param since: A change sequence number
+        :return: The set of entities that have had all the changes
+            after `since`.
+        """
+        changed = None
+        for key in keys:
+            entities = {
+                entity for entity, seq in self._change_logs[key].items()
+                if seq > since
+            }
+            if changed is None:
+                changed = entities
+            else:
+                changed &= entities
+        return changed
+
+    def _prune_change_logs(self, keys):
+        # Entries that all watching systems have seen can be dropped.
+        for key in keys:
+            oldest = min(
+                system._last_change_seq
+                for system in self._change_watchers[key]
+            )
+            log = self._change_logs[key]
+            for entity in [e for e, seq in log.items() if seq <= oldest]:
+                del log[entity]
 
     # Flush entity component updates
 
@@ -183,48 +1106,355 @@ class World:
     def _register_entity_for_remove_flush(self, entity):
         self._removal_pool.add(entity)
 
+    def flush(self):
+        """
+        Flush deferred component updates now, e.g. after a batch of
+        structural changes made outside of systems when the flush
+        policy is ``'frame'``.
+        """
+        self._timed_flush()
+
     def _flush_component_updates(self):
+        self.flush_count += 1
+        if not (self._addition_pool or self._removal_pool):
+            return
+        self.effective_flush_count += 1
         while self._addition_pool or self._removal_pool:
             while self._removal_pool:
                 self._removal_flush()
             self._addition_flush()
+        if self.pools is not None and self.pools._destroyed:
+            self.pools._recycle_entities()
 
     def _removal_flush(self):
         removal_pool = self._removal_pool
         self._removal_pool = set()
+        # Entities undergoing the same change of component types are
+        # proposed to systems as a batch.
+        batches = {}  # {(current mask, future mask): [Entity]}
         for entity in removal_pool:
-            for system in self.systems.values():
-                system._propose_removal(entity)
-            entity._flush_removals()
+            key = (entity._mask, entity._get_post_removal_mask())
+            batches.setdefault(key, []).append(entity)
+        # The exit hooks of all batches are called before any of them
+        # is flushed, once per system; See _run_exit_hooks.
+        flushes = []  # [(dropped types, [Entity], Archetype)]
+        proposals = {}  # {System: ([Entity], {filter name: [Entity]})}
+        for (_, future_mask), entities in batches.items():
+            dropped = frozenset(entities[0]._dropped_components)
+            archetype = None
+            if self.archetypes is not None:
+                archetype = self._get_archetype(
+                    entities[0]._get_post_removal_component_types(),
+                    future_mask,
+                )
+            flushes.append((dropped, entities, archetype))
+            affected = self._get_affected_filters(dropped)
+            for system, filter_names in affected.items():
+                proposed, exited = proposals.setdefault(system, ([], {}))
+                proposed.extend(entities)
+                system._propose_removals(
+                    entities, future_mask, archetype, filter_names, exited,
+                )
+        for system, (proposed, exited) in proposals.items():
+            system._run_exit_hooks(proposed, exited)
+        for dropped, entities, archetype in flushes:
+            for entity in entities:
+                # Components removed by the hooks have not been
+                # proposed yet, so they are left to the next batch.
+                later = None
+                if len(entity._dropped_components) != len(dropped):
+                    later = entity._dropped_components - dropped
+                    entity._dropped_components = set(dropped)
+                entity._flush_removals()
+                if archetype is not None and entity._archetype is not None:
+                    entity._move_to_archetype(archetype)
+                if later:
+                    entity._dropped_components = later
+                    self._register_entity_for_remove_flush(entity)
 
     def _addition_flush(self):
         addition_pool = self._addition_pool
         self._addition_pool = set()
+        batches = {}  # {(current mask, future mask): [Entity]}
         for entity in addition_pool:
-            entity._flush_additions()
-            for system in self.systems.values():
-                system._propose_addition(entity)
+            key = (entity._mask, entity._get_post_addition_mask())
+            batches.setdefault(key, []).append(entity)
+        # All batches are flushed before the enter hooks are called,
+        # once per system, so components that the hooks add go into the
+        # next batch; See _run_enter_hooks.
+        proposals = {}  # {System: ([Entity], {filter name: [Entity]})}
+        for (_, future_mask), entities in batches.items():
+            added_types = list(entities[0]._added_components)
+            for entity in entities:
+                entity._flush_additions()
+            self._propose_added_batch(
+                entities, added_types, future_mask, proposals,
+            )
+        for system, (proposed, entered) in proposals.items():
+            system._run_enter_hooks(proposed, entered)
+
+    def _propose_added_batch(self, entities, added_types, mask, proposals):
+        """
+        Files entities that have just had the same components added into
+        their archetype, and proposes them to the affected systems.
+
+        :param entities: A list of entities with the same component
+            types
+        :param added_types: The types of the added components
+        :param mask: The bitmask of the entities' component types
+        :param proposals: ``{System: ([Entity], {filter name:
+            [Entity]})}`` that the proposed entities and the filters
+            they entered are added to, so that the hooks can be called
+            once the whole flush is done
+        """
+        archetype = None
+        if self.archetypes is not None:
+            archetype = self._get_archetype(entities[0].components, mask)
+            for entity in entities:
+                if entity._archetype is not None:
+                    entity._move_to_archetype(archetype)
+        if self._change_logs:
+            self._log_additions(entities, added_types)
+        affected = self._get_affected_filters(added_types)
+        for system, filter_names in affected.items():
+            proposed, entered = proposals.setdefault(system, ([], {}))
+            proposed.extend(entities)
+            system._propose_additions(
+                entities, mask, archetype, filter_names, entered,
+            )
+
+    def _add_component_tables(self, entities, tables):
+        """
+        Adds components to new entities that have none yet, one type at
+        a time instead of one entity at a time as a flush would, e.g.
+        when restoring a snapshot.
+
+        :param entities: A list of :class:`wecs.core.Entity`
+        :param tables: An iterable of ``(component type, [row],
+            [component])``, with the rows being indices into `entities`
+        """
+        tick = self.tick
+        get_components = attrgetter('components')
+        for component_type, rows, components in tables:
+            type_bit = 1 << get_component_type_id(component_type)
+            owners = list(map(entities.__getitem__, rows))
+            if type_bit & _columnar_type_mask:
+                store = self.get_column_store(component_type)
+                components = list(map(store.insert, owners, components))
+            if type_bit & _owned_type_mask:
+                # The slot's own setter, as the type may hook assignments.
+                set_owner = component_type._wecs_owner.__set__
+                deque(map(set_owner, components, owners), maxlen=0)
+            deque(
+                map(
+                    setitem,
+                    map(get_components, owners),
+                    repeat(component_type),
+                    components,
+                ),
+                maxlen=0,
+            )
+            for log in self._delta_logs:
+                for entity in owners:
+                    log.component_added(entity, component_type, tick)
+            if type_bit & _reference_type_mask:
+                self._index_new_references(owners, component_type, components)
+        # Components were added a type at a time, so entities with the
+        # same component types have them in the same order.
+        batches = {}  # {(component type, ...): [Entity]}
+        for entity, component_types in zip(
+                entities, map(tuple, map(get_components, entities)),
+        ):
+            batch = batches.get(component_types)
+            if batch is None:
+                batches[component_types] = [entity]
+            else:
+                batch.append(entity)
+        set_mask = Entity._mask.__set__
+        proposals = {}  # {System: ([Entity], {filter name: [Entity]})}
+        for component_types, batch in batches.items():
+            if not component_types:
+                continue
+            mask = get_component_type_mask(component_types)
+            deque(map(set_mask, batch, repeat(mask)), maxlen=0)
+            self._propose_added_batch(
+                batch, list(component_types), mask, proposals,
+            )
+        for system, (proposed, entered) in proposals.items():
+            system._run_enter_hooks(proposed, entered)
+
+    def _propose_all_entities(self, system):
+        """
+        Proposes all entities to a newly added system or query, in
+        batches of entities with the same component types.
+        """
+        if not self.entities:
+            return
+        batches = {}  # {(mask, Archetype): [Entity]}
+        for entity in self.entities.values():
+            key = (entity._mask, entity._archetype)
+            batches.setdefault(key, []).append(entity)
+        entered = {}  # {filter name: [Entity]}
+        for (mask, archetype), entities in batches.items():
+            system._propose_additions(
+                entities, mask, archetype, pending=entered,
+            )
+        system._run_enter_hooks(list(self.entities.values()), entered)
+
+    def _timed_flush(self, system=None):
+        """
+        Flush component updates, attributing the time to `system` if
+        profiling is enabled.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            self._flush_component_updates()
+            return
+        start = profiler.clock()
+        self._flush_component_updates()
+        profiler.add_time(system, 'flush', profiler.clock() - start)
+
+    def _run_update(self, system):
+        """
+        Run the system's update, timing it if profiling is enabled.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            system._trigger_update()
+            return
+        start = profiler.clock()
+        system._trigger_update()
+        profiler.add_time(system, 'update', profiler.clock() - start)
+
+    def start_frame(self):
+        """
+        Advances `tick`, dispatches events (see :func:`send_event`),
+        and flushes component updates if the flush policy asks for it.
+        :func:`update` does this at the start of each frame. If systems
+        are run individually instead (as by
+        :class:`wecs.panda3d.core.ECSShowBase`), call this once per
+        frame before them.
+        """
+        self.tick += 1
+        if self.replay is not None:
+            self.replay.start_frame(self)
+        self.dispatch_events()
+        if self.flush_policy != 'system':
+            self._timed_flush()
+
+    def end_frame(self):
+        """
+        Ends the frame begun by :func:`start_frame`. :func:`update`
+        does this after running the systems; If systems are run
+        individually instead, call this once per frame after them.
+        """
+        if self.replay is not None:
+            self.replay.end_frame(self)
+
+    def read_input(self, key, source, *args):
+        """
+        Reads a value from outside of the world, like a time step or
+        the state of an input device. Systems should read their inputs
+        through this, so that they can be recorded and replayed; See
+        :mod:`wecs.replay`.
+
+        :param key: Identifies the input; A string, or a tuple of
+            strings, numbers and UIDs, e.g. ``(entity._uid, 'clock')``.
+        :param source: A function that returns the input's value
+        :param args: Arguments for `source`
+        :return: ``source(*args)``, or during a replay, the recorded
+            value
+        """
+        if self.replay is None:
+            return source(*args)
+        return self.replay.read_input(key, source, args)
+
+    def _flushes_before(self, system):
+        """
+        :return: Whether the flush policy calls for a flush before
+            running `system`
+        """
+        policy = self.flush_policy
+        if policy == 'system':
+            return True
+        return policy == 'sync' and system.sync_point
 
     def _update_system(self, system):
         """
-        Run a system. First, component updates are flushed,
-        then the system's 'update' is run.
+        Run a system. First, component updates are flushed if the
+        flush policy says so, then the system's 'update' is run.
 
         For internal use by 'update'.
 
         system
             System to run
         """
-        self._flush_component_updates()
-        system._trigger_update()
+        if self._flushes_before(system):
+            self._timed_flush(system)
+        self._run_update(system)
 
     def update(self):
         """
-        Run all systems in ascending order of sort.
+        Run all systems in ascending order of sort, or let the world's
+        scheduler run them.
         """
-        for sort in sorted(self.systems):
-            system = self.systems[sort]
-            self._update_system(system)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_frame()
+        self.start_frame()
+        if self.scheduler is not None:
+            self.scheduler.update(self)
+        else:
+            for sort in sorted(self.systems):
+                system = self.systems[sort]
+                self._update_system(system)
+        self.end_frame()
+        if profiler is not None:
+            profiler.end_frame(self.systems.values())
+
+    # Pooling
+
+    def enable_pooling(self, capacity=1024):
+        """
+        Start recycling destroyed entities, and the components of the
+        types registered with the returned pools; See
+        :mod:`wecs.pooling`.
+
+        :param capacity: The number of free instances kept per pool
+        :return: The :class:`wecs.pooling.Pools`
+        """
+        from wecs.pooling import Pools
+        self.pools = Pools(capacity=capacity)
+        return self.pools
+
+    def create_component(self, component_type, **fields):
+        """
+        Creates a component, recycling one from the world's pools if
+        possible; See :func:`enable_pooling`.
+
+        :param component_type: A :class:`wecs.core.Component` type
+        :param fields: Values for the component's fields
+        :return: The component
+        """
+        if self.pools is None:
+            return component_type(**fields)
+        return self.pools.acquire(component_type, **fields)
+
+    # Profiling
+
+    def enable_profiling(self, window=300):
+        """
+        Start recording per-system timings and filter sizes.
+
+        :param window: The number of frames to keep statistics for
+        :return: The :class:`wecs.profiling.Profiler`
+        """
+        from wecs.profiling import Profiler
+        self.profiler = Profiler(window=window)
+        return self.profiler
+
+    def disable_profiling(self):
+        self.profiler = None
 
 
 class Entity:
@@ -234,17 +1464,45 @@ class Entity:
 
     They are created with :func:`wecs.core.World.create_entity`
 
+    An entity can be referenced by its :class:`wecs.core.UID`, or by its
+    `handle`, a generational int that the world can resolve with a list
+    lookup and a generation check.
+
     When components are added to or removed from entities, these changes
     are deferred until the next flush.
     """
+    __slots__ = (
+        'world',
+        '_uid',
+        'handle',
+        'name',
+        'components',
+        '_added_components',
+        '_dropped_components',
+        '_mask',
+        '_archetype',
+    )
 
     def __init__(self, world, name=None):
         self.world = world
         self._uid = UID(name)
+        self.handle = None  # Assigned by the world
         self.name = name
         self.components = {}  # type: instance
         self._added_components = {}  # type: instance
         self._dropped_components = set()  # types
+        self._mask = 0  # Bits of the IDs of the types in self.components
+        self._archetype = None  # Only used in archetype mode
+
+    def _recycle(self, name):
+        """
+        Turns a destroyed entity from the world's pool into a new one.
+        """
+        self._uid = UID(name)
+        self.handle = None
+        self.name = name
+        self._mask = 0
+        self._archetype = None
 
     # Component CRUD
 
@@ -255,9 +1513,11 @@ class Entity:
 
         :param component: The component instance to add.
         """
-        is_present = type(component) in self.components
-        is_being_deleted = type(component) in self._dropped_components
-        is_being_added = type(component) in self._added_components
+        # A view on a columnar component's row stands in for its type.
+        component_type = getattr(component, '_component_type', type(component))
+        is_present = component_type in self.components
+        is_being_deleted = component_type in self._dropped_components
+        is_being_added = component_type in self._added_components
         if is_present and not is_being_deleted:
             raise KeyError("Component type already on entity.")
         if is_being_added:
@@ -266,7 +1526,7 @@ class Entity:
         if not self._added_components:
             # First component update in current system run
             self.world._register_entity_for_add_flush(self)
-        self._added_components[type(component)] = component
+        self._added_components[component_type] = component
 
     def __setitem__(self, component_type, component):
         """
@@ -277,7 +1537,9 @@ class Entity:
         :param component:
         :return:
         """
-        assert isinstance(component, component_type)
+        assert isinstance(component, component_type) or (
+            getattr(component, '_component_type', None) is component_type
+        )
         return self.add_component(component)
 
     def get_components(self):
@@ -362,6 +1624,21 @@ class Entity:
     def __delitem__(self, component_type):
         return self.remove_component(component_type)
 
+    def mark_changed(self, component_type):
+        """
+        Mark a component as changed, so that it will show up in
+        :func:`wecs.core.changed_filter` filters, and its reference
+        fields are reindexed (see :func:`wecs.core.reference`). This is
+        necessary for components without change tracking, and for
+        changes that happen within a field's value.
+
+        :param component_type: The type of :class:`wecs.core.Component`
+            that was changed.
+        """
+        if component_type not in self.components:
+            raise KeyError("Component type not present on Entity.")
+        self.world._mark_changed(self, component_type)
+
     # Deferred component updates
 
     def _get_post_removal_component_types(self):
@@ -372,25 +1649,163 @@ class Entity:
         current_types = self.components.keys()
         return set(current_types).union(self._added_components)
 
+    def _get_post_removal_mask(self):
+        return self._mask & ~get_component_type_mask(self._dropped_components)
+
+    def _get_post_addition_mask(self):
+        return self._mask | get_component_type_mask(self._added_components)
+
     def _flush_removals(self):
+        dropped_mask = get_component_type_mask(self._dropped_components)
+        if dropped_mask & _owned_type_mask:
+            for c_type in self._dropped_components:
+                type_bit = 1 << get_component_type_id(c_type)
+                if type_bit & _reference_type_mask:
+                    self.world._unindex_references(self, c_type)
+                if type_bit & _owned_type_mask:
+                    component = self.components[c_type]
+                    object.__setattr__(component, '_wecs_owner', None)
+        logs = self.world._delta_logs
+        pools = self.world.pools
         for c_type in self._dropped_components:
-            del self.components[c_type]
+            component = self.components.pop(c_type)
+            for log in logs:
+                log.component_removed(self, c_type, self.world.tick)
+            if pools is not None:
+                pools.release(component)
+        if dropped_mask & _columnar_type_mask:
+            for c_type in self._dropped_components:
+                if (1 << get_component_type_id(c_type)) & _columnar_type_mask:
+                    self.world.get_column_store(c_type).remove(self)
+        self._mask &= ~dropped_mask
         self._dropped_components = set()
 
     def _flush_additions(self):
+        added_mask = get_component_type_mask(self._added_components)
+        if added_mask & _columnar_type_mask:
+            for c_type, component in self._added_components.items():
+                if (1 << get_component_type_id(c_type)) & _columnar_type_mask:
+                    store = self.world.get_column_store(c_type)
+                    self._added_components[c_type] = store.insert(self, component)
+        if added_mask & _owned_type_mask:
+            for c_type, component in self._added_components.items():
+                if (1 << get_component_type_id(c_type)) & _owned_type_mask:
+                    object.__setattr__(component, '_wecs_owner', self)
         self.components.update(self._added_components)
+        self._mask |= added_mask
+        for log in self.world._delta_logs:
+            for c_type in self._added_components:
+                log.component_added(self, c_type, self.world.tick)
+        if added_mask & _reference_type_mask:
+            for c_type in self._added_components:
+                if (1 << get_component_type_id(c_type)) & _reference_type_mask:
+                    self.world._update_references(self, c_type)
         self._added_components = {}
 
+    def _move_to_archetype(self, archetype):
+        if self._archetype is not None:
+            self._archetype.entities.discard(self)
+        archetype.entities.add(self)
+        self._archetype = archetype
+
+    def _leave_archetype(self):
+        if self._archetype is not None:
+            self._archetype.entities.discard(self)
+            self._archetype = None
+
     # Teardown
 
     def _destroy(self):
-        for component_type in set(self.components.keys()):
-            self.remove_component(component_type)
+        # Pending additions would otherwise add the entity to systems
+        # after it has been destroyed.
+        if self._added_components:
+            self.world._addition_pool.discard(self)
+            self._added_components = {}
+        if self.components:
+            if not self._dropped_components:
+                self.world._register_entity_for_remove_flush(self)
+            self._dropped_components = set(self.components.keys())
 
     def __repr__(self):
         return "<Entity {}>".format(self._uid.name)
 
 
+class _ForkedEntity(Entity):
+    """
+    An entity of a fork (see :func:`wecs.core.World.fork`). It shares
+    the component instances of the entity it was forked from until
+    they are accessed.
+    """
+    __slots__ = ('_shared', )
+
+    def __init__(self, world, origin):
+        self.world = world
+        self._uid = origin._uid
+        self.handle = origin.handle
+        self.name = origin.name
+        self.components = dict(origin.components)
+        self._added_components = {}
+        self._dropped_components = set()
+        self._mask = origin._mask
+        self._archetype = None
+        self._shared = set(origin.components)  # Types of shared components
+
+    def _unshare(self, component_type):
+        component = _copy_component(self.components[component_type], self)
+        self.components[component_type] = component
+        self._shared.discard(component_type)
+        return component
+
+    def get_component(self, component_type):
+        if component_type in self._shared:
+            return self._unshare(component_type)
+        return self.components[component_type]
+
+    def get_components(self):
+        for component_type in list(self._shared):
+            self._unshare(component_type)
+        return self.components.values()
+
+    def _flush_removals(self):
+        # Removal resets the owner of tracked components.
+        for component_type in self._dropped_components & self._shared:
+            self._unshare(component_type)
+        super()._flush_removals()
+
+
+_field_names = {}  # {component type: tuple of field names}
+
+
+def _copy_component(component, owner):
+    """
+    :return: A shallow copy of the component (or dataclass resource),
+        with copies of list, dict and set field values, owned by the
+        entity `owner`
+    """
+    component_type = type(component)
+    try:
+        field_names = _field_names[component_type]
+    except KeyError:
+        field_names = tuple(f.name for f in dataclasses.fields(component_type))
+        _field_names[component_type] = field_names
+    copy = object.__new__(component_type)
+    if hasattr(component, '__dict__'):
+        copy.__dict__.update(component.__dict__)
+    for name in field_names:
+        value = getattr(component, name)
+        if type(value) in (list, dict, set):
+            value = value.copy()
+        object.__setattr__(copy, name, value)
+    type_id = _component_type_ids.get(component_type)  # None for resources
+    if type_id is not None and (1 << type_id) & _owned_type_mask:
+        object.__setattr__(copy, '_wecs_owner', owner)
+    return copy
+
+
+# dataclasses can generate __slots__ since Python 3.10
+slots_supported = sys.version_info >= (3, 10)
+
+
 class Component:
     """
     New components are declared like dataclasses::
@@ -399,16 +1814,201 @@ class Component:
         class MyComponent:
             my_variable: int = 0
 
+    :param storage: ``'object'`` (default) stores each instance as is.
+        ``'columnar'`` stores the numeric fields of all instances in a
+        world in packed NumPy arrays; See :mod:`wecs.columnar`.
+    :param slots: Generate the dataclass with ``__slots__`` instead of
+        a per-instance ``__dict__``, which saves memory. Consequently,
+        only declared fields can be set on instances. Default: On if the
+        Python version supports it (3.10+).
+    :param track_changes: Assigning to a field of an instance that is
+        part of an entity marks the component as changed, as does
+        :func:`wecs.core.Entity.mark_changed`; See
+        :func:`wecs.core.changed_filter`. Note that changes *within* a
+        field's value (e.g. appending to a list) can not be detected,
+        and need to be marked explicitly.
     """
 
-    def __init__(self, unique=True):
+    def __init__(self, unique=True, storage='object', slots=None,
+                 track_changes=False):
+        if storage not in ('object', 'columnar'):
+            raise ValueError(f"Unknown component storage {storage}")
+        if slots is None:
+            slots = slots_supported
+        elif slots and not slots_supported:
+            raise ValueError("Slotted components require Python 3.10+")
+        if track_changes and storage == 'columnar':
+            raise ValueError("Columnar components can't track changes.")
         self.unique = unique
+        self.storage = storage
+        self.slots = slots
+        self.track_changes = track_changes
 
     def __call__(self, cls):
-        cls = dataclasses.dataclass(cls, eq=False)
+        global _columnar_type_mask
+        global _owned_type_mask
+        global _reference_type_mask
+        if self.slots:
+            cls = dataclasses.dataclass(cls, eq=False, slots=True)
+        else:
+            cls = dataclasses.dataclass(cls, eq=False)
+        references = {
+            f.name: f.metadata['wecs_reference']
+            for f in dataclasses.fields(cls)
+            if 'wecs_reference' in f.metadata
+        }
+        if references and self.storage == 'columnar':
+            raise ValueError("Columnar components can't have references.")
+        if self.track_changes:
+            cls = _make_tracked(cls, _tracked_setattr)
+        elif references:
+            cls = _make_tracked(cls, reference_fields=references)
+        type_id = get_component_type_id(cls)
+        if self.storage == 'columnar':
+            _columnar_type_mask |= 1 << type_id
+        if self.track_changes:
+            # Lets _tracked_setattr skip types that nothing watches.
+            cls._wecs_type_bit = 1 << type_id
+        if self.track_changes or references:
+            _owned_type_mask |= 1 << type_id
+        if references:
+            _reference_fields[cls] = references
+            _reference_type_mask |= 1 << type_id
         return cls
 
 
+def reference(many=False, on_delete='keep', **kwargs):
+    """
+    Declares a component field as holding a reference to another
+    entity (its UID or handle), or with `many`, a list of them. The
+    world keeps a reverse index of reference fields, so the entities
+    referring to an entity can be found with
+    :func:`wecs.core.World.get_referrers`::
+
+        @Component()
+        class RoomPresence:
+            room: UID = reference()
+
+    :param many: Whether the field holds a list of references. Its
+        default value is then an empty list.
+    :param on_delete: What happens to the field when the referenced
+        entity is destroyed. With 'keep', the dangling reference stays,
+        and resolving it raises :class:`wecs.core.NoSuchUID`. With
+        'clear', the field is set to None, or the reference removed
+        from the list.
+    :param kwargs: Passed on to :func:`dataclasses.field`
+    """
+    if on_delete not in ('keep', 'clear'):
+        raise ValueError(f"Unknown reference on_delete {on_delete}")
+    if many and 'default' not in kwargs:
+        kwargs.setdefault('default_factory', list)
+    metadata = dict(kwargs.pop('metadata', {}))
+    metadata['wecs_reference'] = many
+    metadata['wecs_on_delete'] = on_delete
+    return dataclasses.field(metadata=metadata, **kwargs)
+
+
+def _get_reference_targets(value):
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(target for target in value if target is not None)
+    return (value, )
+
+
+class Event:
+    """
+    New event types are declared like components::
+
+        @Event()
+        class Damaged:
+            target: UID
+            amount: int = 1
+
+    Unlike components, events are not attached to entities. They are
+    sent to the world with :func:`wecs.core.World.send_event`, and read
+    by the systems that subscribe to their type; See
+    :class:`wecs.core.System`. This makes them a cheap way to signal
+    one-shot intents, which as components would have to be added and
+    removed again, causing two flushes.
+    """
+
+    def __call__(self, cls):
+        if slots_supported:
+            return dataclasses.dataclass(cls, slots=True)
+        return dataclasses.dataclass(cls)
+
+
+def _tracked_setattr(component, name, value):
+    object.__setattr__(component, name, value)
+    owner = getattr(component, '_wecs_owner', None)
+    if owner is not None:
+        world = owner.world
+        watched = world._watched_type_mask | _reference_type_mask
+        if component._wecs_type_bit & watched:
+            world._mark_changed(owner, type(component), name)
+
+
+class _ReferenceSetter:
+    """
+    Intercepts assignments to a :func:`wecs.core.reference` field of a
+    component class that does not track changes, so that the world's
+    index of references is kept up to date. Reading the field is left
+    to the slot, or to the instance's `__dict__`, so that it stays as
+    cheap as reading any other field; See :func:`_make_tracked`.
+    """
+    __slots__ = ('name', 'storage')
+
+    def __init__(self, name, storage):
+        self.name = name
+        # The slot's member descriptor, or None if the value is kept in
+        # the instance's __dict__.
+        self.storage = storage
+
+    def __call__(self, component, value):
+        if self.storage is not None:
+            self.storage.__set__(component, value)
+        else:
+            component.__dict__[self.name] = value
+        owner = getattr(component, '_wecs_owner', None)
+        if owner is not None:
+            owner.world._update_references(owner, type(component), self.name)
+
+    # Without a __get__, lookups find the value in the instance's
+    # __dict__ first.
+    __set__ = __call__
+
+
+def _make_tracked(cls, setattr_func=None, reference_fields=()):
+    """
+    Derives a class from the dataclass `cls` that knows the entity it
+    is part of. If `setattr_func` is given, all assignments to its
+    fields go through it; Otherwise only assignments to the
+    `reference_fields` are intercepted, to keep the world's index of
+    references up to date.
+    """
+    namespace = {
+        '__slots__': ('_wecs_owner', ),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__doc__': cls.__doc__,
+    }
+    if setattr_func is not None:
+        namespace['__setattr__'] = setattr_func
+    else:
+        for name in reference_fields:
+            storage = cls.__dict__.get(name)
+            if isinstance(storage, types.MemberDescriptorType):
+                # Slotted dataclass; A property reads the slot in C.
+                namespace[name] = property(
+                    storage.__get__,
+                    _ReferenceSetter(name, storage),
+                )
+            else:
+                namespace[name] = _ReferenceSetter(name, None)
+    return type(cls.__name__, (cls, ), namespace)
+
+
 class Proxy:
     """
     When at coding time it is not yet known what component types and
@@ -449,13 +2049,40 @@ class Proxy:
 
 
 class ProxyType:
+    """
+    The definition of a :class:`Proxy`: A component type, and optionally
+    the name of one of its fields. The field name may be a dotted path,
+    e.g. ``'node.name'``.
+
+    :param component_type: A :class:`wecs.core.Component` type
+    :param field_name: Name of a field of `component_type`
+    """
     def __init__(self, component_type, field_name=None):
         self.component_type = component_type
         self.field_name = field_name
+        if field_name is not None:
+            self._get_field = attrgetter(field_name)
+        else:
+            self._get_field = None
 
     def field(self, entity):
-        component = entity[self.component_type]
-        return getattr(component, self.field_name)
+        return self._get_field(entity[self.component_type])
+
+    def compile(self):
+        """
+        :return: A function that takes an entity, and returns the proxied
+            field's value, or the component if there is no field name.
+            Everything but the entity is looked up in advance.
+        """
+        component_type = self.component_type
+        get_field = self._get_field
+        if get_field is None:
+            def get_proxied(entity):
+                return entity.get_component(component_type)
+        else:
+            def get_proxied(entity):
+                return get_field(entity.get_component(component_type))
+        return get_proxied
 
 #
 # Systems and Filters
@@ -502,8 +2129,72 @@ class System:
     component during an update, it will be present in the
     `entities_by_filter` dictionary in the set under the key `printers`.
 
-    FIXME: Document `System.proxy` / `System(proxies=...)`
+    To let a scheduler run systems concurrently (see
+    :mod:`wecs.scheduler`), a system can declare which component types
+    it reads and writes in its `update`, and whether it needs exclusive
+    access to the world::
+
+        class Print(System):
+            entity_filters = {
+                'printers' : and_filter([Printer])
+            }
+            reads = {Printer}
+            writes = set()
+
+    A system that declares neither `reads` nor `writes` is treated as
+    `exclusive`, as its `update` may access any component, e.g. through
+    referenced entities. If only one of them is declared, the other one
+    defaults to all types that the system's filters depend on. Adding or
+    removing a component counts as writing its type.
+
+    A system can also subscribe to types of events (see
+    :class:`wecs.core.Event`), and read them during its update::
+
+        class Print(System):
+            entity_filters = {}
+            subscriptions = {Message}
+
+            def update(self, entities_by_filter):
+                for message in self.get_events(Message):
+                    print(message.text)
+
+    World-level resources (see :func:`wecs.core.World.add_resource`)
+    that a system uses are declared in `resources`, and accessed with
+    :func:`get_resource`::
+
+        class DoPhysics(System):
+            entity_filters = {}
+            resources = {PhysicsWorld}
+
+            def update(self, entities_by_filter):
+                physics = self.get_resource(PhysicsWorld)
+
+    If only one of `reads` and `writes` is declared, a system counts as
+    also reading or writing its resources in the other one. Declared
+    access should list the resource types as well.
+
+    If the world's flush policy is ``'sync'``, deferred component
+    updates are only flushed before systems that set ``sync_point =
+    True``; See :class:`wecs.core.World`.
+
+    For the `proxies` of a system, see :class:`wecs.core.Proxy`. Each
+    of them is compiled into an accessor function in `proxy_fields`,
+    which takes an entity, and returns the proxied value; In loops over
+    many entities, look it up once::
+
+        def update(self, entities_by_filter):
+            model_node_of = self.proxy_fields['model_node']
+            for entity in entities_by_filter['character']:
+                model_node = model_node_of(entity)
+
+    Also see :func:`proxy_column`.
     """
+    reads = None
+    writes = None
+    exclusive = False
+    subscriptions = ()
+    resources = ()
+    sync_point = False
 
     def __init__(self, proxies=None, throw_exc=False):
         if proxies is not None:
@@ -511,6 +2202,13 @@ class System:
                 self.proxies = {}
             self.proxies.update(proxies)
         self.throw_exc = throw_exc
+        # {proxy name: function(entity)}; See ProxyType.compile
+        self.proxy_fields = {}
+        for name, proxy in getattr(self, 'proxies', {}).items():
+            if not isinstance(proxy, ProxyType):
+                # Bare component type
+                proxy = ProxyType(proxy)
+            self.proxy_fields[name] = proxy.compile()
 
         self.filters = {}
         for name in self.entity_filters.keys():
@@ -528,38 +2226,128 @@ class System:
             name: set()
             for name in self.entity_filters.keys()
         }
+        # {filter name: [(kind, component type)]}; See changed_filter
+        self._change_filters = {}
+        for name, func in self.entity_filters.items():
+            change_keys = func._get_change_keys()
+            if change_keys:
+                self._change_filters[name] = change_keys
+        self._last_change_seq = 0
+        # Hooks are looked up once; See enter_filters
+        self._enter_hooks = {}  # {filter name: method(entity)}
+        self._exit_hooks = {}
+        self._enter_batch_hooks = {}  # {filter name: method(entities)}
+        self._exit_batch_hooks = {}
+        for name in self.entity_filters:
+            for prefix, hooks, batch_hooks in (
+                    ('enter_filter_', self._enter_hooks, self._enter_batch_hooks),
+                    ('exit_filter_', self._exit_hooks, self._exit_batch_hooks),
+            ):
+                batch_hook = getattr(self, prefix + name + '_batch', None)
+                if batch_hook is not None:
+                    batch_hooks[name] = batch_hook
+                    continue
+                hook = getattr(self, prefix + name, None)
+                if hook is not None:
+                    hooks[name] = hook
+        # Overridden enter_filters / exit_filters are called per entity.
+        self._custom_enter = type(self).enter_filters is not System.enter_filters
+        self._custom_exit = type(self).exit_filters is not System.exit_filters
+        # {filter name: {component types: [(Entity, components)]}};
+        # See iter
+        self._iter_cache = {}
 
     def enter_filters(self, filters, entity):
         """
         This method is called during a flush when an entity newly
         matches one or more filters. It can be overridden in 
-        implementations of systems. By default it will look up whether
-        the system has an `enter_filter_<name>` method, and will call
-        that. The order of those calls is the same in which the filters
-        are specified.
+        implementations of systems. By default it will call the
+        system's `enter_filter_<name>` method for each filter, if it
+        has one. The order of those calls is the same in which the
+        filters are specified.
+
+        Instead of `enter_filter_<name>(entity)`, a system can define
+        `enter_filter_<name>_batch(entities)`, which is called once per
+        flush (and once when the system is added) with the list of all
+        entities that entered the filter, in the same order of filters
+        as the per-entity hooks. Entities that enter it due to component
+        changes made by hooks are passed in a further call. The hook
+        methods are looked up when the system is created, so adding
+        them to it later has no effect.
 
         :param filters: A list of filter names
         :param entity: The entity that has entered the filter(s).
         """
         for filter in filters:
-            if hasattr(self, 'enter_filter_' + filter):
-                getattr(self, 'enter_filter_' + filter)(entity)
+            if filter in self._enter_batch_hooks:
+                self._enter_batch_hooks[filter]([entity])
+            elif filter in self._enter_hooks:
+                self._enter_hooks[filter](entity)
 
     def exit_filters(self, filters, entity):
         """
         This method is called during a flush when an entity no longer
         satisfies one or more filters. It can be overridden in 
-        implementations of systems. By default it will look up whether
-        the system has an `enter_filter_<name>` method, and will call
-        that. The order of those calls is the *reverse* of that in 
+        implementations of systems. By default it will call the
+        system's `exit_filter_<name>` method for each filter, if it
+        has one. The order of those calls is the *reverse* of that in
         which the filters are specified.
 
+        As with :func:`enter_filters`, there is a batch form
+        `exit_filter_<name>_batch(entities)`.
+
         :param filters: A list of filter names
         :param entity: The entity that has entered the filter(s).
         """
         for filter in reversed(filters):
-            if hasattr(self, 'exit_filter_' + filter):
-                getattr(self, 'exit_filter_' + filter)(entity)
+            if filter in self._exit_batch_hooks:
+                self._exit_batch_hooks[filter]([entity])
+            elif filter in self._exit_hooks:
+                self._exit_hooks[filter](entity)
+
+    def is_exclusive(self):
+        """
+        :return: Whether the system may not run concurrently with any
+            other system, either because it is declared `exclusive`, or
+            because it declares neither `reads` nor `writes`.
+        """
+        if self.exclusive:
+            return True
+        return self.reads is None and self.writes is None
+
+    def get_component_access(self):
+        """
+        :return: A tuple of the sets of component types that the system
+            reads and writes during its update; See :class:`System`.
+        """
+        dependencies = set(self.resources)
+        for filter_func in self.filters:
+            dependencies.update(filter_func._get_component_dependencies())
+        reads = dependencies if self.reads is None else set(self.reads)
+        writes = dependencies if self.writes is None else set(self.writes)
+        return reads, writes
+
+    def get_resource(self, resource_type):
+        """
+        :param resource_type: A type of resource that the system
+            declares in its `resources`
+        :return: The world's resource of that type, or None if the
+            world has none.
+        """
+        if resource_type not in self.resources:
+            raise KeyError(f"{self} does not declare resource {resource_type}")
+        return self.world.resources.get(resource_type)
+
+    def get_events(self, event_type):
+        """
+        :param event_type: A :class:`wecs.core.Event` type that the
+            system subscribes to
+        :return: A list of the events of that type that are currently
+            being delivered; See :func:`wecs.core.World.send_event`.
+        """
+        if event_type not in self.subscriptions:
+            raise KeyError(f"{self} does not subscribe to {event_type}")
+        return self.world.get_events(event_type)
 
     def update(self, entities_by_filter):
         """
@@ -572,49 +2360,408 @@ class System:
         pass
 
     def _trigger_update(self):
-        self.update(self.entities)
+        if not self._change_filters:
+            self.update(self.entities)
+            return
+        # Filters with change clauses only contain the entities that
+        # had those changes since this system last ran.
+        world = self.world
+        since = self._last_change_seq
+        self._last_change_seq = world._change_seq
+        entities_by_filter = dict(self.entities)
+        seen_keys = set()
+        for filter_name, change_keys in self._change_filters.items():
+            changed = world._get_changed_entities(change_keys, since)
+            entities_by_filter[filter_name] = changed & self.entities[filter_name]
+            seen_keys.update(change_keys)
+        # Only prune once all filters have read the logs, since several
+        # of them may watch the same changes.
+        world._prune_change_logs(seen_keys)
+        self.update(entities_by_filter)
+
+    def get_columns(self, filter_name, component_type):
+        """
+        For a component type with columnar storage, get its values for
+        all entities in a filter at once.
+
+        :param filter_name: Name of a filter of this system
+        :param component_type: A :class:`wecs.core.Component` type
+            declared with ``storage='columnar'``, which all entities in
+            the filter have.
+        :return: A :class:`wecs.columnar.ColumnSelection`; Its arrays
+            are copies, so write them back by assigning to it, e.g.
+            ``columns['x'] += dt``.
+        """
+        store = self.world.get_column_store(component_type)
+        return store.select(self.entities[filter_name])
+
+    def iter(self, filter_name, *component_types):
+        """
+        Iterate over the entities in a filter together with some of
+        their components, e.g.::
 
-    def _propose_removal(self, entity):
-        exited_filters = []
-        future_components = entity._get_post_removal_component_types()
+            def update(self, entities_by_filter):
+                for entity, (controller, clock) in self.iter(
+                        'character', CharacterController, Clock,
+                ):
+                    ...
+
+        The components are fetched once, and cached until a flush
+        changes the components of entities in the filter, so in
+        systems whose entities change rarely, this is cheaper than
+        looking up the components of each entity during each update.
+
+        :param filter_name: Name of a filter of this system; It must
+            not be a change filter, since those only contain the
+            changed entities during an update; See
+            :func:`wecs.core.changed_filter`.
+        :param component_types: Component types that the filter tests
+            for, and all entities in it have
+        :return: An iterator of ``(Entity, (component, ...))``
+        :raises ValueError: If the filter is a change filter, or does
+            not test for one of the component types.
+        """
+        by_types = self._iter_cache.get(filter_name)
+        if by_types is not None:
+            rows = by_types.get(component_types)
+            if rows is not None:
+                return iter(rows)
+        if filter_name in self._change_filters:
+            raise ValueError(
+                f"Filter {filter_name!r} is a change filter; Use "
+                "entities_by_filter instead.",
+            )
+        dependencies = self.entity_filters[filter_name]._get_component_dependencies()
+        for component_type in component_types:
+            if component_type not in dependencies:
+                raise ValueError(
+                    f"Filter {filter_name!r} does not test for "
+                    f"{component_type.__name__}",
+                )
+        rows = []
+        if component_types:
+            getter = itemgetter(*component_types)
+        single = len(component_types) == 1
+        for entity in self.entities[filter_name]:
+            if type(entity) is _ForkedEntity or not component_types:
+                # Shared components have to be copied first.
+                components = tuple(
+                    entity.get_component(component_type)
+                    for component_type in component_types
+                )
+            elif single:
+                components = (getter(entity.components), )
+            else:
+                components = getter(entity.components)
+            rows.append((entity, components))
+        self._iter_cache.setdefault(filter_name, {})[component_types] = rows
+        return iter(rows)
+
+    def proxy_column(self, proxy_name, filter_name):
+        """
+        Get a proxied value for all entities in a filter at once.
+
+        :param proxy_name: Name of a proxy of this system
+        :param filter_name: Name of a filter of this system, whose
+            entities all have the proxied component type
+        :return: ``{Entity: value}``; See :func:`ProxyType.compile`.
+        """
+        get_proxied = self.proxy_fields[proxy_name]
+        return {
+            entity: get_proxied(entity)
+            for entity in self.entities[filter_name]
+        }
+
+    def _propose_removal(self, entity, archetype=None, filter_names=None):
+        """
+        :param entity: The entity that is about to lose components
+        :param archetype: In archetype mode, the
+            :class:`wecs.core.Archetype` that the entity will have after
+            the removal; Filter matches are then looked up in it instead
+            of being evaluated.
+        :param filter_names: If given, only these filters are tested.
+        """
+        self._propose_removals(
+            [entity],
+            entity._get_post_removal_mask(),
+            archetype,
+            filter_names,
+        )
+
+    def _propose_removals(self, entities, future_mask, archetype=None,
+                          filter_names=None, pending=None):
+        """
+        Batch form of :func:`_propose_removal` for entities that will
+        all have the same component types after the removal, so that
+        each filter needs to be tested only once.
+
+        :param entities: A list of entities
+        :param future_mask: The bitmask of the entities' component
+            types after the removal
+        :param pending: If given, a ``{filter name: [Entity]}`` that the
+            entities that exit filters are added to, instead of calling
+            the hooks; See :func:`_run_exit_hooks`.
+        """
+        exited_by_filter = {} if pending is None else pending
+        iter_cache = self._iter_cache
+        if archetype is not None:
+            archetype_matches = archetype.get_matching_filters(self)
         for filter_func, filter_name in self.filters.items():
-            matches = filter_func(future_components)
-            present = entity in self.entities[filter_name]
-            if present and not matches:
-                self.entities[filter_name].remove(entity)
-                exited_filters.append(filter_name)
-        self.exit_filters(exited_filters, entity)
-
-    def _propose_addition(self, entity):
-        entered_filters = []
-        future_components = entity._get_post_addition_component_types()
+            if filter_names is not None and filter_name not in filter_names:
+                continue
+            if iter_cache:
+                # The entities' components are about to change.
+                iter_cache.pop(filter_name, None)
+            if archetype is not None:
+                matches = filter_name in archetype_matches
+            else:
+                matches = filter_func._match_mask(future_mask)
+            if matches:
+                continue
+            filter_entities = self.entities[filter_name]
+            exited = [entity for entity in entities if entity in filter_entities]
+            if not exited:
+                continue
+            filter_entities.difference_update(exited)
+            exited_by_filter.setdefault(filter_name, []).extend(exited)
+        if pending is None:
+            self._run_exit_hooks(entities, exited_by_filter)
+
+    def _run_exit_hooks(self, entities, exited_by_filter):
+        """
+        Calls the exit hooks (or :func:`exit_filters`) once for all
+        entities that have been proposed for removal during a flush.
+
+        :param entities: The list of proposed entities
+        :param exited_by_filter: ``{filter name: [Entity]}`` of the
+            filters that the entities have exited
+        """
+        custom = self._custom_exit
+        if not (custom or exited_by_filter):
+            return
+        profiler = self.world.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        steps = [
+            (filter_name, exited_by_filter[filter_name])
+            for filter_name in reversed(list(self.entities))
+            if filter_name in exited_by_filter
+        ]
+        if custom:
+            for entity, filters in self._get_filters_by_entity(entities, steps):
+                filters.reverse()
+                self.exit_filters(filters, entity)
+        else:
+            self._run_hooks(
+                entities, steps, self._exit_hooks, self._exit_batch_hooks,
+            )
+        if profiler is not None:
+            profiler.add_time(self, 'exit', profiler.clock() - start)
+
+    def _propose_addition(self, entity, archetype=None, filter_names=None):
+        """
+        :param entity: The entity that has gained components
+        :param archetype: In archetype mode, the entity's
+            :class:`wecs.core.Archetype`; See :func:`_propose_removal`.
+        :param filter_names: If given, only these filters are tested.
+        """
+        self._propose_additions(
+            [entity],
+            entity._get_post_addition_mask(),
+            archetype,
+            filter_names,
+        )
+
+    def _propose_additions(self, entities, future_mask, archetype=None,
+                           filter_names=None, pending=None):
+        """
+        Batch form of :func:`_propose_addition`; See
+        :func:`_propose_removals`.
+        """
+        entered_by_filter = {} if pending is None else pending
+        iter_cache = self._iter_cache
+        if archetype is not None:
+            archetype_matches = archetype.get_matching_filters(self)
         for filter_func, filter_name in self.filters.items():
-            matches = filter_func(future_components)
-            present = entity in self.entities[filter_name]
-            if matches and not present:
-                self.entities[filter_name].add(entity)
-                entered_filters.append(filter_name)
-        self.enter_filters(entered_filters, entity)
+            if filter_names is not None and filter_name not in filter_names:
+                continue
+            if iter_cache:
+                # The entities' components are about to change.
+                iter_cache.pop(filter_name, None)
+            if archetype is not None:
+                matches = filter_name in archetype_matches
+            else:
+                matches = filter_func._match_mask(future_mask)
+            if not matches:
+                continue
+            filter_entities = self.entities[filter_name]
+            entered = [
+                entity for entity in entities
+                if entity not in filter_entities
+            ]
+            if not entered:
+                continue
+            filter_entities.update(entered)
+            entered_by_filter.setdefault(filter_name, []).extend(entered)
+        if pending is None:
+            self._run_enter_hooks(entities, entered_by_filter)
+
+    def _run_enter_hooks(self, entities, entered_by_filter):
+        """
+        Calls the enter hooks (or :func:`enter_filters`) once for all
+        entities that have been proposed for addition during a flush.
+
+        :param entities: The list of proposed entities
+        :param entered_by_filter: ``{filter name: [Entity]}`` of the
+            filters that the entities have entered
+        """
+        custom = self._custom_enter
+        if not (custom or entered_by_filter):
+            return
+        profiler = self.world.profiler
+        if profiler is not None:
+            start = profiler.clock()
+        steps = [
+            (filter_name, entered_by_filter[filter_name])
+            for filter_name in self.entities
+            if filter_name in entered_by_filter
+        ]
+        if custom:
+            for entity, filters in self._get_filters_by_entity(entities, steps):
+                self.enter_filters(filters, entity)
+        else:
+            self._run_hooks(
+                entities, steps, self._enter_hooks, self._enter_batch_hooks,
+            )
+        if profiler is not None:
+            profiler.add_time(self, 'enter', profiler.clock() - start)
+
+    def _get_filters_by_entity(self, entities, steps):
+        """
+        :return: A list of ``(Entity, [filter name])`` for each of the
+            entities, with the filter names in the order of `steps`
+        """
+        filters_by_entity = {entity: [] for entity in entities}
+        for filter_name, batch in steps:
+            for entity in batch:
+                filters_by_entity[entity].append(filter_name)
+        return list(filters_by_entity.items())
+
+    def _run_hooks(self, entities, steps, hooks, batch_hooks):
+        """
+        Calls the hooks of filters that entities have entered or exited.
+        Per-entity hooks are called entity by entity, but never past a
+        batch hook of a filter that comes first in the order of `steps`.
+
+        :param entities: The list of entities, in the order in which the
+            per-entity hooks are called for them
+        :param steps: A list of ``(filter name, [Entity])`` in the order
+            in which the filters' hooks should be called
+        :param hooks: ``{filter name: method(entity)}``
+        :param batch_hooks: ``{filter name: method(entities)}``
+        """
+        pending = {}  # {Entity: [filter name]}
+        for filter_name, batch in steps:
+            if filter_name in batch_hooks:
+                if pending:
+                    self._run_entity_hooks(entities, pending, hooks)
+                    pending = {}
+                batch_hooks[filter_name](batch)
+            elif filter_name in hooks:
+                for entity in batch:
+                    if entity in pending:
+                        pending[entity].append(filter_name)
+                    else:
+                        pending[entity] = [filter_name]
+        if pending:
+            self._run_entity_hooks(entities, pending, hooks)
+
+    def _run_entity_hooks(self, entities, pending, hooks):
+        for entity in entities:
+            if entity in pending:
+                for filter_name in pending[entity]:
+                    hooks[filter_name](entity)
 
     def _destroy(self):
-        all_entities = set.union(set(), *self.entities.values())
-        for entity in all_entities:
-            filters = [
-                f_name for f_name, f_ent in self.entities.items()
-                if entity in f_ent
-            ]
-            self.exit_filters(filters, entity)
-            for filter in filters:
-                self.entities[filter].remove(entity)
+        self._iter_cache = {}
+        if self._custom_exit:
+            all_entities = set.union(set(), *self.entities.values())
+            for entity in all_entities:
+                filters = [
+                    f_name for f_name, f_ent in self.entities.items()
+                    if entity in f_ent
+                ]
+                self.exit_filters(filters, entity)
+                for filter in filters:
+                    self.entities[filter].remove(entity)
+            return
+        steps = [
+            (filter_name, list(self.entities[filter_name]))
+            for filter_name in reversed(list(self.entities))
+            if self.entities[filter_name]
+        ]
+        all_entities = list(set.union(set(), *self.entities.values()))
+        for filter_entities in self.entities.values():
+            filter_entities.clear()
+        self._run_hooks(
+            all_entities, steps, self._exit_hooks, self._exit_batch_hooks,
+        )
 
     def __repr__(self):
         return self.__class__.__name__
 
 
+class Query(System):
+    """
+    A live set of the entities that match a filter. Please use
+    :func:`wecs.core.World.query` to get one.
+
+    It supports ``len()``, ``in`` and iteration; Like with systems'
+    filters, changes only become visible after flushes.
+    """
+
+    def __init__(self, filter_func):
+        self.entity_filters = {'query': filter_func}
+        super().__init__()
+        self._refcount = 0
+        self._key = None
+
+    def release(self):
+        """
+        Give up this reference to the query. When the last one is
+        released, the world stops maintaining it.
+        """
+        if self._refcount <= 0:
+            raise ValueError("Query was already released.")
+        self.world._release_query(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def __iter__(self):
+        return iter(self.entities['query'])
+
+    def __len__(self):
+        return len(self.entities['query'])
+
+    def __contains__(self, entity):
+        return entity in self.entities['query']
+
+    def __repr__(self):
+        return "<Query {}>".format(self._key)
+
+
 class Filter:
     """
     The base class for filters. Please don't use it directly. Instead,
     use :func:`wecs.core.and_filter` and :func:`wecs.core.or_filter`.
+
+    Filters are compiled into predicates over bitmasks of component
+    type IDs (see :func:`wecs.core.get_component_type_mask`), so that
+    matching an entity takes a few integer operations.
     """
 
     def __init__(self, *types_and_filters):
@@ -626,11 +2773,14 @@ class Filter:
         else:
             self.types_and_filters = types_and_filters
         self.types_and_filters = list(self.types_and_filters)
+        self._predicate = None
 
     def _resolve_proxies(self, proxies):
         for idx in range(len(self.types_and_filters)):
             t_o_f = self.types_and_filters[idx]
-            if isinstance(t_o_f, Proxy):
+            if isinstance(t_o_f, Filter):
+                t_o_f._resolve_proxies(proxies)
+            elif isinstance(t_o_f, Proxy):
                 proxy = proxies[t_o_f.name]
                 if isinstance(proxy, ProxyType):
                     resolved_type = proxy.component_type
@@ -638,21 +2788,15 @@ class Filter:
                     # Bare component type
                     resolved_type = proxy
                 self.types_and_filters[idx] = resolved_type
-                    
+        # Clauses may have changed, so the predicate must be recompiled.
+        self._predicate = None
 
     def _get_component_dependencies(self):
         """
-        FIXME: Not used anymore; A leftover from an optimization. (delete)
-
         When an entity's component set is changed, it only needs to be
         tested against filters where the changed component's type is
-        in the dependency list.
-
-        While not saving any significant time in itself, this could be
-        turned inside-out, mapping component types to a complete list of
-        filters that relate to the type. This too though would only save
-        noticeable time if there's lots and lots of systems, and
-        component changes happen many times per update.
+        in the dependency list. The world uses this to build an index
+        mapping component types to the filters that relate to them.
 
         :return: a set of all component types matched against by this filter
             and its sub-filters
@@ -665,12 +2809,65 @@ class Filter:
                 dependencies.add(clause)
         return dependencies
 
+    def _get_change_keys(self):
+        """
+        :return: A list of `(kind, component type)` for the change
+            clauses (see :func:`wecs.core.changed_filter`) in this filter.
+        """
+        keys = []
+        for clause in self.types_and_filters:
+            if isinstance(clause, Filter):
+                keys.extend(clause._get_change_keys())
+        return keys
+
+    def _get_key(self):
+        """
+        :return: A hashable key that is equal for filters with the same
+            clauses, regardless of their order.
+        """
+        clauses = frozenset(
+            clause._get_key() if isinstance(clause, Filter) else clause
+            for clause in self.types_and_filters
+        )
+        return (type(self), clauses)
+
+    def _get_mask_and_subfilters(self):
+        """
+        Splits the clauses into a bitmask of the bare component types,
+        and the sub-filters that need to be tested separately.
+        Sub-filters of the same kind as this filter are merged into it.
+        """
+        mask = 0
+        sub_predicates = []
+        for clause in self.types_and_filters:
+            if type(clause) is type(self):
+                sub_mask, sub_sub_predicates = clause._get_mask_and_subfilters()
+                mask |= sub_mask
+                sub_predicates.extend(sub_sub_predicates)
+            elif isinstance(clause, Filter):
+                sub_predicates.append(clause._get_predicate())
+            else:
+                mask |= 1 << get_component_type_id(clause)
+        return mask, tuple(sub_predicates)
+
+    def _get_predicate(self):
+        if self._predicate is None:
+            self._predicate = self._compile()
+        return self._predicate
+
+    def _match_mask(self, mask):
+        """
+        :param mask: A bitmask of component type IDs
+        :return: Whether the filter matches an entity with these types
+        """
+        return self._get_predicate()(mask)
+
     def __call__(self, types_or_entity):
         if isinstance(types_or_entity, Entity):
-            present_types = types_or_entity.get_component_types()
+            mask = types_or_entity._mask
         else:
-            present_types = types_or_entity
-        return self._evaluate(present_types)
+            mask = get_component_type_mask(types_or_entity)
+        return self._match_mask(mask)
 
 
 class AndFilter(Filter):  # fixme should this be a private or at least protected class?
@@ -679,14 +2876,19 @@ class AndFilter(Filter):  # fixme should this be a private or at least protected
     instead.
     """
 
-    def _evaluate(self, types):
-        for clause in self.types_and_filters:
-            if isinstance(clause, Filter):
-                if not clause(types):
-                    return False
-            elif clause not in types:
+    def _compile(self):
+        required, sub_predicates = self._get_mask_and_subfilters()
+        if not sub_predicates:
+            return lambda mask: mask & required == required
+
+        def predicate(mask):
+            if mask & required != required:
                 return False
-        return True
+            for sub_predicate in sub_predicates:
+                if not sub_predicate(mask):
+                    return False
+            return True
+        return predicate
 
 
 class OrFilter(Filter):  # fixme maybe rename to _OrFilter
@@ -695,14 +2897,40 @@ class OrFilter(Filter):  # fixme maybe rename to _OrFilter
     instead.
     """
 
-    def _evaluate(self, types):
-        for clause in self.types_and_filters:
-            if isinstance(clause, Filter):
-                if clause(types):
-                    return True
-            elif clause in types:
+    def _get_change_keys(self):
+        if super()._get_change_keys():
+            raise ValueError("Change filters can't be used in or-filters.")
+        return []
+
+    def _compile(self):
+        any_of, sub_predicates = self._get_mask_and_subfilters()
+        if not sub_predicates:
+            return lambda mask: mask & any_of != 0
+
+        def predicate(mask):
+            if mask & any_of:
                 return True
-        return False
+            for sub_predicate in sub_predicates:
+                if sub_predicate(mask):
+                    return True
+            return False
+        return predicate
+
+
+class ChangedFilter(AndFilter):
+    """
+    Class for change filters. Please use
+    :func:`wecs.core.changed_filter` and :func:`wecs.core.added_filter`
+    instead.
+    """
+    change_kind = 'changed'
+
+    def _get_change_keys(self):
+        return [(self.change_kind, self.types_and_filters[0])]
+
+
+class AddedFilter(ChangedFilter):
+    change_kind = 'added'
 
 
 def and_filter(*types_and_filters):
@@ -744,3 +2972,44 @@ def or_filter(*types_and_filters):
     :return: The filter object
     """
     return OrFilter(*types_and_filters)
+
+
+def changed_filter(component_type):
+    """
+    Creates a filter that matches entities with a component of the
+    given type, like ``and_filter(component_type)``. However, when the
+    system's `update` is called, the filter only contains those
+    entities whose component has changed since the system's last
+    update. Changes are detected for components declared with
+    ``@Component(track_changes=True)``, and marked explicitly with
+    :func:`wecs.core.Entity.mark_changed`. Newly added components also
+    count as changed.
+
+    Change filters can be used as a filter, or within an
+    :func:`wecs.core.and_filter`, but not within an
+    :func:`wecs.core.or_filter`. Enter and exit hooks are called
+    based on the presence of the component type, not on changes.
+
+    Examples::
+
+        # These filters contain, during an update, entities which...
+        changed_filter(Position)  # ...had their Position changed
+        and_filter(Model, changed_filter(Position))  # ...have a Model,
+            # and had their Position changed
+
+    :param component_type: A :class:`wecs.core.Component` type
+    :return: The filter object
+    """
+    return ChangedFilter(component_type)
+
+
+def added_filter(component_type):
+    """
+    Like :func:`wecs.core.changed_filter`, but during an update only
+    contains entities that have gained a component of the type since
+    the system's last update.
+
+    :param component_type: A :class:`wecs.core.Component` type
+    :return: The filter object
+    """
+    return AddedFilter(component_type)
@@ -1,10 +1,11 @@
 from typing import List
-from dataclasses import field
 
 from wecs.core import Component
+from wecs.core import Event
 from wecs.core import System
 from wecs.core import UID
 from wecs.core import and_filter
+from wecs.core import reference
 from wecs.rooms import Room
 from wecs.rooms import RoomPresence
 from wecs.rooms import is_in_room
@@ -15,7 +16,7 @@ from wecs.inventory import is_in_inventory
 @Component()
 class Equipment:
     # Contains entities with Slot component
-    slots: List[UID] = field(default_factory=list)
+    slots: List[UID] = reference(many=True, on_delete='clear')
 
 
 @Component()
@@ -23,7 +24,7 @@ class Slot:
     # An entity must have a component of this type to be equippable
     # in this slot
     type: type
-    content: UID  # The actual item
+    content: UID = reference(on_delete='clear')  # The actual item
 
 
 @Component()
@@ -44,6 +45,21 @@ class UnequipAction:
     target: UID
 
 
+# Event-based alternatives to the actions; See EquipOrUnequipEvents
+@Event()
+class EquipEvent:
+    actor: UID
+    item: UID
+    slot: UID
+
+
+@Event()
+class UnequipEvent:
+    actor: UID
+    slot: UID
+    target: UID
+
+
 def is_equippable_in_slot(item, slot, entity):
     # If the item is equippable...
     if not item.has_component(Equippable):
@@ -126,6 +142,11 @@ class EquipOrUnequip(System):
         'equip': and_filter([EquipAction]),
         'unequip': and_filter([UnequipAction]),
     }
+    reads = {
+        EquipAction, UnequipAction,
+        Slot, Equippable, Inventory, Room, RoomPresence,
+    }
+    writes = {EquipAction, UnequipAction, Slot, Inventory, RoomPresence}
 
     def update(self, entities_by_filter):
         for entity in entities_by_filter['unequip']:
@@ -143,3 +164,27 @@ class EquipOrUnequip(System):
             item = self.world.get_entity(action.item)
             slot = self.world.get_entity(action.slot)
             equip(item, slot, entity)
+
+
+class EquipOrUnequipEvents(System):
+    """
+    Like :class:`EquipOrUnequip`, but for :class:`EquipEvent` and
+    :class:`UnequipEvent`, which do not cause any flushes.
+    """
+    entity_filters = {}
+    subscriptions = {EquipEvent, UnequipEvent}
+    reads = {Slot, Equippable, Inventory, Room, RoomPresence}
+    writes = {Slot, Inventory, RoomPresence}
+
+    def update(self, entities_by_filter):
+        for event in self.get_events(UnequipEvent):
+            entity = self.world.get_entity(event.actor)
+            slot = self.world.get_entity(event.slot)
+            target = self.world.get_entity(event.target)
+            unequip(slot, target, entity, self.world)
+
+        for event in self.get_events(EquipEvent):
+            entity = self.world.get_entity(event.actor)
+            item = self.world.get_entity(event.item)
+            slot = self.world.get_entity(event.slot)
+            equip(item, slot, entity)
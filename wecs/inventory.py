@@ -1,6 +1,6 @@
 from dataclasses import field
 
-from wecs.core import Component, System, UID, NoSuchUID, and_filter
+from wecs.core import Component, Event, System, UID, NoSuchUID, and_filter
 from wecs.rooms import RoomPresence
 
 
@@ -24,6 +24,19 @@ class DropAction:
     item: UID
 
 
+# Event-based alternatives to the actions; See TakeOrDropEvents
+@Event()
+class TakeEvent:
+    actor: UID
+    item: UID
+
+
+@Event()
+class DropEvent:
+    actor: UID
+    item: UID
+
+
 class ItemNotInRoom(Exception): pass
 
 
@@ -131,25 +144,65 @@ def drop(item, entity):
     item.add_component(RoomPresence(room=room_uid))
 
 
+def try_take(item_uid, entity, world, throw_exc=False):
+    try:
+        item = world.get_entity(item_uid)
+        if can_take(item, entity, throw_exc):
+            take(item, entity)
+    except NoSuchUID:
+        if throw_exc:
+            raise
+
+
+def try_drop(item_uid, entity, world, throw_exc=False):
+    item = world.get_entity(item_uid)
+    if can_drop(item, entity, throw_exc):
+        drop(item, entity)
+
+
 class TakeOrDrop(System):
     entity_filters = {
         'take': and_filter([TakeAction]),
         'drop': and_filter([DropAction]),
     }
+    reads = {TakeAction, DropAction, Inventory, Takeable, RoomPresence}
+    writes = {TakeAction, DropAction, Inventory, RoomPresence}
 
     def update(self, entities_by_filter):
         for entity in entities_by_filter['take']:
             action = entity.get_component(TakeAction)
+            try_take(action.item, entity, self.world, self.throw_exc)
+            entity.remove_component(TakeAction)
+        for entity in entities_by_filter['drop']:
+            item_uid = entity.get_component(DropAction).item
+            entity.remove_component(DropAction)
+            try_drop(item_uid, entity, self.world, self.throw_exc)
+
+
+class TakeOrDropEvents(System):
+    """
+    Like :class:`TakeOrDrop`, but for :class:`TakeEvent` and
+    :class:`DropEvent`, which do not cause any flushes.
+    """
+    entity_filters = {}
+    subscriptions = {TakeEvent, DropEvent}
+    reads = {Inventory, Takeable, RoomPresence}
+    writes = {Inventory, RoomPresence}
+
+    def update(self, entities_by_filter):
+        for event in self.get_events(TakeEvent):
             try:
-                item = self.world.get_entity(action.item)
-                if can_take(item, entity, self.throw_exc):
-                    take(item, entity)
+                entity = self.world.get_entity(event.actor)
             except NoSuchUID:
                 if self.throw_exc:
                     raise
-            entity.remove_component(TakeAction)
-        for entity in entities_by_filter['drop']:
-            item = self.world.get_entity(entity.get_component(DropAction).item)
-            entity.remove_component(DropAction)
-            if can_drop(item, entity, self.throw_exc):
-                drop(item, entity)
+                continue
+            try_take(event.item, entity, self.world, self.throw_exc)
+        for event in self.get_events(DropEvent):
+            try:
+                entity = self.world.get_entity(event.actor)
+            except NoSuchUID:
+                if self.throw_exc:
+                    raise
+                continue
+            try_drop(event.item, entity, self.world, self.throw_exc)
@@ -8,13 +8,17 @@ mechanism to build a hierarchy of clocks, with children running at a
 settable speed relative to their parent.
 """
 
+import logging
+import struct
 from types import FunctionType
-from collections import defaultdict
 
 from wecs.core import Component
+from wecs.core import NoSuchUID
 from wecs.core import System
 from wecs.core import and_filter
 from wecs.core import UID
+from wecs.core import reference
+from wecs.snapshot import register_codec
 
 
 class SettableClock:
@@ -28,6 +32,14 @@ class SettableClock:
         return self.dt
 
 
+register_codec(
+    SettableClock,
+    lambda clock: struct.pack('<d', clock.dt),
+    lambda data: SettableClock(*struct.unpack('<d', data)),
+    input_source=True,
+)
+
+
 def panda3d_clock():
     return globalClock.dt
 
@@ -44,7 +56,8 @@ class Clock:
       with a speed of `scaling_factor` relative to its parent.
       Default: 1.0
     parent: UID of the entity with the parent clock. `None` for root
-      clocks.
+      clocks. If the parent is destroyed, the clock is no longer
+      updated, and :class:`DetermineTimestep` logs a warning.
     wall_time: The actual time delta. Set by :class:`DetermineTimestep`
     frame_time: The wall time, clamped to max_timestep.
     game_time: Frame time, scaled by scaling factor
@@ -53,7 +66,7 @@ class Clock:
     timestep: float = 0.0  # Deprecated
     max_timestep: float = 1.0 / 30
     scaling_factor: float = 1.0
-    parent: UID = None
+    parent: UID = reference(default=None)
     wall_time: float = 0.0
     frame_time: float = 0.0
     game_time: float = 0.0
@@ -66,15 +79,17 @@ class DetermineTimestep(System):
     entity_filters = {
         'clock': and_filter([Clock]),
     }
+    reads = {Clock}
+    writes = {Clock}
 
     def update(self, entities_by_filter):
-        clocks_by_parent = defaultdict(set)
-        for entity in entities_by_filter['clock']:
-            clocks_by_parent[entity[Clock].parent].add(entity)
+        clocks = entities_by_filter['clock']
         updated_parents = set()
-        for entity in clocks_by_parent[None]:
+        for entity in clocks:
             clock = entity[Clock]
-            dt = clock.clock()
+            if clock.parent is not None:
+                continue
+            dt = self.world.read_input((entity._uid, 'clock'), clock.clock)
             # Wall time: The last frame's physical duration
             clock.wall_time = dt
             # Frame time: Wall time, capped to a maximum
@@ -88,17 +103,35 @@ class DetermineTimestep(System):
             clock.game_time = clock.frame_time * clock.scaling_factor
             # ...and to start the loop...
             updated_parents.add(entity._uid)
+        updated = len(updated_parents)
         while updated_parents:
             next_parents = set()
             for parent in updated_parents:
-                if parent in clocks_by_parent:
-                    for entity in clocks_by_parent[parent]:
-                        child_clock = entity[Clock]
-                        parent_clock = entity.world[parent][Clock]
-                        child_clock.wall_time = parent_clock.wall_time
-                        # FIXME: Rip out timestep
-                        child_clock.timestep = parent_clock.frame_time
-                        child_clock.frame_time = parent_clock.frame_time
-                        child_clock.game_time = parent_clock.game_time * child_clock.scaling_factor
-                        next_parents.add(entity._uid)
+                for entity in self.world.get_referrers(parent, Clock):
+                    child_clock = entity[Clock]
+                    parent_clock = entity.world[parent][Clock]
+                    child_clock.wall_time = parent_clock.wall_time
+                    # FIXME: Rip out timestep
+                    child_clock.timestep = parent_clock.frame_time
+                    child_clock.frame_time = parent_clock.frame_time
+                    child_clock.game_time = parent_clock.game_time * child_clock.scaling_factor
+                    next_parents.add(entity._uid)
+            updated += len(next_parents)
             updated_parents = next_parents
+        if updated < len(clocks):
+            self._warn_about_orphans(clocks)
+
+    def _warn_about_orphans(self, clocks):
+        # Clock.parent keeps dangling references, so a clock whose
+        # parent was destroyed does not silently become a root clock.
+        for entity in clocks:
+            parent = entity[Clock].parent
+            if parent is None:
+                continue
+            try:
+                self.world.get_entity(parent)
+            except NoSuchUID:
+                logging.warning(
+                    f"Clock of {entity._uid} is not updated, as its "
+                    f"parent {parent} has been destroyed"
+                )
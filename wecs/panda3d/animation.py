@@ -31,11 +31,11 @@ class AnimateCharacter(System):
     proxies = {'actor': ProxyType(Actor, 'node')}
 
     def update(self, entities_by_filter):
+        actor_of = self.proxy_fields['actor']
         for entity in entities_by_filter['animated_character']:
             controller = entity[CharacterController]
             animation = entity[Animation]
-            actor_proxy = self.proxies['actor']
-            actor = actor_proxy.field(entity)
+            actor = actor_of(entity)
 
             if FallingMovement in entity:
                 grounded = entity[FallingMovement].ground_contact
@@ -126,10 +126,10 @@ class Animate(System):
     proxies = {'actor': ProxyType(Actor, 'node')}
 
     def update(self, entities_by_filter):
+        actor_of = self.proxy_fields['actor']
         for entity in entities_by_filter['animation']:
             animation = entity[Animation]
-            actor_proxy = self.proxies['actor']
-            actor = actor_proxy.field(entity)
+            actor = actor_of(entity)
 
             if not animation.playing == animation.to_play:
                 if len(animation.to_play) > 0:
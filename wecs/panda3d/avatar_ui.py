@@ -7,6 +7,7 @@ from wecs.core import ProxyType
 
 from wecs.panda3d.prototype import Model
 from wecs.panda3d.input import Input
+from wecs.panda3d.input import read_context
 from wecs.panda3d.mouseover import MouseOveringCamera
 from wecs.panda3d.mouseover import UserInterface
 from wecs.panda3d.mouseover import Selectable
@@ -46,7 +47,7 @@ class AvatarUI(System):
         for entity in entities_by_filter['cursor']:
             input = entity[Input]
             if self.input_context in input.contexts:
-                context = base.device_listener.read_context(self.input_context)
+                context = read_context(self.world, self.input_context)
                 self.process_input(entity, context)
 
     def process_input(self, entity, context):
@@ -57,6 +57,7 @@ from wecs.core import Proxy
 from wecs.core import ProxyType
 from wecs.core import and_filter
 from wecs.panda3d.input import Input
+from wecs.panda3d.input import read_context
 from wecs.panda3d.prototype import Model
 from wecs.panda3d.prototype import Actor
 from wecs.mechanics.clock import Clock
@@ -104,6 +105,7 @@ class ObjectCentricCameraMode:
         horizontally.
     :param:`pitch`:  Fraction of the `turning speed` to rotate 
         vertically.
+    :param:`zoom`: Requested change of the distance
     :param:`min_pitch`: Limit to looking down
     :param:`max_pitch`: Limit to looking up
     """
@@ -113,6 +115,7 @@ class ObjectCentricCameraMode:
     turning_speed: float = 60.0
     heading: float = 0
     pitch: float = 0
+    zoom: float = 0
     min_pitch: float = -80.0
     max_pitch: float = 45.0
 
@@ -234,7 +237,7 @@ class ReorientObjectCentricCamera(System):
         for entity in entities_by_filter['input']:
             input = entity[Input]
             if self.input_context in input.contexts:
-                context = base.device_listener.read_context(self.input_context)
+                context = read_context(self.world, self.input_context)
                 self.process_input(entity, context)
 
         for entity in entities_by_filter['camera']:
@@ -282,7 +285,7 @@ class ZoomObjectCentricCamera(System):
         for entity in entities_by_filter['input']:
             input = entity[Input]
             if self.input_context in input.contexts:
-                context = base.device_listener.read_context(self.input_context)
+                context = read_context(self.world, self.input_context)
                 self.process_input(entity, context)
 
     def process_input(self, entity, context):
@@ -111,6 +111,7 @@ from wecs.core import and_filter
 from wecs.core import or_filter
 from wecs.mechanics.clock import Clock
 from wecs.panda3d.input import Input
+from wecs.panda3d.input import read_context
 
 from wecs.panda3d.prototype import Model
 from wecs.panda3d.prototype import Geometry
@@ -363,7 +364,7 @@ class UpdateCharacter(System):
         for entity in entities_by_filter['input']:
             input = entity[Input]
             if self.input_context in input.contexts:
-                context = base.device_listener.read_context(self.input_context)
+                context = read_context(self.world, self.input_context)
                 character = entity[CharacterController]
 
                 if context['direction'] is not None:
@@ -395,9 +396,10 @@ class UpdateCharacter(System):
                 if 'crouch' in context:
                     character.crouches = context['crouch']
 
-        for entity in entities_by_filter['character']:
-            controller = entity[CharacterController]
-            dt = entity[Clock].game_time
+        for entity, (controller, clock) in self.iter(
+                'character', CharacterController, Clock,
+        ):
+            dt = clock.game_time
 
             # Rotation
             controller.rotation = Vec3(
@@ -451,10 +453,9 @@ class ReorientInputBasedOnCamera(System):
         reorienter.node.detach_node()
 
     def update(self, entities_by_filter):
+        model_node_of = self.proxy_fields['model']
         for entity in entities_by_filter['reorient']:
-            model_proxy = self.proxies['model']
-            model = entity[model_proxy.component_type]
-            model_node = model_proxy.field(entity)
+            model_node = model_node_of(entity)
             character = entity[CharacterController]
             camera = entity[Camera]
             reorienter = entity[CameraReorientedInput]
@@ -608,16 +609,12 @@ class CollisionSystem(System):
                 node_np.show()
 
         if movement.debug:
-            scene_proxy = self.proxies['scene_node']
-            scene = entity[scene_proxy.component_type]
-            scene_node = scene_proxy.field(entity)
+            scene_node = self.proxy_fields['scene_node'](entity)
 
             movement.traverser.show_collisions(scene_node)
 
     def run_sensors(self, entity, movement):
-        scene_proxy = self.proxies['scene_node']
-        scene = entity[scene_proxy.component_type]
-        scene_node = scene_proxy.field(entity)
+        scene_node = self.proxy_fields['scene_node'](entity)
 
         movement.traverser.traverse(scene_node)
         movement.queue.sort_entries()
@@ -638,9 +635,9 @@ class Floating(System):
     }
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            character = entity[CharacterController]
-            floating = entity[FloatingMovement]
+        for entity, (character, floating) in self.iter(
+                'character', CharacterController, FloatingMovement,
+        ):
 
             character.translation *= floating.speed
             character.rotation *= floating.turning_speed
@@ -660,10 +657,9 @@ class Walking(System):
     }
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            character = entity[CharacterController]
-            walking = entity[WalkingMovement]
-
+        for entity, (character, walking) in self.iter(
+                'character', CharacterController, WalkingMovement,
+        ):
             speed = walking.speed
             if character.sprints and SprintingMovement in entity:
                 speed = entity[SprintingMovement].speed
@@ -710,13 +706,14 @@ o            | :class:`wecs.panda3d.camera.Camera`
     proxies = {'character_node': ProxyType(Model, 'node')}
 
     def update(self, entities_by_filter):
+        model_node_of = self.proxy_fields['character_node']
         for entity in entities_by_filter['character']:
             character = entity[CharacterController]
             camera = entity[Camera]
             center = entity[ObjectCentricCameraMode]
             turning = entity[TurningBackToCameraMovement]
             autoturning = entity[AutomaticTurningMovement]
-            model_node = self.proxies['character_node'].field(entity)
+            model_node = model_node_of(entity)
 
             dt = entity[Clock].game_time
 
@@ -748,7 +745,7 @@ class DirectlyIndicateDirection(System):
         for entity in entities_by_filter['character']:
             input = entity[Input]
             if self.input_context in input.contexts:
-                context = base.device_listener.read_context(self.input_context)
+                context = read_context(self.world, self.input_context)
                 self.process_input(context, entity)
 
     def process_input(self, context, entity):
@@ -798,10 +795,11 @@ class AutomaticallyTurnTowardsDirection(System):
     proxies = {'character_node': ProxyType(Model, 'node')}
 
     def update(self, entities_by_filter):
+        model_node_of = self.proxy_fields['character_node']
         for entity in entities_by_filter['character']:
             character = entity[CharacterController]
             turning = entity[AutomaticTurningMovement]
-            model_node = self.proxies['character_node'].field(entity)
+            model_node = model_node_of(entity)
             if WalkingMovement in entity:
                 movement = entity[WalkingMovement]
             else:
@@ -864,10 +862,9 @@ class FaceMovement(System):
     proxies = {'geometry_node': ProxyType(Geometry, 'node')}
 
     def update(self, entities_by_filter):
+        geometry_node_of = self.proxy_fields['geometry_node']
         for entity in entities_by_filter['character']:
-            geometry_proxy = self.proxies['geometry_node']
-            geometry = entity[geometry_proxy.component_type]
-            geometry_node = geometry_proxy.field(entity)
+            geometry_node = geometry_node_of(entity)
 
             controller = entity[CharacterController]
             x, y, z = controller.last_translation_speed
@@ -909,13 +906,12 @@ class Inertiing(System):
         pdb.set_trace()
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            dt = entity[Clock].game_time
-            model_proxy = self.proxies['character_node']
-            model = entity[model_proxy.component_type]
-            model_node = model_proxy.field(entity)
-            character = entity[CharacterController]
-            inertia = entity[InertialMovement]
+        model_node_of = self.proxy_fields['character_node']
+        for entity, (clock, character, inertia) in self.iter(
+                'character', Clock, CharacterController, InertialMovement,
+        ):
+            dt = clock.game_time
+            model_node = model_node_of(entity)
 
             # Usually you want to apply inertia only to x and y, and
             # ignore z, so we cache it.
@@ -996,10 +992,9 @@ class Bumping(CollisionSystem):
         movement.queue.add_collider(node, node)
 
     def update(self, entities_by_filter):
+        scene_node_of = self.proxy_fields['scene_node']
         for entity in entities_by_filter['character']:
-            scene_proxy = self.proxies['scene_node']
-            scene = entity[scene_proxy.component_type]
-            scene_node = scene_proxy.field(entity)
+            scene_node = scene_node_of(entity)
             character = entity[CharacterController]
             movement = entity[BumpingMovement]
             bumper = movement.solids['bumper']
@@ -1049,12 +1044,8 @@ class Falling(CollisionSystem):
 
     def predict_falling(self, entity):
         character = entity[CharacterController]
-        model_proxy = self.proxies['character_node']
-        model = entity[model_proxy.component_type]
-        model_node = model_proxy.field(entity)
-        scene_proxy = self.proxies['scene_node']
-        scene = entity[scene_proxy.component_type]
-        scene_node = scene_proxy.field(entity)
+        model_node = self.proxy_fields['character_node'](entity)
+        scene_node = self.proxy_fields['scene_node'](entity)
 
         clock = entity[Clock]
         controller = entity[CharacterController]
@@ -1132,10 +1123,13 @@ class Jumping(CollisionSystem):
     }
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            controller = entity[CharacterController]
-            falling_movement = entity[FallingMovement]
-            jumping_movement = entity[JumpingMovement]
+        for entity, components in self.iter(
+                'character',
+                CharacterController,
+                FallingMovement,
+                JumpingMovement,
+        ):
+            controller, falling_movement, jumping_movement = components
             if controller.jumps and falling_movement.ground_contact:
                 falling_movement.inertia += jumping_movement.impulse
 
@@ -1153,10 +1147,10 @@ class Frictioning(System):
     }
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            dt = entity[Clock].game_time
-            character = entity[CharacterController]
-            friction = entity[FrictionalMovement]
+        for entity, (clock, character, friction) in self.iter(
+                'character', Clock, CharacterController, FrictionalMovement,
+        ):
+            dt = clock.game_time
 
             character.translation *= 0.5 ** (dt / friction.half_life)
 
@@ -1174,10 +1168,10 @@ class WalkSpeedLimiting(System):
     }
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            dt = entity[Clock].game_time
-            character = entity[CharacterController]
-            walking = entity[WalkingMovement]
+        for entity, (clock, character, walking) in self.iter(
+                'character', Clock, CharacterController, WalkingMovement,
+        ):
+            dt = clock.game_time
 
             v_length = character.translation.length()
             if v_length > walking.speed * dt:
@@ -1207,14 +1201,14 @@ class ExecuteMovement(System):
     proxies = {'character_node': ProxyType(Model, 'node')}
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            model_proxy = self.proxies['character_node']
-            model = entity[model_proxy.component_type]
-            character = entity[CharacterController]
-            dt = entity[Clock].game_time
+        model_node_of = self.proxy_fields['character_node']
+        for entity, (character, clock) in self.iter(
+                'character', CharacterController, Clock,
+        ):
+            dt = clock.game_time
 
             # Translation: Simple self-relative movement for now.
-            model_node = model_proxy.field(entity)
+            model_node = model_node_of(entity)
             model_node.set_pos(model_node, character.translation)
             character.last_translation_speed = character.translation / dt
 
@@ -1272,10 +1266,10 @@ class UpdateStamina(System):
     }
 
     def update(self, entities_by_filter):
-        for entity in entities_by_filter['character']:
-            character = entity[CharacterController]
-            stamina = entity[Stamina]
-            dt = entity[Clock].timestep
+        for entity, (character, stamina, clock) in self.iter(
+                'character', CharacterController, Stamina, Clock,
+        ):
+            dt = clock.timestep
             av = abs(character.move.x) + abs(character.move.y)
             drain = 0
             if character.move.x or character.move.y:
@@ -2,6 +2,7 @@ from wecs.core import and_filter
 from wecs.mechanics.clock import Clock
 from wecs.mechanics.clock import DetermineTimestep
 from wecs.panda3d.input import Input
+from wecs.panda3d.input import read_context
 
 
 class UpdateClocks(DetermineTimestep):
@@ -20,7 +21,7 @@ class UpdateClocks(DetermineTimestep):
         for entity in entities_by_filter['input']:
             input = entity[Input]
             if self.input_context in input.contexts:
-                context = base.device_listener.read_context(self.input_context)
+                context = read_context(self.world, self.input_context)
                 clock = entity[Clock]
                 clock.scaling_factor *= 1 + context['time_zoom'] * 0.01
 
@@ -19,6 +19,18 @@ class ECSShowBase(ShowBase):
         self.ecs_system_pstats = {}
         self.task_to_data = {}
         self.system_to_data = {}
+        # After Panda3D's input handling (dataLoop, sort -50)
+        self.task_mgr.add(
+            self.start_ecs_frame,
+            'wecs_start_frame',
+            sort=-40,
+        )
+        # After the systems, before rendering (igLoop, sort 50)
+        self.task_mgr.add(
+            self.end_ecs_frame,
+            'wecs_end_frame',
+            sort=45,
+        )
 
     def add_system(self, system, sort, priority=None):
         """
@@ -53,6 +65,14 @@ class ECSShowBase(ShowBase):
         self.system_to_data[system_type] = data
         return task
 
+    def start_ecs_frame(self, task):
+        self.ecs_world.start_frame()
+        return Task.cont
+
+    def end_ecs_frame(self, task):
+        self.ecs_world.end_frame()
+        return Task.cont
+
     def run_system(self, system):
         self.ecs_system_pstats[system].start()
         base.ecs_world._update_system(system)
@@ -82,10 +82,11 @@ class AdjustGravity(System):
         self.known_maps.remove(entity)
 
     def update(self, entities_by_filter):
+        model_node_of = self.proxy_fields['model_node']
         for entity in entities_by_filter['character']:
             character = entity[CharacterController]
             gravity = entity[GravityMovement]
-            model_node = self.proxies['model_node'].field(entity)
+            model_node = model_node_of(entity)
 
             # FIXME: We just use the first given name, and the first
             # node found. Both should deal with multiples.
@@ -137,9 +138,10 @@ class ErectCharacter(System):
     proxies = {'model_node': ProxyType(Model, 'node')}
 
     def update(self, entities_by_filter):
+        model_node_of = self.proxy_fields['model_node']
         for entity in entities_by_filter['character']:
             character = entity[CharacterController]
-            model_node = self.proxies['model_node'].field(entity)
+            model_node = model_node_of(entity)
             up = character.gravity * -1
 
             roll = math.atan(character.gravity.x / character.gravity.z) / (2.0 * math.pi) * 360.0
@@ -1,10 +1,45 @@
+import struct
 from dataclasses import field
 
+from panda3d.core import Vec2
+from panda3d.core import Vec3
+
 from wecs.core import Component
 from wecs.core import System
 from wecs.core import and_filter
+from wecs.snapshot import register_codec
 
 
 @Component()
 class Input:
     contexts: list = field(default_factory=list)
+
+
+def read_context(world, context_name):
+    """
+    Reads an input context from `base.device_listener` through
+    :func:`wecs.core.World.read_input`, so that it can be recorded and
+    replayed.
+
+    :param world: The :class:`wecs.core.World` of the reading system
+    :param context_name: The name of the context
+    :return: The context's state, as returned by the device listener
+    """
+    return world.read_input(
+        ('context', context_name),
+        base.device_listener.read_context,
+        context_name,
+    )
+
+
+# Device listener contexts contain vectors.
+register_codec(
+    Vec2,
+    lambda v: struct.pack('<2f', *v),
+    lambda data: Vec2(*struct.unpack('<2f', data)),
+)
+register_codec(
+    Vec3,
+    lambda v: struct.pack('<3f', *v),
+    lambda data: Vec3(*struct.unpack('<3f', data)),
+)
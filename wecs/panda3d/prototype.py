@@ -36,6 +36,7 @@ from wecs.core import System
 from wecs.core import and_filter
 from wecs.core import or_filter
 from wecs.core import UID
+from wecs.core import reference
 
 from wecs.mechanics.clock import Clock
 
@@ -130,18 +131,42 @@ class Billboard:
 
 @Component()
 class PhysicsWorld:
+    """
+    Either a component on an entity (which then usually also has a
+    `Clock`), or a world resource; See
+    :func:`wecs.core.World.add_resource`. The timestep of a resource is
+    not managed by :class:`DeterminePhysicsTimestep`.
+    """
     timestep: float = 0.0
     world: BulletWorld = field(default_factory=BulletWorld)
 
 
 @Component()
 class PhysicsBody:
+    """
+    `world` is the UID of an entity with a `PhysicsWorld`, or None to
+    use the world's `PhysicsWorld` resource. See `get_physics_world`.
+    """
     body: NodePath = field(default_factory=BulletRigidBodyNode)
-    world: UID = None
+    world: UID = reference(default=None)
     node: NodePath = None
     timestep: float = 0.0
 
 
+def get_physics_world(world, physics_body):
+    """
+    :param world: The :class:`wecs.core.World`
+    :param physics_body: A `PhysicsBody`
+    :return: The `PhysicsWorld` that the body belongs to
+    :raises wecs.core.NoSuchUID: If the body's world entity has been
+        destroyed. The body does not silently move into the world's
+        `PhysicsWorld` resource.
+    """
+    if physics_body.world is None:
+        return world.resources[PhysicsWorld]
+    return world[physics_body.world][PhysicsWorld]
+
+
 class ManageModels(System):
     entity_filters = {
         'model': and_filter(Model),
@@ -166,18 +191,26 @@ class ManageModels(System):
         if model.post_attach is not None:
             model.post_attach(entity)
 
-    def enter_filter_geometry(self, entity):
-        model = entity[Model]
-        geometry = entity[Geometry]
-
-        # Load geometry if required
-        if geometry.node is None:
-            geometry.node = base.loader.load_model(geometry.file)
+    def enter_filter_geometry_batch(self, entities):
+        # Load geometry if required, all files in one go
+        unloaded = [
+            entity[Geometry] for entity in entities
+            if entity[Geometry].node is None
+        ]
+        if unloaded:
+            nodes = base.loader.load_model(
+                [geometry.file for geometry in unloaded],
+            )
+            for geometry, node in zip(unloaded, nodes):
+                geometry.node = node
 
         # Attach
-        geometry.node.reparent_to(model.node)
-        if geometry.post_attach is not None:
-            geometry.post_attach(entity)
+        for entity in entities:
+            model = entity[Model]
+            geometry = entity[Geometry]
+            geometry.node.reparent_to(model.node)
+            if geometry.post_attach is not None:
+                geometry.post_attach(entity)
 
     def enter_filter_actor(self, entity):
         model = entity[Model]
@@ -233,7 +266,7 @@ class ManageModels(System):
     def enter_filter_physics(self, entity):
         model = entity[Model]
         physics_body = entity[PhysicsBody]
-        physics_world = self.world[physics_body.world][PhysicsWorld]
+        physics_world = get_physics_world(self.world, physics_body)
 
         physics_body.node = NodePath(physics_body.body)
 
@@ -298,7 +331,7 @@ class ManageModels(System):
     def exit_filter_physics(self, entity):
         model = entity[Model]
         physics_body = entity[PhysicsBody]
-        physics_world = self.world[physics_body.world][PhysicsWorld]
+        physics_world = get_physics_world(self.world, physics_body)
 
         physics_world.world.remove_rigid_body(body.body)
         model.node.wrt_reparent_to(model.parent)
@@ -334,20 +367,26 @@ class DeterminePhysicsTimestep(System):
         'world': and_filter([PhysicsWorld, Clock]),
         'body': and_filter([PhysicsBody]),
     }
+    resources = {PhysicsWorld}
 
     def update(self, entities_by_filter):
-        timesteps = {}
         for entity in entities_by_filter['world']:
             clock = entity[Clock]
             world = entity[PhysicsWorld]
 
             world.timestep = clock.game_time
-            timesteps[entity._uid] = world.timestep
 
         for entity in entities_by_filter['body']:
             body = entity[PhysicsBody]
-            if body.world in timesteps:
-                body.timestep = timesteps[body.world]
+            if body.world is None:
+                physics_world = self.get_resource(PhysicsWorld)
+            else:
+                world_entity = self.world.get_entity(body.world)
+                if world_entity not in entities_by_filter['world']:
+                    continue
+                physics_world = world_entity[PhysicsWorld]
+            if physics_world is not None:
+                body.timestep = physics_world.timestep
 
 
 class DoPhysics(System):
@@ -357,9 +396,14 @@ class DoPhysics(System):
     entity_filters = {
         'world': and_filter([PhysicsWorld]),
     }
+    resources = {PhysicsWorld}
 
     def update(self, entities_by_filter):
         for entity in entities_by_filter['world']:
             world = entity.get_component(PhysicsWorld)
 
             world.world.do_physics(world.timestep)
+
+        world = self.get_resource(PhysicsWorld)
+        if world is not None:
+            world.world.do_physics(world.timestep)
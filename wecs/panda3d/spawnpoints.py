@@ -35,6 +35,10 @@ class Spawn(System):
         """
         Attach the entities to spawn to their spawn point.
         """
+        if not entities_by_filter['spawners']:
+            return
+        map_nodes = self.proxy_column('map_node', 'map').values()
+        model_node_of = self.proxy_fields['model_node']
         for entity in entities_by_filter['spawners']:
             spawn_point_name = entity[SpawnAt].name
 
@@ -43,12 +47,11 @@ class Spawn(System):
             # first map with one, and the one with the shortest path
             
             # 
-            for map_entity in entities_by_filter['map']:
-                map_node = self.proxies['map_node'].field(map_entity)
+            for map_node in map_nodes:
                 search_pattern = '**/{}'.format(spawn_point_name)
                 spawn_point = map_node.find(search_pattern)
                 if not spawn_point.is_empty():
-                    model_node = self.proxies['model_node'].field(entity)
+                    model_node = model_node_of(entity)
                     model_node.reparent_to(spawn_point)
                     # We reparent to the first child so it inherrits the lights
                     model_node.wrt_reparent_to(map_node.get_child(0))
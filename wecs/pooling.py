@@ -0,0 +1,239 @@
+"""
+Pools that recycle destroyed entities and removed components, so that
+games that spawn and destroy many entities per frame (e.g. projectiles)
+allocate less, and the garbage collector has less to do. Pooling is
+opt-in; See :func:`wecs.core.World.enable_pooling`.
+
+.. code-block:: python
+
+   pools = world.enable_pooling()
+   pools.register(Bullet, reset=reset_bullet)
+
+   bullet = world.create_entity(
+       world.create_component(Bullet, speed=10.0),
+   )
+
+Entities are recycled once their components are flushed out after
+:func:`wecs.core.World.destroy_entity`. A recycled entity gets a new UID
+and handle, so stale references to the old entity do not resolve, but
+the :class:`wecs.core.Entity` object itself is reused. Do not keep
+destroyed entities around, e.g. in sets of your own. Entities are not
+recycled while the world records deltas or a replay, since those refer
+to entities across frames.
+
+Components of registered types are recycled when they are flushed out
+of their entity. Do not use a component after removing it, or add the
+same instance to another entity. Recycled components are reset to
+their defaults before they are handed out again; See
+:func:`reset_to_defaults`.
+"""
+
+import dataclasses
+
+from wecs import core
+from wecs.core import get_component_type_id
+
+
+class Pool:
+    """
+    Free instances of one kind, with statistics.
+
+    :ivar free: The list of free instances
+    :ivar capacity: The maximum number of free instances that are kept
+    :ivar hits: How often a free instance was handed out
+    :ivar misses: How often a new instance had to be created
+    :ivar released: How often an instance was returned to the pool
+    :ivar discarded: How often a returned instance was dropped because
+        the pool was full
+    """
+
+    def __init__(self, capacity):
+        self.free = []
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.discarded = 0
+
+    def take(self):
+        """
+        :return: A free instance, or None if there is none
+        """
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+        self.misses += 1
+        return None
+
+    def put(self, instance):
+        self.released += 1
+        if len(self.free) < self.capacity:
+            self.free.append(instance)
+        else:
+            self.discarded += 1
+
+    def get_stats(self):
+        """
+        :return: ``{'hits': int, 'misses': int, 'released': int,
+            'discarded': int, 'free': int}``
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'released': self.released,
+            'discarded': self.discarded,
+            'free': len(self.free),
+        }
+
+
+_defaults = {}  # {component type: ([(name, default)], [(name, factory)])}
+
+
+def _get_defaults(component_type):
+    try:
+        return _defaults[component_type]
+    except KeyError:
+        pass
+    values = []
+    factories = []
+    for field in dataclasses.fields(component_type):
+        if field.default is not dataclasses.MISSING:
+            values.append((field.name, field.default))
+        elif field.default_factory is not dataclasses.MISSING:
+            factories.append((field.name, field.default_factory))
+    _defaults[component_type] = (values, factories)
+    return values, factories
+
+
+def reset_to_defaults(component, factories=True):
+    """
+    The default reset of recycled components: Fields with a default
+    value are set to it. Fields with a `default_factory` that hold a
+    list, dict or set are cleared in place; Other ones get a new value
+    from the factory. To avoid that allocation (e.g. for a `Vec3` or a
+    `NodePath`), register a reset of your own that resets the values
+    in place::
+
+        def reset_bullet(bullet):
+            reset_to_defaults(bullet, factories=False)
+            bullet.velocity.set(0, 0, 0)
+
+    Fields without default keep their value, and should be passed to
+    :func:`wecs.core.World.create_component`.
+
+    :param component: The component to reset
+    :param factories: Whether to reset the fields with a
+        `default_factory`
+    """
+    values, factory_fields = _get_defaults(type(component))
+    for name, value in values:
+        object.__setattr__(component, name, value)
+    if not factories:
+        return
+    for name, factory in factory_fields:
+        value = getattr(component, name)
+        if type(value) in (list, dict, set):
+            value.clear()
+        else:
+            object.__setattr__(component, name, factory())
+
+
+class Pools:
+    """
+    The entity and component pools of a world; See :mod:`wecs.pooling`.
+
+    :param capacity: The default number of free instances kept per
+        pool
+    :ivar entities: The :class:`Pool` of entities
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.entities = Pool(capacity)
+        self._components = {}  # {component type: (Pool, reset)}
+        self._destroyed = []  # Entities waiting to be flushed out
+
+    def register(self, component_type, reset=reset_to_defaults,
+                 capacity=None):
+        """
+        Starts recycling the components of a type.
+
+        :param component_type: A :class:`wecs.core.Component` type
+        :param reset: A function that resets a recycled component
+            before it is handed out again; See
+            :func:`reset_to_defaults`.
+        :param capacity: The number of free components to keep;
+            Default: The pools' `capacity`
+        """
+        type_bit = 1 << get_component_type_id(component_type)
+        if type_bit & core._columnar_type_mask:
+            raise ValueError("Columnar components can't be pooled.")
+        if capacity is None:
+            capacity = self.capacity
+        self._components[component_type] = (Pool(capacity), reset)
+
+    def acquire(self, component_type, **fields):
+        """
+        :param component_type: A :class:`wecs.core.Component` type
+        :param fields: Values for the component's fields
+        :return: A recycled and reset component if there is one, else
+            a new one
+        """
+        try:
+            pool, reset = self._components[component_type]
+        except KeyError:
+            return component_type(**fields)
+        if not pool.free:
+            pool.misses += 1
+            return component_type(**fields)
+        pool.hits += 1
+        component = pool.free.pop()
+        reset(component)
+        for name, value in fields.items():
+            setattr(component, name, value)
+        return component
+
+    def release(self, component):
+        """
+        Returns a component that is not in use to its type's pool, if
+        the type is registered. This happens automatically when a
+        component is flushed out of its entity.
+        """
+        entry = self._components.get(type(component))
+        if entry is not None:
+            entry[0].put(component)
+
+    def get_pool(self, component_type):
+        """
+        :return: The :class:`Pool` of a registered component type
+        """
+        return self._components[component_type][0]
+
+    def get_stats(self):
+        """
+        :return: ``{'entities': stats, component type: stats}``; See
+            :func:`Pool.get_stats`.
+        """
+        stats = {'entities': self.entities.get_stats()}
+        for component_type, (pool, _) in self._components.items():
+            stats[component_type] = pool.get_stats()
+        return stats
+
+    def _entity_destroyed(self, entity):
+        if entity._dropped_components:
+            self._destroyed.append(entity)
+        else:
+            self.entities.put(entity)
+
+    def _recycle_entities(self):
+        """
+        Puts the destroyed entities whose components have been flushed
+        out into the entity pool.
+        """
+        waiting = []
+        for entity in self._destroyed:
+            if entity._dropped_components or entity.components:
+                waiting.append(entity)
+            else:
+                self.entities.put(entity)
+        self._destroyed = waiting
@@ -0,0 +1,191 @@
+"""
+Per-system profiling of a :class:`wecs.core.World`, independent of any
+engine. Profiling is opt-in; When it is disabled, the world only pays
+for a check whether its profiler is ``None``.
+
+.. code-block:: python
+
+   profiler = world.enable_profiling(window=600)
+   for _ in range(1000):
+       world.update()
+   stats = profiler.get_stats(MySystem, 'update')
+   print(stats.mean(), stats.percentile(99))
+   print(profiler.frame_times.percentile(99))
+
+Times are measured in seconds, and accumulated per frame for each
+system and phase:
+
+- ``'flush'``: Flushing deferred component updates before the system
+  runs. Includes the enter and exit hooks called during the flush.
+- ``'update'``: The system's `update`.
+- ``'enter'`` / ``'exit'``: The system's `enter_filter_*` and
+  `exit_filter_*` hooks (or rather, its `enter_filters` and
+  `exit_filters`).
+
+Flushes that do not precede a specific system (e.g. between the stages
+of a :class:`wecs.scheduler.ParallelScheduler`) are recorded with the
+system ``None``.
+
+A frame ends with :func:`wecs.core.World.update`. If systems are run
+individually instead (as by :class:`wecs.panda3d.core.ECSShowBase`),
+call :func:`Profiler.end_frame` once per frame.
+"""
+
+import time
+from collections import deque
+
+
+phases = ('flush', 'update', 'enter', 'exit')
+
+
+class RollingStat:
+    """
+    The last `window` samples of a measurement.
+    """
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def last(self):
+        return self.samples[-1]
+
+    def mean(self):
+        if not self.samples:
+            return 0.0
+        return sum(self.samples) / len(self.samples)
+
+    def max(self):
+        if not self.samples:
+            return 0.0
+        return max(self.samples)
+
+    def percentile(self, percent):
+        """
+        :param percent: A number between 0 and 100
+        :return: The nearest-rank percentile of the samples
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        idx = round(percent / 100 * (len(ordered) - 1))
+        return ordered[idx]
+
+
+class Profiler:
+    """
+    Collects the timings of a world's systems; See
+    :func:`wecs.core.World.enable_profiling`.
+
+    :param window: The number of frames over which statistics are kept.
+    :ivar frame_times: A :class:`RollingStat` of whole frame durations
+    :ivar filter_counts: ``{system: {filter name: number of entities}}``
+        as of the end of the last frame
+    """
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, window=300):
+        self.window = window
+        self.frame_times = RollingStat(window)
+        self.filter_counts = {}
+        self._stats = {}  # {(system, phase): RollingStat}
+        self._current = {}  # {(system, phase): seconds}
+        self._frame_start = None
+
+    def add_time(self, system, phase, seconds):
+        """
+        Adds time to the current frame's tally.
+
+        :param system: The :class:`wecs.core.System`, or None
+        :param phase: One of ``'flush'``, ``'update'``, ``'enter'``,
+            ``'exit'``
+        :param seconds: Time spent
+        """
+        key = (system, phase)
+        self._current[key] = self._current.get(key, 0.0) + seconds
+
+    def start_frame(self):
+        self._frame_start = self.clock()
+
+    def end_frame(self, systems=()):
+        """
+        Turns the current frame's tallies into samples.
+
+        :param systems: The systems for which to record filter counts
+        """
+        if self._frame_start is not None:
+            self.frame_times.add(self.clock() - self._frame_start)
+            self._frame_start = None
+        for key in self._current:
+            if key not in self._stats:
+                self._stats[key] = RollingStat(self.window)
+        for key, stat in self._stats.items():
+            stat.add(self._current.get(key, 0.0))
+        self._current = {}
+        for system in systems:
+            self.filter_counts[system] = {
+                filter_name: len(entities)
+                for filter_name, entities in system.entities.items()
+            }
+
+    def get_stats(self, system, phase):
+        """
+        :param system: A :class:`wecs.core.System` instance or type, or
+            None for world-level flushes.
+        :param phase: See :func:`add_time`
+        :return: The :class:`RollingStat` of per-frame times
+        """
+        if isinstance(system, type):
+            matches = [
+                key for key in self._stats
+                if isinstance(key[0], system) and key[1] == phase
+            ]
+            if len(matches) != 1:
+                raise KeyError(f"No unique system of type {system}")
+            return self._stats[matches[0]]
+        try:
+            return self._stats[(system, phase)]
+        except KeyError:
+            return RollingStat(self.window)
+
+    def get_systems(self):
+        """
+        :return: A list of all profiled systems
+        """
+        systems = []
+        for system, _ in self._stats:
+            if system not in systems:
+                systems.append(system)
+        return systems
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """
+        :return: ``{system: {phase: {'mean': float, 'max': float,
+            'p50': float, ...}}}``, and under the key ``'frame'`` the
+            same statistics for whole frames.
+        """
+        def describe(stat):
+            description = {'mean': stat.mean(), 'max': stat.max()}
+            for percent in percentiles:
+                description['p{}'.format(percent)] = stat.percentile(percent)
+            return description
+
+        summary = {'frame': describe(self.frame_times)}
+        for (system, phase), stat in self._stats.items():
+            summary.setdefault(system, {})[phase] = describe(stat)
+        return summary
+
+    def reset(self):
+        """
+        Discards all collected data.
+        """
+        self.frame_times = RollingStat(self.window)
+        self.filter_counts = {}
+        self._stats = {}
+        self._current = {}
+        self._frame_start = None
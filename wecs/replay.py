@@ -0,0 +1,345 @@
+"""
+Deterministic recording and replay of a :class:`wecs.core.World`, to
+reproduce bugs offline, and to benchmark systems against recorded
+instead of synthetic loads.
+
+A :class:`Recorder` stores the world's state when recording starts, and
+for each frame, everything that entered the world from outside of its
+systems:
+
+- Changes that were made to entities between frames, as a delta (see
+  :func:`wecs.core.World.diff`). As with deltas, changes to field
+  values are only seen for components with ``track_changes=True``, and
+  those marked with :func:`wecs.core.Entity.mark_changed`.
+- The inputs that systems read through
+  :func:`wecs.core.World.read_input`, like the time steps of clocks
+  (see :class:`wecs.mechanics.clock.DetermineTimestep`) and the contexts
+  of the device listener (see :func:`wecs.panda3d.input.read_context`).
+- A checksum of the world's state at the end of the frame.
+
+A :class:`Replayer` restores the initial state into a world with the
+same systems, and runs the recorded frames as fast as it can, feeding
+the systems the recorded inputs, and comparing the checksums.
+
+.. code-block:: python
+
+   recorder = Recorder(world)
+   ...  # Play
+   data = recorder.stop()
+
+   world = World()
+   world.add_system(...)  # The same systems as during the recording
+   Replayer(data).run(world)
+
+Frames are delimited by :func:`wecs.core.World.start_frame` and
+:func:`wecs.core.World.end_frame`, so a recorder should be started
+between frames. Changes to resources and events sent from outside of
+systems are not recorded. Neither are changes to the state of input
+sources that are stored in components, like setting a
+:class:`wecs.mechanics.clock.SettableClock`; Since the source is not
+called during a replay, its state may differ, so types of input sources
+should be registered with ``input_source=True`` (see
+:func:`wecs.snapshot.register_codec`), which leaves their state out of
+the checksums.
+"""
+
+import zlib
+from collections import deque
+
+from wecs.snapshot import VERSION
+from wecs.snapshot import DeltaLog
+from wecs.snapshot import _Writer
+from wecs.snapshot import _Reader
+from wecs.snapshot import _LiveEntityIds
+from wecs.snapshot import _LiveHandleIds
+from wecs.snapshot import _ReplicaIds
+from wecs.snapshot import _write_world
+from wecs.snapshot import _write_delta
+
+
+REPLAY_MAGIC = b'WECR'
+
+
+class Desync(Exception):
+    """
+    Raised by a :class:`Replayer` when a frame does not play out as it
+    did during the recording.
+
+    :ivar tick: The world's tick at that frame
+    """
+
+    def __init__(self, tick, message):
+        super().__init__(f"Tick {tick}: {message}")
+        self.tick = tick
+
+
+def checksum(world):
+    """
+    :param world: A :class:`wecs.core.World`
+    :return: A checksum of the world's components and resources. The
+        names and handles of entities are not included, since they
+        differ between a recording and its replays.
+    """
+    return zlib.crc32(_write_world(world, identities=False))
+
+
+class _FrameLog(DeltaLog):
+    """
+    A :class:`wecs.snapshot.DeltaLog` that only records changes while
+    `external` is set, i.e. between frames. During frames, it keeps the
+    created entities in order, so that a replay can map them to the
+    recorded ones.
+    """
+
+    def __init__(self):
+        super().__init__(0)
+        self.external = True
+        self.spawned = []  # Entities created during the frame
+        self.despawned = False  # Whether entities were destroyed
+
+    def reset(self):
+        super().__init__(0)
+        self.spawned = []
+        self.despawned = False
+
+    def entity_created(self, entity, tick):
+        if self.external:
+            super().entity_created(entity, tick)
+        else:
+            self.spawned.append(entity)
+
+    def entity_destroyed(self, entity, tick):
+        if self.external:
+            super().entity_destroyed(entity, tick)
+        else:
+            self.despawned = True
+
+    def component_added(self, entity, component_type, tick):
+        if self.external:
+            super().component_added(entity, component_type, tick)
+
+    def component_removed(self, entity, component_type, tick):
+        if self.external:
+            super().component_removed(entity, component_type, tick)
+
+    def field_changed(self, entity, component_type, field_name, tick):
+        if self.external:
+            super().field_changed(entity, component_type, field_name, tick)
+
+
+class Recorder:
+    """
+    Records a world's frames; See :mod:`wecs.replay`. Recording starts
+    right away, and ends with :func:`stop`.
+
+    :param world: The :class:`wecs.core.World` to record
+    :param checksum_interval: Record a checksum of the world's state
+        every this many frames, or never if 0. A checksum costs about
+        as much as a snapshot.
+    :ivar frame_count: The number of frames recorded so far
+    """
+
+    def __init__(self, world, checksum_interval=1):
+        if world.replay is not None:
+            raise ValueError("World is already being recorded or replayed.")
+        self.world = world
+        self.checksum_interval = checksum_interval
+        self.frame_count = 0
+        self._log = _FrameLog()
+        self._delta = None  # Changes made before the current frame
+        self._inputs = {}  # {key: [value]}
+        writer = _Writer({}, {})
+        writer.buffer += REPLAY_MAGIC
+        writer.uint(VERSION)
+        writer.int(world.tick)
+        writer.blob(world.snapshot())
+        self._buffer = writer.buffer
+        world._add_delta_log(self._log)
+        world.replay = self
+
+    def start_frame(self, world):
+        # Flushes the changes made since the last frame into the log.
+        self._delta = _write_delta(world, self._log, 0)
+        self._log.reset()
+        self._log.external = False
+        self._inputs = {}
+
+    def read_input(self, key, source, args):
+        value = source(*args)
+        if key in self._inputs:
+            self._inputs[key].append(value)
+        else:
+            self._inputs[key] = [value]
+        return value
+
+    def end_frame(self, world):
+        if self._delta is None:
+            return  # Recording started during this frame.
+        world._flush_component_updates()
+        log = self._log
+        writer = _Writer(_LiveEntityIds(world), _LiveHandleIds(world))
+        writer.int(world.tick)
+        writer.blob(self._delta)
+        writer.uint(len(self._inputs))
+        for key, values in self._inputs.items():
+            writer.value(key)
+            writer.value(values)
+        writer.array('q', [entity.handle for entity in log.spawned])
+        self.frame_count += 1
+        interval = self.checksum_interval
+        if interval and self.frame_count % interval == 0:
+            writer.buffer.append(1)
+            writer.uint(checksum(world))
+        else:
+            writer.buffer.append(0)
+        self._buffer += writer.buffer
+        self._delta = None
+        self._inputs = {}
+        log.spawned = []
+        log.despawned = False
+        log.external = True
+
+    def stop(self):
+        """
+        Ends the recording.
+
+        :return: The recording as bytes
+        """
+        self.world._remove_delta_log(self._log)
+        self.world.replay = None
+        return bytes(self._buffer)
+
+
+class Replayer:
+    """
+    Replays a recording made by a :class:`Recorder`; See
+    :mod:`wecs.replay`.
+
+    :param data: bytes as returned by :func:`Recorder.stop`
+    :ivar start_tick: The world's tick when the recording started
+    :ivar initial_state: The world's snapshot at that time
+    """
+
+    def __init__(self, data):
+        reader = _Reader(data)
+        if bytes(reader.raw(len(REPLAY_MAGIC))) != REPLAY_MAGIC:
+            raise ValueError("Not a wecs recording")
+        version = reader.uint()
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version}")
+        self.start_tick = reader.int()
+        self.initial_state = bytes(reader.blob())
+        self.world = None
+        self.verify = True
+        self._reader = reader
+        self._frames_offset = reader.offset
+        self._log = None
+        self._inputs = {}  # {key: deque of values}
+        self._spawned = ()  # Recorded handles of entities created in frame
+        self._checksum = None
+
+    @property
+    def done(self):
+        """
+        Whether all recorded frames have been replayed.
+        """
+        return self._reader.offset >= len(self._reader.data)
+
+    def run(self, world, verify=True):
+        """
+        Replays all recorded frames by calling the world's `update`.
+
+        :param world: A :class:`wecs.core.World` with the same systems
+            as the recorded world; See :func:`start`.
+        :param verify: See :func:`start`.
+        :return: The number of replayed frames
+        :raises Desync: When a frame plays out differently
+        """
+        self.start(world, verify=verify)
+        frames = 0
+        try:
+            while not self.done:
+                world.update()
+                frames += 1
+        finally:
+            self.stop()
+        return frames
+
+    def start(self, world, verify=True):
+        """
+        Restores the recording's initial state into `world`, after
+        which each frame the world starts replays a recorded one.
+
+        :param world: A :class:`wecs.core.World` with the same systems
+            as the recorded world
+        :param verify: Whether to compare checksums of the world's state
+            with the recorded ones. Without, the replay reproduces the
+            recorded load at less overhead, e.g. for benchmarks.
+        """
+        if world.replay is not None:
+            raise ValueError("World is already being recorded or replayed.")
+        world.restore(self.initial_state)
+        world.tick = self.start_tick
+        self.world = world
+        self.verify = verify
+        self._reader.offset = self._frames_offset
+        self._log = _FrameLog()
+        world._add_delta_log(self._log)
+        world.replay = self
+
+    def stop(self):
+        """
+        Detaches the replayer from its world.
+        """
+        self.world._remove_delta_log(self._log)
+        self.world.replay = None
+
+    def start_frame(self, world):
+        if self.done:
+            raise ValueError("The recording has ended.")
+        reader = self._reader
+        tick = reader.int()
+        if tick != world.tick:
+            raise Desync(world.tick, f"Recorded frame is for tick {tick}")
+        world.apply_delta(reader.blob())
+        replica = world._replica_entities
+        reader.uids = _ReplicaIds(replica, '_uid')
+        reader.handles = _ReplicaIds(replica, 'handle')
+        inputs = {}
+        for _ in range(reader.uint()):
+            key = reader.value()
+            inputs[key] = deque(reader.value())
+        self._inputs = inputs
+        self._spawned = reader.array('q')
+        self._checksum = reader.uint() if reader.byte() else None
+        self._log.reset()
+        self._log.external = False
+
+    def read_input(self, key, source, args):
+        values = self._inputs.get(key)
+        if not values:
+            raise Desync(self.world.tick, f"Input {key!r} was not recorded")
+        return values.popleft()
+
+    def end_frame(self, world):
+        world._flush_component_updates()
+        log = self._log
+        if len(log.spawned) != len(self._spawned):
+            raise Desync(
+                world.tick,
+                f"{len(log.spawned)} entities were created instead of "
+                f"{len(self._spawned)}",
+            )
+        replica = world._replica_entities
+        replica.update(zip(self._spawned, log.spawned))
+        if log.despawned:
+            world._replica_entities = {
+                handle: entity for handle, entity in replica.items()
+                if world.entities.get(entity._uid) is entity
+            }
+        log.spawned = []
+        log.despawned = False
+        log.external = True
+        if self.verify and self._checksum is not None:
+            if checksum(world) != self._checksum:
+                raise Desync(world.tick, "World state differs from recording")
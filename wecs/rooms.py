@@ -1,6 +1,6 @@
 from dataclasses import field
 
-from wecs.core import Component, System, UID, and_filter
+from wecs.core import Component, Event, System, UID, and_filter, reference
 
 
 # Rooms, and being in a room
@@ -20,7 +20,7 @@ class Room:
 
 @Component()
 class RoomPresence:
-    room: UID
+    room: UID = reference()
     # Entities perceived
     presences: list = field(default_factory=list)
 
@@ -30,6 +30,13 @@ class ChangeRoomAction:
     room: UID  # Room to change to
 
 
+# Event-based alternative to ChangeRoomAction; See ChangeRoomEvents
+@Event()
+class ChangeRoomEvent:
+    actor: UID
+    room: UID  # Room to change to
+
+
 class EntityNotInARoom(Exception): pass
 
 
@@ -61,6 +68,8 @@ class PerceiveRoom(System):
         'room': and_filter([Room]),
         'presences': and_filter([RoomPresence]),
     }
+    reads = {Room, RoomPresence}
+    writes = {Room, RoomPresence}
 
     def update(self, filtered_entities):
         # Clean the bookkeeping lists
@@ -96,22 +105,42 @@ class PerceiveRoom(System):
             presence.presences = room.presences
 
 
+def change_room(target, entity, world, throw_exc=False):
+    room = world.get_entity(entity.get_component(RoomPresence).room)
+    if target not in room.get_component(Room).adjacent:
+        if throw_exc:
+            raise RoomsNotAdjacent
+    else:
+        entity.get_component(RoomPresence).room = target
+
+
 class ChangeRoom(System):
     entity_filters = {
         'act': and_filter([ChangeRoomAction, RoomPresence])
     }
+    reads = {ChangeRoomAction, Room, RoomPresence}
+    writes = {ChangeRoomAction, RoomPresence}
 
     def update(self, filtered_entities):
         for entity in filtered_entities['act']:
-            room = self.world.get_entity(
-                entity.get_component(RoomPresence).room,
-            )
             target = entity.get_component(ChangeRoomAction).room
+            change_room(target, entity, self.world, self.throw_exc)
+            entity.remove_component(ChangeRoomAction)
 
-            if target not in room.get_component(Room).adjacent:
-                if self.throw_exc:
-                    raise RoomsNotAdjacent
-            else:
-                entity.get_component(RoomPresence).room = target
 
-            entity.remove_component(ChangeRoomAction)
+class ChangeRoomEvents(System):
+    """
+    Like :class:`ChangeRoom`, but for :class:`ChangeRoomEvent`, which
+    does not cause any flushes. Actors without a `RoomPresence` are
+    ignored.
+    """
+    entity_filters = {}
+    subscriptions = {ChangeRoomEvent}
+    reads = {Room, RoomPresence}
+    writes = {RoomPresence}
+
+    def update(self, filtered_entities):
+        for event in self.get_events(ChangeRoomEvent):
+            entity = self.world.get_entity(event.actor)
+            if entity.has_component(RoomPresence):
+                change_room(event.room, entity, self.world, self.throw_exc)
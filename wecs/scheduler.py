@@ -0,0 +1,132 @@
+"""
+Scheduling of systems, so that systems which do not access the same
+component types can run concurrently.
+
+Two systems conflict if either of them writes a component type that the
+other one reads or writes, or if either of them is exclusive, i.e.
+declared as `exclusive`, or declaring neither `reads` nor `writes`; See
+:class:`wecs.core.System` for how systems declare their component
+access. Conflicting systems run in the order of their
+`sort`. Non-conflicting systems are free to run at the same time.
+
+The :class:`ParallelScheduler` groups the systems into stages: Each
+system is placed in the first stage after all earlier (by `sort`)
+systems it conflicts with. The systems of a stage then run on a thread
+pool. Deferred component updates are flushed before each stage (with
+the world's flush policy ``'sync'``, only before stages containing a
+sync point; With ``'frame'``, never), so structural changes made by a
+system become visible to the systems of later stages. This is most useful on free-threaded builds of CPython,
+and for systems that spend their time in code that releases the GIL.
+
+.. code-block:: python
+
+   world = World(scheduler=ParallelScheduler())
+   world.add_system(...)
+   world.update()
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def systems_conflict(system_a, system_b):
+    """
+    :param system_a: A :class:`wecs.core.System`
+    :param system_b: Another :class:`wecs.core.System`
+    :return: Whether the two systems may not run concurrently
+    """
+    if system_a.is_exclusive() or system_b.is_exclusive():
+        return True
+    reads_a, writes_a = system_a.get_component_access()
+    reads_b, writes_b = system_b.get_component_access()
+    if writes_a & (reads_b | writes_b):
+        return True
+    if writes_b & reads_a:
+        return True
+    return False
+
+
+def get_stages(systems):
+    """
+    :param systems: A list of :class:`wecs.core.System` in order of
+        their `sort`
+    :return: A list of stages, each of which is a list of systems (in
+        order of `sort`) that may run concurrently.
+    """
+    stage_of_system = []
+    stages = []
+    for idx, system in enumerate(systems):
+        stage = 0
+        for earlier_idx in range(idx):
+            earlier_system = systems[earlier_idx]
+            if stage_of_system[earlier_idx] < stage:
+                continue
+            if systems_conflict(earlier_system, system):
+                stage = stage_of_system[earlier_idx] + 1
+        stage_of_system.append(stage)
+        if stage == len(stages):
+            stages.append([])
+        stages[stage].append(system)
+    return stages
+
+
+class ParallelScheduler:
+    """
+    Runs the systems of a :class:`wecs.core.World` in stages of
+    non-conflicting systems on a thread pool.
+
+    :param max_workers: The number of threads; See
+        :class:`concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._executor = None
+        self._stages_key = None
+        self._stages = None
+
+    def get_stages(self, world):
+        """
+        The stages are recomputed when the world's systems change.
+
+        :param world: A :class:`wecs.core.World`
+        :return: The list of stages; See :func:`get_stages`.
+        """
+        sorts = sorted(world.systems)
+        key = tuple((sort, id(world.systems[sort])) for sort in sorts)
+        if key != self._stages_key:
+            self._stages = get_stages([world.systems[sort] for sort in sorts])
+            self._stages_key = key
+        return self._stages
+
+    def update(self, world):
+        """
+        Run all of the world's systems once.
+
+        :param world: A :class:`wecs.core.World`
+        """
+        for stage in self.get_stages(world):
+            if any(world._flushes_before(system) for system in stage):
+                world._timed_flush()
+            if len(stage) == 1:
+                world._run_update(stage[0])
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='wecs',
+                )
+            futures = [
+                self._executor.submit(world._run_update, system)
+                for system in stage
+            ]
+            for future in futures:
+                # Re-raises exceptions from the systems
+                future.result()
+
+    def shutdown(self):
+        """
+        Stops the thread pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None